@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Offline stand-in for the Gemini model, for benchmarks.
+
+FakeGeminiModel answers every prompt the pipeline sends (analyzers, combined
+analysis, prioritization, grouping, triage, cluster naming and the summary)
+with a well-formed JSON response after a configurable delay, and can fail a
+share of the calls. Plug it in with LLMService(model=FakeGeminiModel(...)).
+
+Responses are derived from the prompt, so the same prompt always gets the same
+answer; latency, jitter and errors come from a seeded generator.
+"""
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+
+SENTENCE_PATTERN = re.compile(r"[A-Z][^.!?\n]{20,160}[.!?]")
+ID_PATTERN = re.compile(r"\bsugg_\d+\b")
+CLUSTER_PATTERN = re.compile(r"\bcluster_\d+\b")
+THEMES = ("Clarity & Conciseness", "Structural Enhancements", "Example Addition", "Tone Adjustment")
+LEVELS = ("High", "Medium", "Low")
+ANALYZER_TEMPLATES = {
+    "readability": 'Shorten the sentence "{0}" and define any jargon it uses.',
+    "structure_flow": 'Split the section containing "{0}" into shorter paragraphs or a list.',
+    "completeness_examples": 'Add a concrete example after "{0}".',
+    "style_adherence": 'Rewrite "{0}" in active voice and address the reader directly.',
+}
+ANALYZER_EXTRA_KEYS = {
+    "readability": "persona_pain_points",
+    "structure_flow": "quantified_issues",
+    "style_adherence": "snippet_specific_feedback",
+}
+
+class FakeBackendError(Exception):
+    """An injected API failure, carrying an HTTP status code like the Gemini client errors."""
+
+    def __init__(self, message: str, code: int):
+        super().__init__(message)
+        self.code = code
+
+class FakeGeminiModel:
+    """A Gemini-compatible model with simulated latency and failures."""
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.2, error_rate: float = 0.0,
+                 error_code: int = 503, seed: int = 0):
+        """Initializes the FakeGeminiModel.
+
+        Args:
+            latency: Mean response time in seconds.
+            jitter: Each response time is drawn uniformly from latency +/- jitter.
+            error_rate: Share of calls (0-1) that fail after the delay.
+            error_code: HTTP status of the injected failures (503 is retried, 429 is
+                        handled as a rate limit, 400 is not retried).
+            seed: Seed for the latency and failure draws.
+        """
+        self.model_name = "fake-gemini"
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt: str, **kwargs):
+        delay, fail = self._draw()
+        time.sleep(delay)
+        return self._respond(prompt, fail)
+
+    async def generate_content_async(self, prompt: str, **kwargs):
+        delay, fail = self._draw()
+        await asyncio.sleep(delay)
+        return self._respond(prompt, fail)
+
+    def _draw(self) -> tuple[float, bool]:
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self._rng.uniform(self.latency - self.jitter, self.latency + self.jitter))
+            return delay, self._rng.random() < self.error_rate
+
+    def _respond(self, prompt: str, fail: bool):
+        if fail:
+            raise FakeBackendError(f"Injected backend failure ({self.error_code})", self.error_code)
+        text = json.dumps(answer(prompt))
+        return SimpleNamespace(
+            text=text,
+            candidates=[text],
+            prompt_feedback=None,
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=len(prompt) // 4,
+                candidates_token_count=len(text) // 4,
+                total_token_count=(len(prompt) + len(text)) // 4,
+            ),
+        )
+
+def answer(prompt: str) -> dict:
+    """Builds a plausible JSON answer for any prompt the pipeline sends."""
+    rng = random.Random(zlib.crc32(prompt.encode("utf-8")))
+    if 'with "impact", "difficulty" and "theme"' in prompt:
+        return {i: {"impact": rng.choice(LEVELS), "difficulty": rng.choice(LEVELS), "theme": rng.choice(THEMES)}
+                for i in dict.fromkeys(ID_PATTERN.findall(prompt))}
+    if 'with "impact" and "difficulty"' in prompt:
+        return {i: {"impact": rng.choice(LEVELS), "difficulty": rng.choice(LEVELS)}
+                for i in dict.fromkeys(ID_PATTERN.findall(prompt))}
+    if "thematic categories" in prompt:
+        grouped = {}
+        for i in dict.fromkeys(ID_PATTERN.findall(prompt)):
+            grouped.setdefault(rng.choice(THEMES), []).append(i)
+        return grouped
+    if "Give each cluster" in prompt:
+        return {c: f"{rng.choice(THEMES)} {n + 1}" for n, c in enumerate(dict.fromkeys(CLUSTER_PATTERN.findall(prompt)))}
+    if '"summary"' in prompt:
+        return {"summary": "The article is generally clear but would benefit from shorter sentences and more examples."}
+
+    content = prompt.split("---", 1)[-1]
+    sentences = SENTENCE_PATTERN.findall(content) or ["The introduction is missing."]
+    if '"readability": an object' in prompt:
+        return {name: _analyzer_result(name, sentences, rng) for name in ANALYZER_TEMPLATES}
+    for name, key in ANALYZER_EXTRA_KEYS.items():
+        if f'"{key}"' in prompt:
+            return _analyzer_result(name, sentences, rng)
+    return _analyzer_result("completeness_examples", sentences, rng)
+
+def _analyzer_result(name: str, sentences: list[str], rng: random.Random) -> dict:
+    picked = rng.sample(sentences, min(len(sentences), rng.randint(2, 5)))
+    result = {
+        "assessment": f"The {name.replace('_', ' ')} of the article is adequate with room for improvement.",
+        "suggestions": [ANALYZER_TEMPLATES[name].format(s.rstrip(".!?")) for s in picked],
+        "positive_feedback": "Headings make the article easy to scan.",
+    }
+    if name in ANALYZER_EXTRA_KEYS:
+        result[ANALYZER_EXTRA_KEYS[name]] = "Some sentences are long."
+    return result
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+"""Cold-start benchmark: process start-up and import time per kind of run.
+
+Runs each scenario in a fresh interpreter with `python -X importtime` and reports
+the median wall time of the process and the total time spent importing modules,
+with the modules that took longest:
+
+    interpreter  `python -c pass`, for reference
+    help         `src/main.py --help`
+    cached       a run that reuses the previous report (page in the HTML cache)
+    fast         a rule-based run (--analyzer-mode fast), no LLM
+    full         a full LLM run, with the Gemini client loaded as usual but the
+                 calls answered instantly by the fake backend (benchmarks/fake_llm.py)
+
+Pages are served from benchmarks/fixtures/ on a local HTTP server and the caches
+live in a temporary directory, so the benchmark runs offline and leaves the
+project's caches alone.
+
+Usage (from the project root):
+    python benchmarks/import_benchmark.py [--repeat 5] [--fixture medium.html] [--top 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(BENCHMARK_DIR, "..", "src")
+SCENARIOS = ("interpreter", "help", "cached", "fast", "full")
+
+def run_scenario(scenario: str, url: str, workdir: str):
+    """Runs one scenario in this (child) process. Only stdlib is imported before this point."""
+    sys.path.append(SRC_DIR)
+    import config
+    config.HTML_CACHE_DIR = os.path.join(workdir, "html")
+    config.LLM_CACHE_PATH = os.path.join(workdir, "llm_responses.sqlite3")
+    config.CHECKPOINT_DIR = os.path.join(workdir, "checkpoints")
+    from main import run_analysis
+    options = {"output_path": None, "print_report": False}
+    if scenario == "cached":
+        run_analysis(url, analyzer_mode="fast", **options)
+    elif scenario == "fast":
+        run_analysis(url, analyzer_mode="fast", html_cache_mode="bypass", reuse_unchanged=False, **options)
+    elif scenario == "full":
+        from core.llm_service import LLMService
+        from fake_llm import FakeGeminiModel
+        config.GEMINI_API_KEY = "offline-benchmark"
+        llm_service = LLMService(cache_mode="bypass") # Loads and configures the Gemini client
+        llm_service.model = FakeGeminiModel(latency=0.0, jitter=0.0)
+        run_analysis(url, llm_service=llm_service, html_cache_mode="bypass", reuse_unchanged=False, **options)
+
+def command(scenario: str, url: str, workdir: str) -> list[str]:
+    """Returns the command line that runs a scenario under -X importtime."""
+    if scenario == "interpreter":
+        return [sys.executable, "-X", "importtime", "-c", "pass"]
+    if scenario == "help":
+        return [sys.executable, "-X", "importtime", os.path.join(SRC_DIR, "main.py"), "--help"]
+    return [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child", scenario, url, workdir]
+
+def parse_importtime(stderr: str) -> tuple[float, list[tuple[str, float]]]:
+    """Parses -X importtime output.
+
+    Returns:
+        The total import time in seconds (the sum of the cumulative times of
+        top-level imports) and the top-level imports with their cumulative times.
+    """
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if cumulative.strip().isdigit() and not name[1:].startswith(" "):
+            top_level.append((name.strip(), int(cumulative) / 1_000_000))
+    return sum(seconds for _, seconds in top_level), top_level
+
+def measure(scenario: str, url: str, workdir: str, repeat: int) -> dict:
+    """Runs a scenario `repeat` times and returns the median wall and import times."""
+    walls, imports, modules = [], [], {}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(command(scenario, url, workdir), stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        walls.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            raise RuntimeError(f"Scenario '{scenario}' failed:\n{result.stderr[-2000:]}")
+        total, top_level = parse_importtime(result.stderr)
+        imports.append(total)
+        for name, seconds in top_level:
+            modules.setdefault(name, []).append(seconds)
+    return {
+        "wall_seconds": statistics.median(walls),
+        "import_seconds": statistics.median(imports),
+        "modules": sorted(((name, statistics.median(times)) for name, times in modules.items()), key=lambda item: -item[1]),
+    }
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Measure cold-start and import time per kind of run.")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Runs per scenario (the median is reported).")
+    arg_parser.add_argument("--fixture", default="medium.html", help="Fixture page analyzed by the cached, fast and full runs.")
+    arg_parser.add_argument("--top", type=int, default=5, help="Slowest top-level imports listed per scenario.")
+    arg_parser.add_argument("--child", nargs=3, metavar=("SCENARIO", "URL", "WORKDIR"), help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.child:
+        run_scenario(*args.child)
+        return
+
+    sys.path.append(SRC_DIR)
+    from pipeline_benchmark import fixture_server
+    with fixture_server() as base_url, tempfile.TemporaryDirectory() as workdir:
+        url = f"{base_url}/{args.fixture}"
+        # Analyze the page once so the cached scenario finds the page and its report.
+        subprocess.run(command("cached", url, workdir), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+        results = {scenario: measure(scenario, url, workdir, args.repeat) for scenario in SCENARIOS}
+
+    print(f"{'Scenario':<12} {'Wall (ms)':>10} {'Imports (ms)':>13}  Slowest top-level imports (ms)")
+    for scenario, r in results.items():
+        slowest = ", ".join(f"{name} {seconds * 1000:.0f}" for name, seconds in r["modules"][:args.top])
+        print(f"{scenario:<12} {r['wall_seconds'] * 1000:>10.0f} {r['import_seconds'] * 1000:>13.0f}  {slowest}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""Micro-benchmark for HTMLParser.parse on large pages.
+
+Compares the original approach (a full html.parser tree of the whole page, then
+str(article_body) parsed again by markdownify) with the current one (only the
+article subtree is built, with each available backend, and converted directly)
+and reports parse time and peak Python memory (tracemalloc).
+
+Usage (from the project root):
+    python benchmarks/parser_benchmark.py [--paragraphs 2000] [--repeat 5] [--html page.html]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+import markdownify
+from core.parser import HTMLParser, PARSER_BACKENDS
+
+def legacy_parse(html_content: str) -> str:
+    """The parser as it was before targeted extraction (for comparison)."""
+    soup = BeautifulSoup(html_content, "html.parser")
+    article_body = soup.find("div", class_="article-body")
+    return markdownify.markdownify(str(article_body), heading_style="ATX").strip()
+
+def build_page(paragraphs: int) -> str:
+    """Builds a help-center-like page: heavy chrome around a long article."""
+    chrome = "".join(
+        f"<li><a href='/hc/en-us/articles/{i}'>Related article {i}</a></li>" for i in range(paragraphs // 2)
+    )
+    script = "<script>window.__DATA__ = {" + ",".join(f'"k{i}": {i}' for i in range(paragraphs)) + "};</script>"
+    body = []
+    for i in range(paragraphs):
+        if i % 25 == 0:
+            body.append(f"<h2>Section {i // 25}</h2>")
+        if i % 40 == 0:
+            body.append("<pre><code>curl -X POST https://api.example.com/v1/events \\\n  -d '{\"id\": 1}'</code></pre>")
+        body.append(
+            f"<p>Paragraph {i} explains how to <strong>configure</strong> the <a href='/x/{i}'>feature</a> "
+            f"and what happens when the <code>setting_{i}</code> option is enabled.</p>"
+        )
+        if i % 30 == 0:
+            body.append("<ul>" + "".join(f"<li>Step {j}</li>" for j in range(5)) + "</ul>")
+    return (
+        "<html><head><title>Article</title><style>body{margin:0}</style>" + script + "</head><body>"
+        f"<header><nav><ul>{chrome}</ul></nav></header>"
+        f"<main><div class='article-body'>{''.join(body)}</div></main>"
+        f"<aside><ul>{chrome}</ul></aside><footer>Footer</footer></body></html>"
+    )
+
+def measure(parse, html: str, repeat: int) -> tuple[float, float, str]:
+    """Returns (median seconds, peak MiB, output) for parse(html)."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = parse(html)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    parse(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak / (1024 * 1024), output
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark HTML parsing on a large page.")
+    arg_parser.add_argument("--paragraphs", type=int, default=2000, help="Paragraphs in the synthetic article.")
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Timed runs per variant (the median is reported).")
+    arg_parser.add_argument("--html", help="Benchmark a saved HTML file instead of a synthetic page.")
+    args = arg_parser.parse_args()
+
+    if args.html:
+        with open(args.html, "r", encoding="utf-8") as f:
+            html = f.read()
+    else:
+        html = build_page(args.paragraphs)
+    print(f"Page size: {len(html) / 1024:.0f} KiB")
+
+    variants = [("legacy (html.parser, full tree, re-parse)", legacy_parse)]
+    for backend in PARSER_BACKENDS:
+        if builder_registry.lookup(backend):
+            variants.append((f"targeted ({backend}, direct convert)", HTMLParser(backend=backend).parse))
+
+    baseline_time = baseline_output = None
+    print(f"{'Variant':<45} {'Median (ms)':>12} {'Speedup':>8} {'Peak (MiB)':>11}  Output")
+    for name, parse in variants:
+        seconds, peak_mib, output = measure(parse, html, args.repeat)
+        if baseline_time is None:
+            baseline_time, baseline_output = seconds, output
+        same = "same" if output == baseline_output else "DIFFERS"
+        print(f"{name:<45} {seconds * 1000:>12.1f} {baseline_time / seconds:>7.1f}x {peak_mib:>11.1f}  {same}")
+
+if __name__ == "__main__":
+    main()
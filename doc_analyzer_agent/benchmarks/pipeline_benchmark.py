@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""Offline end-to-end benchmark of the analysis pipeline.
+
+Serves the HTML fixtures in benchmarks/fixtures/ from a local HTTP server and runs
+run_analysis() on each of them with a fake LLM backend (benchmarks/fake_llm.py)
+that has configurable latency, jitter and error rate, so no API key or network
+access is needed and results are repeatable. Reports per-document latency and
+per-stage timings (p50/p95/p99), peak Python memory (tracemalloc) per fixture,
+the process's max RSS, and batch throughput (docs/min) via run_batch().
+
+Results can be saved as JSON and compared against a saved baseline; the script
+exits with status 1 if a metric regressed by more than the tolerance, so it can
+gate CI.
+
+Usage (from the project root):
+    python benchmarks/pipeline_benchmark.py [--latency 0.05] [--jitter 0.02] [--error-rate 0]
+        [--repeat 3] [--batch-copies 8] [--output results.json]
+        [--baseline baseline.json --tolerance 0.2]
+"""
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import resource
+except ImportError: # Not available on Windows
+    resource = None
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCHMARK_DIR, "fixtures")
+sys.path.append(os.path.join(BENCHMARK_DIR, "..", "src"))
+
+from batch import run_batch
+from core.fetcher import Fetcher
+from core.llm_service import LLMService
+from core.tracing import Tracer
+from fake_llm import FakeGeminiModel
+from main import run_analysis, ANALYZER_MODES, GROUPER_MODES
+
+# Metrics compared against a baseline: (path in the results, True if higher is better).
+REGRESSION_METRICS = [
+    ("batch.docs_per_minute", True),
+    ("fixtures.*.latency_seconds.p50", False),
+    ("fixtures.*.latency_seconds.p95", False),
+    ("fixtures.*.peak_memory_mib", False),
+]
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Serves the fixtures without logging every request."""
+
+    def log_message(self, format, *args):
+        pass
+
+@contextlib.contextmanager
+def fixture_server():
+    """Serves FIXTURES_DIR on a free local port and yields its base URL."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=FIXTURES_DIR))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def percentiles(values: list[float]) -> dict:
+    """Returns the p50, p95 and p99 (nearest rank) of values, in seconds."""
+    ordered = sorted(values)
+    def rank(p: int) -> float:
+        return ordered[max(0, -(-len(ordered) * p // 100) - 1)]
+    return {"p50": round(rank(50), 4), "p95": round(rank(95), 4), "p99": round(rank(99), 4)}
+
+def analyze(url: str, llm_service: LLMService, args) -> str | None:
+    """Runs the pipeline once on url, without caches or report output."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return run_analysis(
+            url,
+            analyzer_mode=args.analyzer_mode,
+            grouper_mode=args.grouper_mode,
+            llm_service=llm_service,
+            fetcher=Fetcher(cache_mode="bypass"),
+            reuse_unchanged=False,
+            checkpoint=False,
+            output_path=None,
+            print_report=False,
+        )
+
+def run_benchmark(args) -> dict:
+    """Runs the sequential, memory and batch phases and returns the results."""
+    model = FakeGeminiModel(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, seed=args.seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        llm_service = LLMService(cache_mode="bypass", model=model)
+    fixtures = sorted(f for f in os.listdir(FIXTURES_DIR) if f.endswith(".html"))
+    results = {
+        "config": {k: getattr(args, k) for k in ("latency", "jitter", "error_rate", "seed", "repeat",
+                                                  "analyzer_mode", "grouper_mode", "batch_copies", "workers")},
+        "fixtures": {},
+        "stages": {},
+        "batch": {},
+    }
+
+    with fixture_server() as base_url:
+        # Sequential runs: document latency and per-stage timings.
+        tracer = Tracer()
+        for fixture in fixtures:
+            url = f"{base_url}/{fixture}"
+            latencies = []
+            calls_before = model.calls
+            failures = 0
+            with tracer.activate():
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    if analyze(url, llm_service, args) is None:
+                        failures += 1
+                    latencies.append(time.perf_counter() - start)
+            results["fixtures"][fixture] = {
+                "size_kib": round(os.path.getsize(os.path.join(FIXTURES_DIR, fixture)) / 1024, 1),
+                "latency_seconds": percentiles(latencies),
+                "llm_calls_per_run": round((model.calls - calls_before) / args.repeat, 1),
+                "failed_runs": failures,
+            }
+            print(f"{fixture}: p50 {results['fixtures'][fixture]['latency_seconds']['p50']:.3f}s "
+                  f"over {args.repeat} runs ({failures} failed)")
+
+        by_stage = {}
+        for s in tracer.spans:
+            by_stage.setdefault(s.name, []).append(s.duration)
+        for name, durations in sorted(by_stage.items(), key=lambda item: -sum(item[1])):
+            results["stages"][name] = {"count": len(durations), **percentiles(durations)}
+
+        # Peak Python memory, measured in a separate pass since tracemalloc slows everything down.
+        for fixture in fixtures:
+            tracemalloc.start()
+            analyze(f"{base_url}/{fixture}", llm_service, args)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results["fixtures"][fixture]["peak_memory_mib"] = round(peak / (1024 * 1024), 2)
+
+        # Batch throughput: distinct URLs so every document goes through the whole pipeline.
+        urls = [f"{base_url}/{fixtures[i % len(fixtures)]}?copy={i}" for i in range(args.batch_copies)]
+        with tempfile.TemporaryDirectory() as output_dir, contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            batch_results = run_batch(
+                urls, output_dir, workers=args.workers, html_cache_mode="bypass", llm_service=llm_service,
+                analyzer_mode=args.analyzer_mode, grouper_mode=args.grouper_mode, reuse_unchanged=False,
+                checkpoint=False,
+            )
+            elapsed = time.perf_counter() - start
+        results["batch"] = {
+            "documents": len(urls),
+            "failed": sum(1 for r in batch_results if r["status"] != "ok"),
+            "seconds": round(elapsed, 3),
+            "docs_per_minute": round(len(urls) / elapsed * 60, 1),
+        }
+
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in KiB on Linux and in bytes on macOS.
+        results["max_rss_mib"] = round(max_rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+    results["llm_calls"] = model.calls
+    return results
+
+def lookup(results: dict, path: str) -> dict:
+    """Resolves a dotted metric path (with '*' matching every key) to {concrete path: value}."""
+    found = {"": results}
+    for part in path.split("."):
+        next_found = {}
+        for prefix, node in found.items():
+            if not isinstance(node, dict):
+                continue
+            keys = node.keys() if part == "*" else [part] if part in node else []
+            for key in keys:
+                next_found[f"{prefix}.{key}" if prefix else key] = node[key]
+        found = next_found
+    return {p: v for p, v in found.items() if isinstance(v, (int, float))}
+
+def find_regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Lists the metrics that are worse than the baseline by more than tolerance (a fraction)."""
+    regressions = []
+    for path, higher_is_better in REGRESSION_METRICS:
+        current = lookup(results, path)
+        for metric, old in lookup(baseline, path).items():
+            new = current.get(metric)
+            if new is None or old <= 0:
+                continue
+            change = (new - old) / old
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append(f"{metric}: {old} -> {new} ({change:+.0%})")
+    return regressions
+
+def print_results(results: dict):
+    print(f"\n{'Fixture':<14} {'KiB':>6} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'calls':>6} {'peak MiB':>9}")
+    for name, r in results["fixtures"].items():
+        lat = r["latency_seconds"]
+        print(f"{name:<14} {r['size_kib']:>6.0f} {lat['p50']:>8.3f} {lat['p95']:>8.3f} {lat['p99']:>8.3f} "
+              f"{r['llm_calls_per_run']:>6.1f} {r['peak_memory_mib']:>9.2f}")
+    print(f"\n{'Stage':<32} {'count':>6} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8}")
+    for name, r in results["stages"].items():
+        print(f"{name:<32} {r['count']:>6} {r['p50']:>8.3f} {r['p95']:>8.3f} {r['p99']:>8.3f}")
+    batch = results["batch"]
+    print(f"\nBatch: {batch['documents']} documents in {batch['seconds']:.2f}s "
+          f"({batch['docs_per_minute']:.1f} docs/min, {batch['failed']} failed)")
+    if "max_rss_mib" in results:
+        print(f"Max RSS: {results['max_rss_mib']:.1f} MiB")
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline offline with a fake LLM backend.")
+    arg_parser.add_argument("--latency", type=float, default=0.05, help="Mean fake LLM response time in seconds.")
+    arg_parser.add_argument("--jitter", type=float, default=0.02, help="Response times vary uniformly by +/- this much.")
+    arg_parser.add_argument("--error-rate", type=float, default=0.0,
+                            help="Share of fake LLM calls that fail with a retryable 503 (retries use the real backoff delays).")
+    arg_parser.add_argument("--seed", type=int, default=0, help="Seed for the fake LLM's latency and failure draws.")
+    arg_parser.add_argument("--repeat", type=int, default=3, help="Sequential runs per fixture.")
+    arg_parser.add_argument("--analyzer-mode", choices=ANALYZER_MODES, default="separate", help="Analyzer mode to benchmark.")
+    arg_parser.add_argument("--grouper-mode", choices=GROUPER_MODES, default="llm", help="Grouper mode to benchmark.")
+    arg_parser.add_argument("--batch-copies", type=int, default=8, help="Documents in the batch throughput run.")
+    arg_parser.add_argument("--workers", type=int, default=4, help="Batch workers.")
+    arg_parser.add_argument("--output", help="Write the results as JSON to this file.")
+    arg_parser.add_argument("--baseline", help="Compare against results saved earlier with --output.")
+    arg_parser.add_argument("--tolerance", type=float, default=0.2,
+                            help="Allowed relative regression against the baseline (0.2 = 20%%).")
+    args = arg_parser.parse_args()
+
+    results = run_benchmark(args)
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%} against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"\nNo regressions beyond {args.tolerance:.0%} against {args.baseline}.")
+
+if __name__ == "__main__":
+    main()
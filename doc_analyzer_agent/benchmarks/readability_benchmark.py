@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""Micro-benchmark for the local readability metrics on a large corpus.
+
+Generates synthetic help-center articles and times
+compute_corpus_readability_metrics() over the whole corpus, next to calling
+compute_readability_metrics() once per document.
+
+Usage (from the project root):
+    python benchmarks/readability_benchmark.py [--documents 2000] [--paragraphs 30]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from analyzers.readability_metrics import compute_corpus_readability_metrics, compute_readability_metrics
+
+VOCABULARY = (
+    "the a user campaign segment dashboard is are was created configured by to of and in for with "
+    "select click open navigate settings analytics event attribute integration notification delivery "
+    "personalization audience performance documentation administrator automatically immediately"
+).split()
+
+def build_document(rng: random.Random, paragraphs: int) -> str:
+    """Builds one Markdown article with headings, prose, lists and a code block."""
+    lines = ["# Article title"]
+    for i in range(paragraphs):
+        if i % 6 == 0:
+            lines.append(f"\n## Section {i // 6}\n")
+        sentences = []
+        for _ in range(rng.randint(2, 6)):
+            words = rng.choices(VOCABULARY, k=rng.randint(5, 35))
+            sentences.append(" ".join(words).capitalize() + ".")
+        lines.append(" ".join(sentences) + "\n")
+        if i % 10 == 0:
+            lines.append("- Open the dashboard.\n- Click **Create campaign**.\n")
+            lines.append("```\ncurl https://api.example.com/v1/events\n```\n")
+    return "\n".join(lines)
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark local readability metrics on a synthetic corpus.")
+    arg_parser.add_argument("--documents", type=int, default=2000, help="Number of documents in the corpus.")
+    arg_parser.add_argument("--paragraphs", type=int, default=30, help="Paragraphs per document.")
+    args = arg_parser.parse_args()
+
+    rng = random.Random(0)
+    documents = [build_document(rng, args.paragraphs) for _ in range(args.documents)]
+    total_kib = sum(len(d) for d in documents) / 1024
+    print(f"Corpus: {args.documents} documents, {total_kib:.0f} KiB of Markdown")
+
+    start = time.perf_counter()
+    corpus_results = compute_corpus_readability_metrics(documents)
+    corpus_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    single_results = [compute_readability_metrics(d) for d in documents]
+    single_seconds = time.perf_counter() - start
+
+    assert corpus_results == single_results, "corpus and per-document results differ"
+    for name, seconds in (("corpus (one vectorized pass)", corpus_seconds), ("per document", single_seconds)):
+        print(f"{name:<30} {seconds:8.2f}s total  {seconds / args.documents * 100 * 1000:8.1f} ms per 100 docs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+from core.llm_service import LLMService
+from analyzers.readability import ReadabilityAnalyzer
+from analyzers.structure_flow import StructureFlowAnalyzer
+from analyzers.completeness_examples import CompletenessExamplesAnalyzer
+from analyzers.style_adherence import StyleAdherenceAnalyzer
+
+class CombinedAnalyzer:
+    """Runs all four analyses with a single LLM call.
+
+    The document is sent once and the LLM is asked for one section per analyzer, so
+    input tokens are paid once instead of four times. The response is split back into
+    the same per-analyzer dictionaries the individual analyzers return.
+    """
+
+    def __init__(self, llm_service: LLMService):
+        """Initializes the CombinedAnalyzer.
+
+        Args:
+            llm_service: An instance of the LLMService to use for analysis.
+        """
+        self.llm_service = llm_service
+        # The individual analyzers are only used to validate their section of the response.
+        self.section_analyzers = {
+            "readability": ReadabilityAnalyzer(llm_service),
+            "structure_flow": StructureFlowAnalyzer(llm_service),
+            "completeness_examples": CompletenessExamplesAnalyzer(llm_service),
+            "style_adherence": StyleAdherenceAnalyzer(llm_service),
+        }
+
+    def analyze(self, text_content: str) -> dict:
+        """Analyzes readability, structure/flow, completeness/examples and style in one call.
+
+        Args:
+            text_content: The text content to analyze.
+
+        Returns:
+            A dictionary keyed by analyzer name ('readability', 'structure_flow',
+            'completeness_examples', 'style_adherence'). Each value has the same
+            structure as the corresponding analyzer's analyze() result.
+        """
+        prompt = self._build_prompt(text_content)
+        analysis_result = self.llm_service.query_llm(prompt, stage="combined")
+        return self._split_result(analysis_result)
+
+    async def aanalyze(self, text_content: str) -> dict:
+        """Async counterpart of analyze(), returning the same result structure."""
+        prompt = self._build_prompt(text_content)
+        analysis_result = await self.llm_service.aquery_llm(prompt, stage="combined")
+        return self._split_result(analysis_result)
+
+    def _build_prompt(self, text_content: str) -> str:
+        """Builds the combined analysis prompt for the given content."""
+        return f"""Analyze the following documentation content in four separate sections.
+
+1.  **readability**: Assess readability strictly from the perspective of a non-technical marketer. Focus on clarity, sentence structure, and jargon reduction, citing specific sentences or phrases where possible. Also list 'persona pain points' - parts that would likely confuse or frustrate a marketer.
+2.  **structure_flow**: Assess the structure and logical flow: use of headings and subheadings, paragraph length and focus, use of lists or bullet points, and whether the information progresses logically and is easy to navigate. Also note any quantified issues (e.g., number of long paragraphs, lack of lists where useful).
+3.  **completeness_examples**: Assess the completeness of information and the quality/sufficiency of examples: is there enough detail to understand and implement the feature, are there clear and relevant examples, and where would examples significantly improve understanding?
+4.  **style_adherence**: Assess adherence to these simplified style guidelines: customer-focused, clear and concise voice and tone; no overly complex sentences or jargon; action-oriented language that tells the user what to do. Also give one or two examples of snippet-specific positive feedback if applicable.
+
+For each section provide a brief overall assessment (1-2 sentences), specific and actionable suggestions for improvement, and any positive feedback.
+
+Format the output as a single JSON object with exactly these keys:
+- "readability": an object with keys "assessment", "suggestions" (list of strings), "positive_feedback" (string), and "persona_pain_points" (string).
+- "structure_flow": an object with keys "assessment", "suggestions" (list of strings), "positive_feedback" (string), and "quantified_issues" (string).
+- "completeness_examples": an object with keys "assessment", "suggestions" (list of strings), and "positive_feedback" (string).
+- "style_adherence": an object with keys "assessment", "suggestions" (list of strings), "positive_feedback" (string), and "snippet_specific_feedback" (string).
+
+Content to analyze:
+---
+{text_content}
+---
+"""
+
+    def _split_result(self, analysis_result: dict | str | None) -> dict:
+        """Splits the combined LLM response into per-analyzer result dictionaries."""
+        if not (analysis_result and isinstance(analysis_result, dict)):
+            print(f"Combined analysis failed or returned unexpected format: {analysis_result}")
+            analysis_result = {}
+
+        results = {}
+        for name, analyzer in self.section_analyzers.items():
+            # Each analyzer's own validation fills in defaults (or its failure result).
+            results[name] = analyzer._process_result(analysis_result.get(name))
+        return results
@@ -29,7 +29,19 @@ class CompletenessExamplesAnalyzer:
                 "positive_feedback": "The initial example is clear and helpful."
             }
         """
-        prompt = f"""Analyze the following documentation content for completeness of information and the quality/sufficiency of examples. Consider:
+        prompt = self._build_prompt(text_content)
+        analysis_result = self.llm_service.query_llm(prompt, stage="completeness_examples")
+        return self._process_result(analysis_result)
+
+    async def aanalyze(self, text_content: str) -> dict:
+        """Async counterpart of analyze(), returning the same result structure."""
+        prompt = self._build_prompt(text_content)
+        analysis_result = await self.llm_service.aquery_llm(prompt, stage="completeness_examples")
+        return self._process_result(analysis_result)
+
+    def _build_prompt(self, text_content: str) -> str:
+        """Builds the completeness/examples analysis prompt for the given content."""
+        return f"""Analyze the following documentation content for completeness of information and the quality/sufficiency of examples. Consider:
 - Does the article provide enough detail for a user to understand and implement the feature or concept?
 - Are there sufficient, clear, and relevant examples provided?
 - Are there areas where the information seems incomplete or ambiguous?
@@ -48,8 +60,8 @@ Content to analyze:
 ---
 """
 
-        analysis_result = self.llm_service.query_llm(prompt)
-
+    def _process_result(self, analysis_result: dict | str | None) -> dict:
+        """Validates the raw LLM result and fills in defaults for missing keys."""
         # Basic validation and parsing
         if analysis_result and isinstance(analysis_result, dict):
             return {
@@ -62,6 +74,7 @@ Content to analyze:
             return {
                 "assessment": "Completeness/Examples analysis could not be performed.",
                 "suggestions": [],
-                "positive_feedback": ""
+                "positive_feedback": "",
+                "failed": True
             }
 
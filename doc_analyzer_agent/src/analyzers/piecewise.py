@@ -0,0 +1,130 @@
+# src/analyzers/piecewise.py
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, wait
+from core.section_store import SectionResultStore
+from analyzers.runner import failed_analysis_result, is_failed_result, analyzer_prompt_version
+from analyzers.result_merger import merge_analyzer_results
+from core.tracing import span
+from core.cassette import CassetteMissError
+
+def section_label(section) -> str:
+    """Returns the label used for a section or chunk in merged assessments."""
+    return section.heading or "Introduction"
+
+def run_piecewise_analysis(
+    analyzers: dict,
+    sections: list,
+    store: SectionResultStore | None = None,
+    variant: str = "",
+    combined_analyzer=None,
+    max_workers: int = 4,
+    timeout: float | None = None,
+    deduplicate: bool = False
+) -> tuple[dict, dict]:
+    """Analyzes a document piece by piece in parallel and merges the results.
+
+    This is a map-reduce over the document's sections (or chunks): every piece is
+    analyzed separately, and the per-piece results are merged into one result per
+    analyzer, so the output has the same shape as run_analyzers(). With a store,
+    pieces whose content hash already has a stored result are not sent to the LLM
+    again, which makes re-runs incremental.
+
+    Args:
+        analyzers: Mapping of analyzer name to an object exposing analyze(text_content).
+        sections: The pieces to analyze, in document order. Each needs `heading`,
+                  `text` and `content_hash` attributes (see core.parser.Section and
+                  core.chunker.Chunk).
+        store: Optional store where per-piece results are looked up and saved.
+        variant: Distinguishes stored results produced under different settings
+                 (e.g. the model name), so they are never mixed. Results are also
+                 keyed by the prompt of the analyzer (or combined analyzer) that
+                 produced them.
+        combined_analyzer: If given, each piece is analyzed with this CombinedAnalyzer
+                           in one call instead of one call per analyzer.
+        max_workers: Maximum number of analyzer calls in flight at once.
+        timeout: Optional number of seconds to wait for all new analyses.
+        deduplicate: Drop repeated suggestions when merging the per-piece results.
+
+    Returns:
+        A (analysis_results, stats) tuple. analysis_results maps each analyzer name to
+        its merged result; stats counts the parts, plus the changed parts and the
+        reused and new results (with a store) and the suggestions removed as
+        duplicates (with deduplicate).
+    """
+    section_results = {name: [None] * len(sections) for name in analyzers}
+    pending = {} # section index -> analyzer names still to analyze
+    variants = {}
+    if store:
+        variants = {name: f"{variant}|{analyzer_prompt_version(combined_analyzer or analyzer)}" for name, analyzer in analyzers.items()}
+    for i, section in enumerate(sections):
+        for name in analyzers:
+            stored = store.get(name, section.content_hash, variants[name]) if store else None
+            if stored is not None:
+                section_results[name][i] = stored
+            else:
+                pending.setdefault(i, []).append(name)
+
+    analyzed_count = sum(len(names) for names in pending.values())
+    if store:
+        print(f"Incremental analysis: {len(pending)} of {len(sections)} sections are new or changed; "
+              f"reusing {len(sections) * len(analyzers) - analyzed_count} stored section results.")
+    else:
+        print(f"Analyzing {len(sections)} document parts in parallel.")
+
+    if pending:
+        if combined_analyzer is not None:
+            tasks = [(i, None) for i in pending]
+        else:
+            tasks = [(i, name) for i, names in pending.items() for name in names]
+        executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tasks))))
+        try:
+            futures = {}
+            for i, name in tasks:
+                analyzer = combined_analyzer if name is None else analyzers[name]
+                # As in run_analyzers(), a context copy keeps the calls in the caller's metrics.
+                futures[executor.submit(contextvars.copy_context().run, _analyze_part, analyzer, name, sections[i])] = (i, name)
+            wait(futures, timeout=timeout)
+
+            for future, (i, name) in futures.items():
+                names = pending[i] if name is None else [name]
+                try:
+                    if not future.done():
+                        raise TimeoutError(f"timed out after {timeout} seconds")
+                    outcome = future.result()
+                    new_results = outcome if name is None else {name: outcome}
+                except CassetteMissError:
+                    raise # A strict replay must fail the run, not degrade to a placeholder
+                except Exception as e:
+                    print(f"Error analyzing section '{section_label(sections[i])}': {e}")
+                    new_results = {}
+                for analyzer_name in names:
+                    result = new_results.get(analyzer_name) or failed_analysis_result(analyzer_name)
+                    section_results[analyzer_name][i] = result
+                    # Failed analyses are not stored, so they are retried on the next run.
+                    if store and not is_failed_result(result):
+                        store.put(analyzer_name, sections[i].content_hash, result, variants[analyzer_name])
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    analysis_results = {}
+    duplicates_removed = 0
+    for name in analyzers:
+        labeled = [(section_label(section), section_results[name][i]) for i, section in enumerate(sections)]
+        analysis_results[name] = merge_analyzer_results(name, labeled, deduplicate=deduplicate)
+        total_suggestions = sum(len(result.get("suggestions") or []) for _, result in labeled if not is_failed_result(result))
+        duplicates_removed += total_suggestions - len(analysis_results[name].get("suggestions") or [])
+
+    stats = {"parts": len(sections)}
+    if store:
+        stats.update({
+            "changed_parts": len(pending),
+            "reused_results": len(sections) * len(analyzers) - analyzed_count,
+            "new_results": analyzed_count,
+        })
+    if deduplicate:
+        stats["duplicate_suggestions_removed"] = duplicates_removed
+    return analysis_results, stats
+
+def _analyze_part(analyzer, name: str | None, section) -> dict:
+    with span(f"analyze:{name or 'combined'}", category="analyzer", part=section_label(section)):
+        return analyzer.analyze(section.text)
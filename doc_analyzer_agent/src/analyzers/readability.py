@@ -1,15 +1,20 @@
 from core.llm_service import LLMService
+import config
 
 class ReadabilityAnalyzer:
     """Analyzes the readability of text content, focusing on a non-technical marketer persona."""
 
-    def __init__(self, llm_service: LLMService):
+    def __init__(self, llm_service: LLMService, include_metrics: bool = config.READABILITY_METRICS_IN_PROMPT):
         """Initializes the ReadabilityAnalyzer.
 
         Args:
             llm_service: An instance of the LLMService to use for analysis.
+            include_metrics: Whether to give the LLM locally computed readability
+                             metrics (sentence lengths, Flesch scores, passive voice)
+                             along with the content.
         """
         self.llm_service = llm_service
+        self.include_metrics = include_metrics
 
     def analyze(self, text_content: str) -> dict:
         """Analyzes the readability of the provided text content.
@@ -31,22 +36,43 @@ class ReadabilityAnalyzer:
                 "persona_pain_points": "Marketers might struggle with technical term Z."
             }
         """
-        prompt = f"""Analyze the following documentation content strictly from the perspective of a non-technical marketer. Assess its readability. Provide:
+        prompt = self._build_prompt(text_content)
+        analysis_result = self.llm_service.query_llm(prompt, stage="readability")
+        return self._process_result(analysis_result)
+
+    async def aanalyze(self, text_content: str) -> dict:
+        """Async counterpart of analyze(), returning the same result structure."""
+        prompt = self._build_prompt(text_content)
+        analysis_result = await self.llm_service.aquery_llm(prompt, stage="readability")
+        return self._process_result(analysis_result)
+
+    def _build_prompt(self, text_content: str) -> str:
+        """Builds the readability analysis prompt for the given content."""
+        metrics_block = ""
+        if self.include_metrics:
+            from analyzers.readability_metrics import compute_readability_metrics, format_metrics_for_prompt # Imports NumPy
+            metrics_summary = format_metrics_for_prompt(compute_readability_metrics(text_content))
+            if metrics_summary:
+                metrics_block = f"""
+Measured readability metrics for this content (use them to support your assessment):
+{metrics_summary}
+"""
+        return f"""Analyze the following documentation content strictly from the perspective of a non-technical marketer. Assess its readability. Provide:
 1.  A brief overall assessment (1-2 sentences) explaining *why* it is or isn't readable for this persona.
 2.  Specific, actionable suggestions for improvement, citing specific sentences or phrases where possible. Focus on clarity, sentence structure, and jargon reduction.
 3.  Any positive feedback regarding readability.
 4.  Specific examples of 'persona pain points' - parts that would likely confuse or frustrate a marketer.
 
 Format the output as a JSON object with keys: "assessment", "suggestions" (list of strings), "positive_feedback" (string), and "persona_pain_points" (string).
-
+{metrics_block}
 Content to analyze:
 ---
 {text_content}
 ---
 """
 
-        analysis_result = self.llm_service.query_llm(prompt)
-
+    def _process_result(self, analysis_result: dict | str | None) -> dict:
+        """Validates the raw LLM result and fills in defaults for missing keys."""
         # Basic validation and parsing (can be enhanced)
         if analysis_result and isinstance(analysis_result, dict):
             # Ensure expected keys are present, add defaults if missing
@@ -62,6 +88,7 @@ Content to analyze:
                 "assessment": "Readability analysis could not be performed.",
                 "suggestions": [],
                 "positive_feedback": "",
-                "persona_pain_points": ""
+                "persona_pain_points": "",
+                "failed": True
             }
 
@@ -0,0 +1,252 @@
+# src/analyzers/readability_metrics.py
+import re
+import unicodedata
+import numpy as np
+from core.parser import HTMLParser, ATX_HEADING_PATTERN, CODE_FENCE_PATTERN
+import config
+
+# A candidate sentence break; it is a break only if the next letter or digit is an upper-case letter or a digit.
+SENTENCE_BREAK_PATTERN = re.compile(r"(?<=[.!?])\s+(?=[\"'(\[]?([^\W_]))")
+LIST_ITEM_PATTERN = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+")
+IMAGE_PATTERN = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+LINK_PATTERN = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+MARKUP_PATTERN = re.compile(r"[*_`>#]+")
+# A form of "to be", an optional adverb, then a past participle (regular or common irregular).
+PASSIVE_PATTERN = re.compile(
+    r"\b(?:am|is|are|was|were|be|been|being)[ \t]+(?:\w+ly[ \t]+)?"
+    r"(?:\w+ed|built|chosen|done|driven|found|given|held|hidden|kept|known|left|made|paid|put|"
+    r"read|run|seen|sent|set|shown|sold|spent|taken|told|understood|written)\b",
+    re.IGNORECASE
+)
+
+VOWELS = np.frombuffer(b"aeiouy", dtype=np.uint8).astype(np.uint32)
+NEWLINE, APOSTROPHE, LETTER_D, LETTER_E, LETTER_L, LETTER_T = (ord(c) for c in "\n'delt")
+RIGHT_SINGLE_QUOTE = ord("\u2019") # Typographic apostrophe, as in "don\u2019t"
+
+def compute_readability_metrics(markdown: str) -> dict:
+    """Computes local readability metrics for one Markdown document.
+
+    See compute_corpus_readability_metrics() for the metrics returned.
+    """
+    return compute_corpus_readability_metrics([markdown])[0]
+
+def compute_corpus_readability_metrics(documents: list[str]) -> list[dict]:
+    """Computes readability metrics for many Markdown documents at once.
+
+    Text is split into sentences with regular expressions (code blocks, tables and
+    headings are skipped), and everything after that (word and syllable counts,
+    per-section and per-document aggregates and sentence length percentiles) is
+    computed with NumPy over the whole corpus in one pass, so large batches stay
+    cheap.
+
+    Args:
+        documents: Markdown documents, e.g. produced by HTMLParser.parse().
+
+    Returns:
+        One dictionary per document with its sentence and word counts, the sentence
+        length distribution (average, median, 90th percentile, max), the Flesch
+        reading ease and Flesch-Kincaid grade, the passive-voice ratio and the
+        number of long sentences (over config.READABILITY_LONG_SENTENCE_WORDS
+        words), plus the same metrics for each section under "sections".
+    """
+    parser = HTMLParser()
+    section_headings = []    # per section
+    section_documents = []   # per section: document index
+    sentences = []
+    sentence_sections = []   # per sentence: section index
+    for doc_index, markdown in enumerate(documents):
+        for section in parser.split_sections(markdown or ""):
+            section_sentences = _sentences(section.text)
+            sentences.extend(section_sentences)
+            sentence_sections.extend([len(section_headings)] * len(section_sentences))
+            section_headings.append(section.heading)
+            section_documents.append(doc_index)
+
+    # Sentences never contain newlines, so the corpus is scanned as one newline-joined text.
+    blob = "\n".join(sentences)
+    word_counts, syllables = _count_words_and_syllables(blob, len(sentences))
+    sentence_lengths = np.fromiter((len(sentence) + 1 for sentence in sentences), dtype=np.int64, count=len(sentences))
+    sentence_starts = np.cumsum(sentence_lengths) - sentence_lengths
+    passive_matches = np.array([m.start() for m in PASSIVE_PATTERN.finditer(blob)], dtype=np.int64)
+    passive = np.zeros(len(sentences), dtype=bool)
+    passive[np.searchsorted(sentence_starts, passive_matches, side="right") - 1] = True
+
+    # Sentences without words (e.g. a lone link or number) are not counted.
+    has_words = word_counts > 0
+    word_counts, syllables, passive = word_counts[has_words], syllables[has_words], passive[has_words]
+    sentence_sections = np.array(sentence_sections, dtype=np.int64)[has_words]
+
+    section_metrics = _aggregate(sentence_sections, len(section_headings), word_counts, syllables, passive)
+    section_documents = np.array(section_documents, dtype=np.int64)
+    document_metrics = _aggregate(section_documents[sentence_sections], len(documents), word_counts, syllables, passive)
+
+    results = [dict(metrics, sections=[]) for metrics in document_metrics]
+    for section_index, metrics in enumerate(section_metrics):
+        results[section_documents[section_index]]["sections"].append(
+            dict(heading=section_headings[section_index], **metrics)
+        )
+    return results
+
+def format_metrics_for_prompt(metrics: dict) -> str:
+    """Summarizes document-level metrics as a few lines to include in an LLM prompt."""
+    if not metrics.get("sentences"):
+        return ""
+    return (
+        f"- Sentences: {metrics['sentences']}, words: {metrics['words']}\n"
+        f"- Words per sentence: average {metrics['avg_sentence_length']}, "
+        f"90th percentile {metrics['p90_sentence_length']}, longest {metrics['max_sentence_length']}\n"
+        f"- Sentences over {config.READABILITY_LONG_SENTENCE_WORDS} words: {metrics['long_sentences']}\n"
+        f"- Flesch reading ease: {metrics['flesch_reading_ease']} (Flesch-Kincaid grade {metrics['flesch_kincaid_grade']})\n"
+        f"- Passive-voice sentences: {round(metrics['passive_voice_ratio'] * 100)}%"
+    )
+
+def _sentences(markdown: str) -> list[str]:
+    """Splits Markdown prose into sentences, skipping code, tables and headings."""
+    blocks = []
+    paragraph = []
+    in_code_block = False
+    for line in markdown.splitlines():
+        if CODE_FENCE_PATTERN.match(line):
+            in_code_block = not in_code_block
+            continue
+        stripped = line.strip()
+        if in_code_block or not stripped or ATX_HEADING_PATTERN.match(line) or stripped.startswith("|"):
+            if paragraph:
+                blocks.append(" ".join(paragraph))
+                paragraph = []
+            continue
+        if LIST_ITEM_PATTERN.match(line):
+            # Each list item is read as its own unit.
+            if paragraph:
+                blocks.append(" ".join(paragraph))
+                paragraph = []
+            blocks.append(LIST_ITEM_PATTERN.sub("", line, count=1))
+            continue
+        paragraph.append(stripped)
+    if paragraph:
+        blocks.append(" ".join(paragraph))
+
+    sentences = []
+    for block in blocks:
+        text = MARKUP_PATTERN.sub("", LINK_PATTERN.sub(r"\1", IMAGE_PATTERN.sub("", block)))
+        sentences.extend(_split_sentences(text))
+    return sentences
+
+def _split_sentences(text: str) -> list[str]:
+    """Splits text after sentence punctuation followed by an upper-case letter (in any script) or a digit."""
+    sentences = []
+    start = 0
+    for match in SENTENCE_BREAK_PATTERN.finditer(text):
+        following = match.group(1)
+        if following.isupper() or following.isdigit():
+            sentences.append(text[start:match.start()])
+            start = match.end()
+    sentences.append(text[start:])
+    return sentences
+
+def _count_words_and_syllables(blob: str, sentence_count: int) -> tuple[np.ndarray, np.ndarray]:
+    """Counts words and estimated syllables per newline-separated sentence of blob.
+
+    Works on the code points: a word is a run of letters in any script (apostrophes
+    between letters included, as in "don't"), and syllables are counted as vowel
+    groups, accented vowels included, with a correction for silent endings.
+    """
+    if not sentence_count:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    chars = np.frombuffer(blob.encode("utf-32-le"), dtype=np.uint32)
+    is_letter, lower = _fold_letters(chars)
+    before = np.concatenate(([False], is_letter[:-1]))
+    after = np.concatenate((is_letter[1:], [False]))
+    is_apostrophe = (chars == APOSTROPHE) | (chars == RIGHT_SINGLE_QUOTE)
+    in_word = is_letter | (is_apostrophe & before & after)
+    word_starts = in_word & ~np.concatenate(([False], in_word[:-1]))
+    word_ends = np.flatnonzero(in_word & ~np.concatenate((in_word[1:], [False])))
+
+    sentence_ids = np.cumsum(chars == NEWLINE)
+    word_counts = np.bincount(sentence_ids[word_starts], minlength=sentence_count)
+    word_count = len(word_ends)
+    if not word_count:
+        return word_counts, np.zeros(sentence_count, dtype=np.int64)
+
+    word_ids = np.cumsum(word_starts) - 1
+    is_vowel = is_letter & np.isin(lower, VOWELS)
+    vowel_groups = is_vowel & ~np.concatenate(([False], is_vowel[:-1]))
+    syllables = np.bincount(word_ids[vowel_groups], minlength=word_count)
+
+    # A trailing "e" (but not "-le") and "-ed" (but not "-ted"/"-ded") are usually silent.
+    previous = lower[np.maximum(word_ends - 1, 0)]
+    before_previous = lower[np.maximum(word_ends - 2, 0)]
+    silent_e = (lower[word_ends] == LETTER_E) & (previous != LETTER_L)
+    silent_ed = (lower[word_ends] == LETTER_D) & (previous == LETTER_E) & ~np.isin(before_previous, [LETTER_T, LETTER_D])
+    syllables = np.maximum(syllables - ((silent_e | silent_ed) & (syllables > 1)), 1)
+
+    sentence_syllables = np.bincount(sentence_ids[word_ends], weights=syllables, minlength=sentence_count)
+    return word_counts, sentence_syllables.astype(np.int64)
+
+def _fold_letters(chars: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Finds the letters among code points and folds them to lower case without accents.
+
+    Returns:
+        A mask of the letters (in any script) and the code points with letters
+        lower-cased and accents removed (e.g. "É" -> "e"), so vowels and silent
+        endings are recognized in accented words too.
+    """
+    is_upper_ascii = (chars >= ord("A")) & (chars <= ord("Z"))
+    lower = np.where(is_upper_ascii, chars | 0x20, chars)
+    is_letter = (lower >= ord("a")) & (lower <= ord("z"))
+    non_ascii = chars > 0x7F
+    if non_ascii.any():
+        # Only the distinct non-ASCII characters are classified, one by one.
+        distinct = np.unique(chars[non_ascii])
+        letters = np.array([chr(c).isalpha() for c in distinct])
+        folded = np.array([ord(unicodedata.normalize("NFD", chr(c))[0].lower()[0]) for c in distinct], dtype=np.uint32)
+        index = np.searchsorted(distinct, chars[non_ascii])
+        is_letter[non_ascii] = letters[index]
+        lower[non_ascii] = np.where(letters[index], folded[index], chars[non_ascii])
+    return is_letter, lower
+
+def _aggregate(group_ids: np.ndarray, group_count: int, word_counts: np.ndarray,
+               syllables: np.ndarray, passive: np.ndarray) -> list[dict]:
+    """Aggregates sentence-level arrays into metrics for each group (section or document)."""
+    sentences = np.bincount(group_ids, minlength=group_count)
+    words = np.bincount(group_ids, weights=word_counts, minlength=group_count)
+    group_syllables = np.bincount(group_ids, weights=syllables, minlength=group_count)
+    passive_sentences = np.bincount(group_ids, weights=passive, minlength=group_count)
+    long_sentences = np.bincount(
+        group_ids, weights=word_counts > config.READABILITY_LONG_SENTENCE_WORDS, minlength=group_count
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        words_per_sentence = words / sentences
+        syllables_per_word = group_syllables / words
+        flesch = 206.835 - 1.015 * words_per_sentence - 84.6 * syllables_per_word
+        grade = 0.39 * words_per_sentence + 11.8 * syllables_per_word - 15.59
+        passive_ratio = passive_sentences / sentences
+
+    # Percentiles per group (nearest rank): sort sentence lengths within each group,
+    # then index into each group's run. The trailing 0 is read by empty groups.
+    order = np.lexsort((word_counts, group_ids))
+    sorted_lengths = np.append(word_counts[order], 0)
+    starts = np.cumsum(sentences) - sentences
+    median, p90, longest = (
+        sorted_lengths[starts + np.maximum(np.ceil(q * sentences).astype(np.int64) - 1, 0)] for q in (0.5, 0.9, 1.0)
+    )
+
+    metrics = []
+    for i in range(group_count):
+        if not sentences[i]:
+            metrics.append({"sentences": 0, "words": 0})
+            continue
+        metrics.append({
+            "sentences": int(sentences[i]),
+            "words": int(words[i]),
+            "avg_sentence_length": round(float(words_per_sentence[i]), 1),
+            "median_sentence_length": int(median[i]),
+            "p90_sentence_length": int(p90[i]),
+            "max_sentence_length": int(longest[i]),
+            "long_sentences": int(long_sentences[i]),
+            "passive_voice_ratio": round(float(passive_ratio[i]), 3),
+            "flesch_reading_ease": round(float(flesch[i]), 1),
+            "flesch_kincaid_grade": round(float(grade[i]), 1),
+        })
+    return metrics
@@ -0,0 +1,73 @@
+# src/analyzers/result_merger.py
+import re
+from analyzers.runner import failed_analysis_result, is_failed_result
+
+def normalize_suggestion(suggestion) -> str:
+    """Normalizes suggestion text for duplicate detection (case, punctuation, spacing)."""
+    text = suggestion.get("suggestion", "") if isinstance(suggestion, dict) else str(suggestion)
+    return " ".join(re.sub(r"[^a-z0-9]+", " ", text.lower()).split())
+
+def merge_analyzer_results(analyzer_name: str, labeled_results: list[tuple[str, dict]], deduplicate: bool = False) -> dict:
+    """Merges one analyzer's results for several parts of a document into one result.
+
+    Used when a document is analyzed piecewise (e.g. section by section), so the rest
+    of the pipeline still receives a single result per analyzer in the usual schema.
+
+    Args:
+        analyzer_name: The analyzer key (e.g., 'readability').
+        labeled_results: (label, result) pairs in document order, where the label
+                         names the part of the document (e.g. its heading).
+        deduplicate: Drop suggestions that repeat an earlier one (ignoring case,
+                     punctuation and spacing).
+
+    Returns:
+        A single result dictionary with the assessments labeled and combined, the
+        suggestions concatenated in order, and other text fields joined. Parts that
+        could not be analyzed are left out and counted under "failed_parts".
+    """
+    successful = [(label, result) for label, result in labeled_results if not is_failed_result(result)]
+    if not successful:
+        return failed_analysis_result(analyzer_name)
+    failed_parts = len(labeled_results) - len(successful)
+    if len(successful) == 1:
+        merged = dict(successful[0][1])
+        if failed_parts:
+            merged["failed_parts"] = failed_parts
+        return merged
+
+    merged = {"assessment": "", "suggestions": [], "positive_feedback": ""}
+    assessments = []
+    text_fields = {}
+    for label, result in successful:
+        assessment = result.get("assessment")
+        if assessment:
+            assessments.append(f"{label}: {assessment}" if label else assessment)
+        suggestions = result.get("suggestions", [])
+        if isinstance(suggestions, list):
+            merged["suggestions"].extend(suggestions)
+        for key, value in result.items():
+            if key in ("assessment", "suggestions"):
+                continue
+            if isinstance(value, str) and value:
+                values = text_fields.setdefault(key, [])
+                if value not in values:
+                    values.append(value)
+            elif isinstance(value, list):
+                merged.setdefault(key, []).extend(value)
+
+    if deduplicate:
+        seen = set()
+        unique_suggestions = []
+        for suggestion in merged["suggestions"]:
+            key = normalize_suggestion(suggestion)
+            if key not in seen:
+                seen.add(key)
+                unique_suggestions.append(suggestion)
+        merged["suggestions"] = unique_suggestions
+
+    merged["assessment"] = " ".join(assessments)
+    for key, values in text_fields.items():
+        merged[key] = " ".join(values)
+    if failed_parts:
+        merged["failed_parts"] = failed_parts
+    return merged
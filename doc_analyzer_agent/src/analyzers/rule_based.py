@@ -0,0 +1,415 @@
+# src/analyzers/rule_based.py
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from core.parser import ATX_HEADING_PATTERN, CODE_FENCE_PATTERN
+from analyzers.readability_metrics import compute_readability_metrics, PASSIVE_PATTERN
+import config
+
+ORDERED_ITEM_PATTERN = re.compile(r"^\s*\d+[.)]\s+(.*)")
+UNORDERED_ITEM_PATTERN = re.compile(r"^\s*[-*+]\s+(.*)")
+IMAGE_PATTERN = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[[^\]]+\]\([^)]*\)")
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z'-]*")
+SENTENCE_PATTERN = re.compile(r"[^.!?]+[.!?]?")
+PLACEHOLDER_PATTERN = re.compile(r"\b(?:TODO|TBD|FIXME|lorem ipsum)\b", re.IGNORECASE)
+UI_ACTION_PATTERN = re.compile(r"\b(?:click|select|navigate|go to|open|tap|choose|toggle)\b", re.IGNORECASE)
+SEQUENCE_PATTERN = re.compile(r"\b(?:first|then|next|after that|finally|once you)\b", re.IGNORECASE)
+TECHNICAL_PATTERN = re.compile(r"\b(?:api|sdk|endpoint|payload|json|curl|request|response|code|script|webhook)\b", re.IGNORECASE)
+# Step openers that are not imperative: "You should...", "The user...", "Clicking...", "Please..."
+NON_IMPERATIVE_STEP_PATTERN = re.compile(
+    r"^(?:you (?:can|should|must|need to|will|may)|the user|users|we |please\b|\w+ing\b)", re.IGNORECASE
+)
+MINIMIZING_WORDS_PATTERN = re.compile(r"\b(?:simply|just|easy|easily|obviously|of course|clearly)\b", re.IGNORECASE)
+WORDY_PHRASES = {
+    "in order to": "to",
+    "click on": "click",
+    "make use of": "use",
+    "at this point in time": "now",
+    "is able to": "can",
+    "prior to": "before",
+}
+
+@dataclass
+class _DocumentScan:
+    """Structural facts about a Markdown document, gathered in one pass."""
+    headings: list = field(default_factory=list)        # (level, text)
+    paragraphs: list = field(default_factory=list)      # prose paragraphs (outside lists and code)
+    ordered_items: list = field(default_factory=list)   # text of numbered list items
+    unordered_items: list = field(default_factory=list) # text of bulleted list items
+    section_words: list = field(default_factory=list)   # (heading, words until the next heading)
+    code_blocks: int = 0
+    images: int = 0
+    links: int = 0
+    words: int = 0
+    text: str = ""
+
+    @property
+    def prose(self) -> str:
+        """The paragraph and list item text, without headings or code."""
+        return "\n".join(self.paragraphs + self.ordered_items + self.unordered_items)
+
+def _scan(markdown: str) -> _DocumentScan:
+    scan = _DocumentScan(text=markdown)
+    paragraph = []
+    in_code_block = False
+    section_heading, section_words = "", 0
+
+    def end_paragraph():
+        if paragraph:
+            scan.paragraphs.append(" ".join(paragraph))
+            paragraph.clear()
+
+    for line in markdown.splitlines():
+        if CODE_FENCE_PATTERN.match(line):
+            if not in_code_block:
+                scan.code_blocks += 1
+            in_code_block = not in_code_block
+            end_paragraph()
+            continue
+        if in_code_block:
+            continue
+        scan.images += len(IMAGE_PATTERN.findall(line))
+        scan.links += len(LINK_PATTERN.findall(line))
+        line_words = len(WORD_PATTERN.findall(IMAGE_PATTERN.sub("", line)))
+        heading = ATX_HEADING_PATTERN.match(line)
+        if heading:
+            end_paragraph()
+            if section_words or section_heading:
+                scan.section_words.append((section_heading, section_words))
+            section_heading, section_words = heading.group(2), 0
+            scan.headings.append((len(heading.group(1)), heading.group(2)))
+            continue
+        scan.words += line_words
+        section_words += line_words
+        if line.lstrip().startswith("|"):
+            # Table rows are not prose (readability_metrics skips them too).
+            end_paragraph()
+            continue
+        ordered = ORDERED_ITEM_PATTERN.match(line)
+        unordered = UNORDERED_ITEM_PATTERN.match(line)
+        if ordered or unordered:
+            end_paragraph()
+            (scan.ordered_items if ordered else scan.unordered_items).append((ordered or unordered).group(1).strip())
+        elif line.strip():
+            paragraph.append(line.strip())
+        else:
+            end_paragraph()
+    end_paragraph()
+    if section_words or section_heading:
+        scan.section_words.append((section_heading, section_words))
+    return scan
+
+def _finding(suggestion: str, impact: str, difficulty: str, theme: str) -> dict:
+    """A rule-based suggestion, carrying the scores and theme the LLM would otherwise assign."""
+    return {"suggestion": suggestion, "impact": impact, "difficulty": difficulty, "theme": theme}
+
+def _quote(text: str, words: int = 10) -> str:
+    """Returns the first few words of a text for citing it in a suggestion."""
+    parts = IMAGE_PATTERN.sub("", text).split()
+    return " ".join(parts[:words]) + ("..." if len(parts) > words else "")
+
+def _plural(count: int, noun: str) -> str:
+    return f"{count} {noun}{'' if count == 1 else 's'}"
+
+def _words(text: str) -> int:
+    return len(WORD_PATTERN.findall(text))
+
+class _RuleBasedAnalyzer(ABC):
+    """Base class for deterministic, local analyzers used in fast mode.
+
+    Subclasses implement _check(scan) and return a result with the same keys as
+    their LLM-backed counterparts. Suggestions are dictionaries that already carry
+    'impact', 'difficulty' and 'theme', so they can be prioritized and grouped
+    without an LLM.
+    """
+
+    def analyze(self, text_content: str) -> dict:
+        """Analyzes the provided text content with local rules.
+
+        Args:
+            text_content: The Markdown content to analyze.
+
+        Returns:
+            A dictionary with 'assessment', 'suggestions' and 'positive_feedback',
+            plus the analyzer-specific keys of the LLM-backed analyzer.
+        """
+        return self._check(_scan(text_content or ""))
+
+    async def aanalyze(self, text_content: str) -> dict:
+        """Async counterpart of analyze(). The rules are fast enough to run inline."""
+        return self.analyze(text_content)
+
+    @abstractmethod
+    def _check(self, scan: _DocumentScan) -> dict:
+        """Applies the analyzer's rules to a scanned document and returns its result."""
+
+class ReadabilityRules(_RuleBasedAnalyzer):
+    """Rule-based readability checks: long sentences and paragraphs, jargon, passive voice."""
+
+    def _check(self, scan: _DocumentScan) -> dict:
+        metrics = compute_readability_metrics(scan.text)
+        suggestions = []
+        praise = []
+
+        long_sentences = [
+            sentence.strip() for paragraph in scan.paragraphs + scan.ordered_items + scan.unordered_items
+            for sentence in SENTENCE_PATTERN.findall(paragraph)
+            if _words(sentence) > config.READABILITY_LONG_SENTENCE_WORDS
+        ]
+        for sentence in long_sentences[:config.FAST_MODE_MAX_CITED_ITEMS]:
+            suggestions.append(_finding(
+                f"Split this {_words(sentence)}-word sentence into shorter ones: \"{_quote(sentence)}\"",
+                "Medium", "Low", "Clarity"
+            ))
+
+        long_paragraphs = [p for p in scan.paragraphs if _words(p) > config.FAST_MODE_MAX_PARAGRAPH_WORDS]
+        for paragraph in long_paragraphs[:config.FAST_MODE_MAX_CITED_ITEMS]:
+            suggestions.append(_finding(
+                f"Break up the {_words(paragraph)}-word paragraph starting \"{_quote(paragraph)}\" into shorter paragraphs or a list.",
+                "Medium", "Low", "Clarity"
+            ))
+
+        lowered = scan.prose.lower()
+        jargon = [term for term in config.FAST_MODE_JARGON_TERMS if re.search(rf"\b{re.escape(term.lower())}\b", lowered)]
+        if jargon:
+            suggestions.append(_finding(
+                f"Explain or link to a definition of these technical terms for non-technical readers: {', '.join(jargon)}.",
+                "High", "Low", "Clarity"
+            ))
+
+        if metrics.get("sentences") and metrics["passive_voice_ratio"] > config.FAST_MODE_MAX_PASSIVE_RATIO:
+            examples = [p for p in scan.paragraphs if PASSIVE_PATTERN.search(p)]
+            example = f" For example: \"{_quote(examples[0])}\"" if examples else ""
+            suggestions.append(_finding(
+                f"Rewrite passive sentences in the active voice ({round(metrics['passive_voice_ratio'] * 100)}% of sentences are passive).{example}",
+                "Medium", "Low", "Clarity"
+            ))
+
+        if not metrics.get("sentences"):
+            assessment = "The page has no prose to assess."
+        else:
+            ease = metrics["flesch_reading_ease"]
+            level = "easy" if ease >= 60 else "fairly difficult" if ease >= 40 else "difficult"
+            assessment = (
+                f"The text is {level} to read for a non-technical marketer (Flesch reading ease {ease}, "
+                f"{metrics['avg_sentence_length']} words per sentence on average)."
+            )
+            if metrics["avg_sentence_length"] <= 20:
+                praise.append("Sentences are short on average.")
+        if not long_paragraphs and scan.paragraphs:
+            praise.append("Paragraphs are kept to a readable length.")
+        if scan.ordered_items or scan.unordered_items:
+            praise.append("Lists break up the text.")
+
+        return {
+            "assessment": assessment,
+            "suggestions": suggestions,
+            "positive_feedback": " ".join(praise),
+            "persona_pain_points": f"Unexplained technical terms: {', '.join(jargon)}." if jargon else "",
+        }
+
+class StructureFlowRules(_RuleBasedAnalyzer):
+    """Rule-based structure checks: headings, section length, heading levels, step lists."""
+
+    def _check(self, scan: _DocumentScan) -> dict:
+        suggestions = []
+        issues = []
+
+        if not scan.headings and scan.words > config.FAST_MODE_MIN_WORDS_FOR_HEADINGS:
+            suggestions.append(_finding(
+                f"Add headings to divide this {scan.words}-word article into scannable sections.",
+                "High", "Low", "Structure"
+            ))
+            issues.append("no headings")
+
+        skips = [
+            (previous[1], current[1]) for previous, current in zip(scan.headings, scan.headings[1:])
+            if current[0] > previous[0] + 1
+        ]
+        for previous, current in skips[:config.FAST_MODE_MAX_CITED_ITEMS]:
+            suggestions.append(_finding(
+                f"Heading \"{current}\" skips a level after \"{previous}\"; use consecutive heading levels.",
+                "Low", "Low", "Structure"
+            ))
+        if skips:
+            issues.append(_plural(len(skips), "skipped heading level"))
+
+        long_sections = [(h, w) for h, w in scan.section_words if w > config.FAST_MODE_MAX_SECTION_WORDS]
+        for heading, words in long_sections[:config.FAST_MODE_MAX_CITED_ITEMS]:
+            name = f"\"{heading}\"" if heading else "before the first heading"
+            suggestions.append(_finding(
+                f"The section {name} is {words} words long; split it with subheadings.",
+                "Medium", "Medium", "Structure"
+            ))
+        if long_sections:
+            issues.append(f"{_plural(len(long_sections), 'section')} over {config.FAST_MODE_MAX_SECTION_WORDS} words")
+
+        long_paragraphs = sum(1 for p in scan.paragraphs if _words(p) > config.FAST_MODE_MAX_PARAGRAPH_WORDS)
+        if long_paragraphs:
+            issues.append(f"{_plural(long_paragraphs, 'paragraph')} over {config.FAST_MODE_MAX_PARAGRAPH_WORDS} words")
+
+        step_paragraphs = [p for p in scan.paragraphs if len(UI_ACTION_PATTERN.findall(p)) + len(SEQUENCE_PATTERN.findall(p)) >= 3]
+        if step_paragraphs and not scan.ordered_items:
+            suggestions.append(_finding(
+                f"Present the procedure in \"{_quote(step_paragraphs[0])}\" as a numbered list of steps.",
+                "High", "Low", "Structure"
+            ))
+            issues.append("procedure written as prose")
+
+        # The article opens with a heading directly followed by another heading.
+        if len(scan.headings) >= 2 and scan.section_words[0][1] == 0:
+            suggestions.append(_finding(
+                "Add a short introduction before the first section explaining what the article covers.",
+                "Low", "Low", "Structure"
+            ))
+
+        praise = []
+        if len(scan.headings) >= 2 and not skips:
+            praise.append(f"The article is organized under {len(scan.headings)} headings.")
+        if scan.ordered_items:
+            praise.append("Procedures use numbered steps.")
+
+        assessment = (
+            "The structure is clear." if not issues else
+            f"The structure could be easier to follow: {'; '.join(issues)}."
+        )
+        return {
+            "assessment": assessment,
+            "suggestions": suggestions,
+            "positive_feedback": " ".join(praise),
+            "quantified_issues": "; ".join(issues).capitalize() + "." if issues else "",
+        }
+
+class CompletenessExamplesRules(_RuleBasedAnalyzer):
+    """Rule-based completeness checks: code examples, screenshots, lists, links, placeholders."""
+
+    def _check(self, scan: _DocumentScan) -> dict:
+        suggestions = []
+        gaps = []
+
+        technical_mentions = len(TECHNICAL_PATTERN.findall(scan.text))
+        if technical_mentions >= 2 and not scan.code_blocks:
+            suggestions.append(_finding(
+                "Add a code example (e.g. a sample request or payload) for the technical steps described.",
+                "High", "Medium", "Examples"
+            ))
+            gaps.append("no code examples")
+
+        ui_actions = len(UI_ACTION_PATTERN.findall(scan.text))
+        if ui_actions >= 3 and not scan.images:
+            suggestions.append(_finding(
+                "Add screenshots of the dashboard screens the steps refer to.",
+                "Medium", "Medium", "Examples"
+            ))
+            gaps.append("no screenshots")
+
+        if not scan.ordered_items and not scan.unordered_items and scan.words > config.FAST_MODE_MIN_WORDS_FOR_HEADINGS:
+            suggestions.append(_finding(
+                "Use bulleted or numbered lists for options, requirements and steps.",
+                "Medium", "Low", "Completeness"
+            ))
+            gaps.append("no lists")
+
+        if not scan.links and scan.words > config.FAST_MODE_MIN_WORDS_FOR_HEADINGS:
+            suggestions.append(_finding(
+                "Link to related articles or reference pages for next steps.",
+                "Low", "Low", "Completeness"
+            ))
+            gaps.append("no links")
+
+        placeholders = sorted(set(match.upper() for match in PLACEHOLDER_PATTERN.findall(scan.text)))
+        if placeholders:
+            suggestions.append(_finding(
+                f"Replace the placeholder text ({', '.join(placeholders)}) with the missing content.",
+                "High", "Medium", "Completeness"
+            ))
+            gaps.append("placeholder text")
+
+        praise = []
+        if scan.code_blocks:
+            praise.append(f"Includes {_plural(scan.code_blocks, 'code example')}.")
+        if scan.images:
+            praise.append("Includes screenshots or images.")
+        if scan.links:
+            praise.append("Links to related content.")
+
+        assessment = (
+            "The article includes the supporting examples and references expected for its content." if not gaps else
+            f"The article is missing supporting material: {', '.join(gaps)}."
+        )
+        return {
+            "assessment": assessment,
+            "suggestions": suggestions,
+            "positive_feedback": " ".join(praise),
+        }
+
+class StyleAdherenceRules(_RuleBasedAnalyzer):
+    """Rule-based style checks: imperative steps, minimizing words, wordy phrases, exclamation marks."""
+
+    def _check(self, scan: _DocumentScan) -> dict:
+        suggestions = []
+        snippets = []
+        issues = []
+
+        non_imperative = [item for item in scan.ordered_items if NON_IMPERATIVE_STEP_PATTERN.match(item)]
+        for item in non_imperative[:config.FAST_MODE_MAX_CITED_ITEMS]:
+            suggestions.append(_finding(
+                f"Start the step \"{_quote(item)}\" with an imperative verb (e.g. \"Click...\", \"Select...\").",
+                "Medium", "Low", "Style"
+            ))
+            snippets.append(f"\"{_quote(item, 6)}\" is not written as an instruction.")
+        if non_imperative:
+            issues.append(f"{_plural(len(non_imperative), 'step')} not written as instructions")
+
+        minimizing = sorted(set(match.lower() for match in MINIMIZING_WORDS_PATTERN.findall(scan.prose)))
+        if minimizing:
+            suggestions.append(_finding(
+                f"Remove words that assume the task is easy: {', '.join(minimizing)}.",
+                "Low", "Low", "Style"
+            ))
+            issues.append("minimizing words")
+
+        lowered = scan.prose.lower()
+        wordy = [(phrase, replacement) for phrase, replacement in WORDY_PHRASES.items() if phrase in lowered]
+        if wordy:
+            suggestions.append(_finding(
+                "Use concise wording: " + ", ".join(f"\"{p}\" -> \"{r}\"" for p, r in wordy) + ".",
+                "Low", "Low", "Style"
+            ))
+            snippets.extend(f"\"{p}\" can be shortened to \"{r}\"." for p, r in wordy)
+            issues.append("wordy phrases")
+
+        exclamations = sum(p.count("!") for p in scan.paragraphs)
+        if exclamations:
+            suggestions.append(_finding(
+                f"Remove exclamation marks ({exclamations} found) to keep a neutral tone.",
+                "Low", "Low", "Style"
+            ))
+            issues.append("exclamation marks")
+
+        praise = []
+        if scan.ordered_items and not non_imperative:
+            praise.append("Steps are written as direct instructions.")
+        if not minimizing and not wordy:
+            praise.append("Wording is direct and concise.")
+
+        assessment = (
+            "The text follows the style guidelines." if not issues else
+            f"The text departs from the style guidelines: {', '.join(issues)}."
+        )
+        return {
+            "assessment": assessment,
+            "suggestions": suggestions,
+            "positive_feedback": " ".join(praise),
+            "snippet_specific_feedback": " ".join(snippets),
+        }
+
+def rule_based_analyzers() -> dict:
+    """Returns the fast-mode analyzers, keyed like the LLM-backed analyzers."""
+    return {
+        "readability": ReadabilityRules(),
+        "structure_flow": StructureFlowRules(),
+        "completeness_examples": CompletenessExamplesRules(),
+        "style_adherence": StyleAdherenceRules(),
+    }
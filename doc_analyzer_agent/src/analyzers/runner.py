@@ -0,0 +1,153 @@
+# src/analyzers/runner.py
+import asyncio
+import contextvars
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, wait
+from core.tracing import span
+from core.cassette import CassetteMissError
+
+# Stand-in content used to render an analyzer's prompt template for analyzer_prompt_version().
+PROMPT_PROBE = "The quick brown fox jumps over the lazy dog. It was not seen again."
+
+def failed_analysis_result(analyzer_name: str) -> dict:
+    """Builds the placeholder result used when an analyzer could not run.
+
+    Args:
+        analyzer_name: The analyzer key (e.g., 'structure_flow').
+
+    Returns:
+        A dictionary in the standard analyzer result schema with no suggestions,
+        marked with "failed": True.
+    """
+    readable_name = analyzer_name.replace("_", " ").title()
+    return {
+        "assessment": f"{readable_name} analysis could not be performed.",
+        "suggestions": [],
+        "positive_feedback": "",
+        "failed": True
+    }
+
+def is_failed_result(result: dict | None) -> bool:
+    """Checks whether an analyzer result is a placeholder for a failed analysis."""
+    if not result or not isinstance(result, dict):
+        return True
+    return bool(result.get("failed"))
+
+def is_complete_result(result: dict | None) -> bool:
+    """Checks that an analyzer result succeeded for every part of the document.
+
+    A result merged from several sections or chunks carries "failed_parts" when
+    some of them could not be analyzed.
+    """
+    return not is_failed_result(result) and not result.get("failed_parts")
+
+def analyzer_prompt_version(analyzer) -> str:
+    """Returns a short hash of the prompt an analyzer sends.
+
+    Part of the keys of stored section results and analysis checkpoints, so they
+    are not reused after a prompt template changes (or an option such as
+    READABILITY_METRICS_IN_PROMPT changes what is sent). Analyzers without a
+    prompt (the fast-mode rules) are identified by their class.
+    """
+    build_prompt = getattr(analyzer, "_build_prompt", None)
+    prompt = build_prompt(PROMPT_PROBE) if build_prompt else type(analyzer).__qualname__
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+def run_analyzers(analyzers: dict, text_content: str, max_workers: int = 4, timeout: float | None = None) -> dict:
+    """Runs several analyzers over the same content concurrently.
+
+    Each analyzer call is network-bound, so running them on a thread pool makes the
+    stage take roughly as long as the slowest call instead of the sum of all calls.
+    A failing or timed-out analyzer is replaced by a placeholder result and does not
+    affect the others.
+
+    Args:
+        analyzers: Mapping of analyzer name to an object exposing analyze(text_content).
+                   The order of this mapping determines the order of the results.
+        text_content: The parsed content to analyze.
+        max_workers: Maximum number of analyzer calls in flight at once.
+        timeout: Optional number of seconds to wait for the whole stage. Analyzers
+                 still running after this are reported as failed.
+
+    Returns:
+        A dictionary mapping each analyzer name to its result, in the same key order
+        as `analyzers`.
+    """
+    if not analyzers:
+        return {}
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(analyzers))))
+    try:
+        # Each analyzer runs in a copy of this context so its LLM calls are counted in the caller's usage metrics.
+        futures = {
+            name: executor.submit(contextvars.copy_context().run, _traced_analyze, name, analyzer, text_content)
+            for name, analyzer in analyzers.items()
+        }
+        wait(futures.values(), timeout=timeout)
+
+        results = {}
+        for name, future in futures.items():
+            readable_name = name.replace("_", " ").title()
+            if not future.done():
+                print(f"Warning: {readable_name} analysis timed out after {timeout} seconds.")
+                results[name] = failed_analysis_result(name)
+                continue
+            try:
+                results[name] = future.result()
+                print(f"{readable_name} analysis complete.")
+            except CassetteMissError:
+                raise # A strict replay must fail the run, not degrade to a placeholder
+            except Exception as e:
+                print(f"Error during {readable_name} analysis: {e}")
+                results[name] = failed_analysis_result(name)
+        return results
+    finally:
+        # Don't block on analyzers that timed out; their results are discarded.
+        executor.shutdown(wait=False, cancel_futures=True)
+
+async def arun_analyzers(analyzers: dict, text_content: str, timeout: float | None = None) -> dict:
+    """Async counterpart of run_analyzers() using each analyzer's aanalyze().
+
+    Concurrency is bounded by the LLMService semaphore rather than a thread pool, so
+    many documents can be analyzed on the same event loop.
+
+    Args:
+        analyzers: Mapping of analyzer name to an object exposing aanalyze(text_content).
+        text_content: The parsed content to analyze.
+        timeout: Optional number of seconds to wait for the whole stage.
+
+    Returns:
+        A dictionary mapping each analyzer name to its result, in the same key order
+        as `analyzers`.
+    """
+    if not analyzers:
+        return {}
+
+    tasks = {name: asyncio.ensure_future(_traced_aanalyze(name, analyzer, text_content)) for name, analyzer in analyzers.items()}
+    await asyncio.wait(tasks.values(), timeout=timeout)
+
+    results = {}
+    for name, task in tasks.items():
+        readable_name = name.replace("_", " ").title()
+        if not task.done():
+            task.cancel()
+            print(f"Warning: {readable_name} analysis timed out after {timeout} seconds.")
+            results[name] = failed_analysis_result(name)
+            continue
+        try:
+            results[name] = task.result()
+            print(f"{readable_name} analysis complete.")
+        except CassetteMissError:
+            raise
+        except Exception as e:
+            print(f"Error during {readable_name} analysis: {e}")
+            results[name] = failed_analysis_result(name)
+    return results
+
+def _traced_analyze(name: str, analyzer, text_content: str) -> dict:
+    with span(f"analyze:{name}", category="analyzer"):
+        return analyzer.analyze(text_content)
+
+async def _traced_aanalyze(name: str, analyzer, text_content: str) -> dict:
+    with span(f"analyze:{name}", category="analyzer"):
+        return await analyzer.aanalyze(text_content)
@@ -30,7 +30,19 @@ class StructureFlowAnalyzer:
                 "quantified_issues": "3 paragraphs exceed recommended length."
             }
         """
-        prompt = f"""Analyze the structure and logical flow of the following documentation content. Consider:
+        prompt = self._build_prompt(text_content)
+        analysis_result = self.llm_service.query_llm(prompt, stage="structure_flow")
+        return self._process_result(analysis_result)
+
+    async def aanalyze(self, text_content: str) -> dict:
+        """Async counterpart of analyze(), returning the same result structure."""
+        prompt = self._build_prompt(text_content)
+        analysis_result = await self.llm_service.aquery_llm(prompt, stage="structure_flow")
+        return self._process_result(analysis_result)
+
+    def _build_prompt(self, text_content: str) -> str:
+        """Builds the structure and flow analysis prompt for the given content."""
+        return f"""Analyze the structure and logical flow of the following documentation content. Consider:
 - Use of headings and subheadings for organization.
 - Paragraph length and focus.
 - Use of lists or bullet points for clarity.
@@ -50,8 +62,8 @@ Content to analyze:
 ---
 """
 
-        analysis_result = self.llm_service.query_llm(prompt)
-
+    def _process_result(self, analysis_result: dict | str | None) -> dict:
+        """Validates the raw LLM result and fills in defaults for missing keys."""
         # Basic validation and parsing
         if analysis_result and isinstance(analysis_result, dict):
             return {
@@ -66,6 +78,7 @@ Content to analyze:
                 "assessment": "Structure/Flow analysis could not be performed.",
                 "suggestions": [],
                 "positive_feedback": "",
-                "quantified_issues": ""
+                "quantified_issues": "",
+                "failed": True
             }
 
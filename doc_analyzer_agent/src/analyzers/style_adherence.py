@@ -35,7 +35,19 @@ class StyleAdherenceAnalyzer:
                 "snippet_specific_feedback": "The instruction in step 3 is very clear."
             }
         """
-        prompt = f"""Analyze the following documentation content for adherence to these simplified style guidelines:
+        prompt = self._build_prompt(text_content)
+        analysis_result = self.llm_service.query_llm(prompt, stage="style_adherence")
+        return self._process_result(analysis_result)
+
+    async def aanalyze(self, text_content: str) -> dict:
+        """Async counterpart of analyze(), returning the same result structure."""
+        prompt = self._build_prompt(text_content)
+        analysis_result = await self.llm_service.aquery_llm(prompt, stage="style_adherence")
+        return self._process_result(analysis_result)
+
+    def _build_prompt(self, text_content: str) -> str:
+        """Builds the style adherence analysis prompt for the given content."""
+        return f"""Analyze the following documentation content for adherence to these simplified style guidelines:
 1.  **Voice and Tone:** Is it customer-focused, clear, and concise?
 2.  **Clarity and Conciseness:** Are there overly complex sentences or jargon that could be simplified?
 3.  **Action-oriented language:** Does it guide the user effectively, telling them what to do?
@@ -54,8 +66,8 @@ Content to analyze:
 ---
 """
 
-        analysis_result = self.llm_service.query_llm(prompt)
-
+    def _process_result(self, analysis_result: dict | str | None) -> dict:
+        """Validates the raw LLM result and fills in defaults for missing keys."""
         # Basic validation and parsing
         if analysis_result and isinstance(analysis_result, dict):
             return {
@@ -70,6 +82,7 @@ Content to analyze:
                 "assessment": "Style Adherence analysis could not be performed.",
                 "suggestions": [],
                 "positive_feedback": "",
-                "snippet_specific_feedback": ""
+                "snippet_specific_feedback": "",
+                "failed": True
             }
 
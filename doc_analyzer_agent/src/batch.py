@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""Batch command: runs the documentation analysis pipeline over many URLs."""
+
+import sys
+import os
+import argparse
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+# Add src directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.fetcher import BrowserPool, Fetcher
+from core.llm_service import LLMService
+from core.cassette import Cassette
+from core.metrics import MetricsRecorder
+from core.tracing import Tracer, span
+from main import run_analysis, arun_analysis, add_analysis_arguments, analysis_options, cassette_from_args
+import config
+
+def read_urls(source: str) -> list[str]:
+    """Reads URLs, one per line, from a file or from stdin.
+
+    Blank lines and lines starting with '#' are ignored, and duplicate URLs are
+    only kept once.
+
+    Args:
+        source: Path of the file to read, or '-' to read from stdin.
+
+    Returns:
+        The list of URLs in their original order.
+    """
+    if source == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+
+    urls = []
+    seen = set()
+    for line in lines:
+        url = line.strip()
+        if not url or url.startswith("#"):
+            continue
+        if url in seen:
+            print(f"Warning: Skipping duplicate URL: {url}")
+            continue
+        seen.add(url)
+        urls.append(url)
+    return urls
+
+def report_filename(url: str) -> str:
+    """Builds a stable, filesystem-safe report file name for a URL."""
+    last_segment = url.rstrip("/").rsplit("/", 1)[-1] or "index"
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", last_segment).strip("-").lower()[:60] or "article"
+    url_hash = hashlib.sha1(url.encode("utf-8")).hexdigest()[:8]
+    return f"{slug}-{url_hash}.md"
+
+def run_batch(
+    urls: list[str],
+    output_dir: str,
+    workers: int = config.BATCH_MAX_WORKERS,
+    cache_mode: str = "use",
+    html_cache_mode: str = "use",
+    trace: bool = False,
+    use_async: bool = False,
+    llm_service: LLMService | None = None,
+    cassette: Cassette | None = None,
+    **analysis_kwargs
+) -> list[dict]:
+    """Analyzes many URLs with a pool of workers, writing one report per URL.
+
+    All workers share a single LLMService (and therefore one client and one response
+    cache) and a single fetcher: pages are fetched over keep-alive HTTP where
+    possible, with one headless browser page per worker as the fallback. A failure for one URL is recorded and does not stop the others.
+
+    Args:
+        urls: The URLs to analyze.
+        output_dir: Directory for the per-URL reports, the run index and the LLM
+                    usage metrics (metrics.json: batch totals plus one entry per URL).
+        workers: Number of documents processed concurrently (worker threads, or
+                 documents in flight on the event loop with `use_async`).
+        cache_mode: LLM response cache mode ("use", "refresh" or "bypass").
+        html_cache_mode: HTML cache mode ("use", "cache-only" or "bypass").
+        trace: Time every document and pipeline stage, writing a Chrome trace
+               (trace.json) and a slowest-stages summary (trace_summary.txt).
+        use_async: Analyze the documents as tasks on one event loop with
+                   arun_analysis() instead of one thread each, so `workers` can be
+                   in the hundreds. In-flight LLM calls are still capped by
+                   config.LLM_MAX_CONCURRENCY.
+        llm_service: An existing LLMService to share between the workers. One is
+                     created with `cache_mode` if omitted (except in fast mode).
+        cassette: A Cassette the created LLMService records to or replays from. A
+                  document with a prompt missing from a replayed cassette fails.
+        **analysis_kwargs: Extra keyword arguments passed to run_analysis().
+
+    Returns:
+        A list with one result dictionary per URL (in input order), containing the
+        'url', 'status' ('ok' or 'failed'), 'report' file name, 'duration_seconds'
+        and 'error' (if any).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # Fast mode runs local rules only and never needs the LLM.
+    if analysis_kwargs.get("analyzer_mode") == "fast":
+        llm_service = None
+    elif llm_service is None:
+        llm_service = LLMService(cache_mode=cache_mode, cassette=cassette)
+    # On the event loop, `workers` can far exceed the number of browser pages worth keeping open.
+    browser_pages = min(workers, config.BROWSER_POOL_SIZE) if use_async else workers
+    fetcher = Fetcher(browser_pool=BrowserPool(pool_size=browser_pages), cache_mode=html_cache_mode)
+
+    total = len(urls)
+    completed = 0
+    document_usage = {}
+
+    def document_options(url: str) -> dict:
+        return dict(
+            llm_service=llm_service,
+            fetcher=fetcher,
+            output_path=os.path.join(output_dir, report_filename(url)),
+            print_report=False,
+            **analysis_kwargs
+        )
+
+    def document_result(url: str, start: float, report: str | None = None, error: Exception | None = None) -> dict:
+        result = {"url": url, "status": "failed", "report": None, "duration_seconds": 0.0, "error": None}
+        if error is not None:
+            result["error"] = f"{type(error).__name__}: {error}"
+        elif report is None:
+            result["error"] = "Pipeline did not complete (see log for details)."
+        else:
+            result["status"] = "ok"
+            result["report"] = report_filename(url)
+        result["duration_seconds"] = round(time.perf_counter() - start, 2)
+        return result
+
+    def analyze_one(url: str) -> dict:
+        start = time.perf_counter()
+        try:
+            with span("document", category="document", url=url), MetricsRecorder().collect() as document_metrics:
+                report = run_analysis(url, **document_options(url))
+            document_usage[url] = document_metrics.summary()
+        except Exception as e:
+            return document_result(url, start, error=e)
+        return document_result(url, start, report)
+
+    async def aanalyze_one(url: str, slots: asyncio.Semaphore) -> dict:
+        async with slots:
+            start = time.perf_counter()
+            try:
+                with span("document", category="document", url=url), MetricsRecorder().collect() as document_metrics:
+                    report = await arun_analysis(url, **document_options(url))
+                document_usage[url] = document_metrics.summary()
+            except Exception as e:
+                return document_result(url, start, error=e)
+            return document_result(url, start, report)
+
+    def record(result: dict):
+        nonlocal completed
+        results_by_url[result["url"]] = result
+        completed += 1
+        status = "done" if result["status"] == "ok" else f"FAILED ({result['error']})"
+        print(f"[{completed}/{total}] {status}: {result['url']} ({result['duration_seconds']}s)")
+
+    async def analyze_all_async():
+        slots = asyncio.Semaphore(max(1, workers))
+        # Each task runs in a copy of this context, so it records into the tracer.
+        for task in asyncio.as_completed([aanalyze_one(url, slots) for url in urls]):
+            record(await task)
+
+    mode = "documents in flight on one event loop" if use_async else "workers"
+    print(f"Starting batch analysis of {total} URLs with {workers} {mode}.")
+    batch_start = time.perf_counter()
+    results_by_url = {}
+    tracer = Tracer() if trace else None
+    try:
+        with tracer.activate() if tracer else contextlib.nullcontext():
+            if use_async:
+                asyncio.run(analyze_all_async())
+            else:
+                with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+                    # Workers run in copies of this context so they record into the tracer.
+                    futures = [executor.submit(contextvars.copy_context().run, analyze_one, url) for url in urls]
+                    for future in as_completed(futures):
+                        record(future.result())
+    finally:
+        fetcher.close()
+    elapsed = time.perf_counter() - batch_start
+
+    results = [results_by_url[url] for url in urls]
+    write_index(output_dir, results, elapsed)
+    if llm_service:
+        llm_service.metrics.write_json(
+            os.path.join(output_dir, "metrics.json"),
+            documents={url: document_usage[url] for url in urls if url in document_usage}
+        )
+
+    succeeded = sum(1 for r in results if r["status"] == "ok")
+    docs_per_minute = (total / elapsed * 60) if elapsed > 0 else 0.0
+    print("\n--- Batch Summary ---")
+    print(f"Analyzed {total} URLs in {elapsed:.1f}s: {succeeded} succeeded, {total - succeeded} failed.")
+    print(f"Throughput: {docs_per_minute:.1f} docs/min")
+    cache_stats = llm_service.cache_stats() if llm_service else None
+    if cache_stats:
+        print(f"LLM response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses.")
+    if llm_service:
+        usage = llm_service.metrics.summary()
+        print(f"LLM usage: {usage['calls']} calls, {usage['prompt_tokens']} prompt tokens, "
+              f"{usage['response_tokens']} response tokens, estimated cost ${usage['estimated_cost_usd']:.4f}.")
+    if tracer:
+        trace_summary = tracer.summary(config.TRACE_TOP_N)
+        tracer.export_chrome(os.path.join(output_dir, "trace.json"))
+        with open(os.path.join(output_dir, "trace_summary.txt"), "w", encoding="utf-8") as f:
+            f.write(trace_summary + "\n")
+        print(f"\n--- Trace Summary ---\n{trace_summary}")
+    print(f"Reports and index saved to: {os.path.abspath(output_dir)}")
+    return results
+
+def write_index(output_dir: str, results: list[dict], elapsed_seconds: float):
+    """Writes the run-level summary index as Markdown (index.md) and JSON (index.json)."""
+    total = len(results)
+    succeeded = sum(1 for r in results if r["status"] == "ok")
+    docs_per_minute = (total / elapsed_seconds * 60) if elapsed_seconds > 0 else 0.0
+    generated = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+    lines = []
+    lines.append("# Batch Analysis Index")
+    lines.append(f"**Generated:** {generated}")
+    lines.append(f"**URLs:** {total} ({succeeded} succeeded, {total - succeeded} failed)")
+    lines.append(f"**Elapsed:** {elapsed_seconds:.1f}s ({docs_per_minute:.1f} docs/min)")
+    lines.append("")
+    lines.append("| # | URL | Status | Report | Duration (s) |")
+    lines.append("|---|-----|--------|--------|--------------|")
+    for i, r in enumerate(results):
+        report_link = f"[{r['report']}]({r['report']})" if r["report"] else "-"
+        status = r["status"] if r["status"] == "ok" else f"failed: {r['error']}"
+        status = status.replace("|", "\\|")
+        lines.append(f"| {i+1} | {r['url']} | {status} | {report_link} | {r['duration_seconds']} |")
+
+    with open(os.path.join(output_dir, "index.md"), "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    with open(os.path.join(output_dir, "index.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "generated": generated,
+            "total": total,
+            "succeeded": succeeded,
+            "failed": total - succeeded,
+            "elapsed_seconds": round(elapsed_seconds, 2),
+            "docs_per_minute": round(docs_per_minute, 2),
+            "results": results
+        }, f, indent=2)
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parses the command-line arguments."""
+    arg_parser = argparse.ArgumentParser(description="Analyze many documentation articles and write one report per URL.")
+    arg_parser.add_argument("urls_file", help="File with one URL per line, or '-' to read URLs from stdin.")
+    arg_parser.add_argument("--output-dir", default="reports", help="Directory for the reports and the run index.")
+    arg_parser.add_argument("--workers", type=int, default=config.BATCH_MAX_WORKERS,
+                            help="Number of documents to analyze concurrently.")
+    arg_parser.add_argument("--async", dest="use_async", action="store_true",
+                            help="Analyze documents concurrently on one event loop instead of one thread each "
+                                 "(--workers then sets the documents in flight, e.g. 100).")
+    arg_parser.add_argument("--trace", action="store_true",
+                            help="Time each document and stage; writes trace.json (Chrome trace, viewable in Perfetto) and trace_summary.txt.")
+    add_analysis_arguments(arg_parser)
+    return arg_parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    urls = read_urls(args.urls_file)
+    if not urls:
+        print("No URLs to analyze.")
+        sys.exit(1)
+    try:
+        cassette = cassette_from_args(args)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    try:
+        batch_results = run_batch(
+            urls,
+            args.output_dir,
+            workers=args.workers,
+            cache_mode=args.cache_mode,
+            html_cache_mode=args.html_cache_mode,
+            trace=args.trace,
+            use_async=args.use_async,
+            cassette=cassette,
+            **analysis_options(args)
+        )
+    except ValueError as e:
+        print(f"Error initializing LLM Service: {e}")
+        sys.exit(1)
+    if not any(r["status"] == "ok" for r in batch_results):
+        sys.exit(1)
@@ -1,14 +1,125 @@
 # src/config.py
 import os
-from dotenv import load_dotenv
 
-# Load environment variables from .env file located in the parent directory
-# Assumes .env is in the project root (one level up from src)
+# Environment variables are loaded from the .env file in the project root (one level up from src).
+# GEMINI_API_KEY is read on first access (see __getattr__ below), so importing config stays cheap.
 dotenv_path = os.path.join(os.path.dirname(__file__), '..', '.env') 
-load_dotenv(dotenv_path=dotenv_path)
 
-# Load the Gemini API Key from environment variable (now loaded from .env)
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+def __getattr__(name: str):
+    """Loads the Gemini API key from the environment (and .env) the first time it is used."""
+    if name == "GEMINI_API_KEY":
+        from dotenv import load_dotenv
+        load_dotenv(dotenv_path=dotenv_path)
+        globals()["GEMINI_API_KEY"] = os.getenv("GEMINI_API_KEY")
+        return globals()["GEMINI_API_KEY"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # You can add other configurations here, like model name, temperature, etc.
 GEMINI_MODEL_NAME = "gemini-2.0-flash" # Or another suitable model
+
+# Maximum number of analyzer LLM calls in flight at once during the analysis stage
+ANALYZER_MAX_WORKERS = 4
+# Optional overall timeout (seconds) for the analysis stage; None waits for all analyzers
+ANALYZER_TIMEOUT_SECONDS = None
+# Maximum number of concurrent requests issued through LLMService.aquery_llm
+LLM_MAX_CONCURRENCY = 8
+# Quota shared by all calls through one LLMService (set to your API tier; 0 disables a limit)
+LLM_REQUESTS_PER_MINUTE = 2000
+LLM_TOKENS_PER_MINUTE = 4000000
+LLM_MAX_ATTEMPTS = 3 # Attempts per LLM call for rate-limit and transient errors; rejected requests are not retried
+LLM_BACKOFF_BASE_SECONDS = 2 # Exponential backoff with jitter: up to base * 2**attempt seconds
+LLM_BACKOFF_MAX_SECONDS = 60
+LLM_CIRCUIT_FAILURE_THRESHOLD = 5 # Consecutive transient failures before calls fail fast (0 disables)
+LLM_CIRCUIT_RESET_SECONDS = 30 # How long calls fail fast before a trial call is let through
+# Generation settings passed to the Gemini model (also part of the response cache key)
+GEMINI_GENERATION_CONFIG = {}
+
+# On-disk cache of LLM responses, keyed by model, generation config and prompt
+LLM_CACHE_ENABLED = True
+LLM_CACHE_PATH = os.path.join(os.path.dirname(__file__), '..', '.cache', 'llm_responses.sqlite3')
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 60 * 60 # Entries older than a week are refetched
+LLM_CACHE_MAX_ENTRIES = 10000 # Least recently used entries are evicted beyond this
+# Prices used to estimate the cost of LLM calls in the usage metrics (USD per million tokens, gemini-2.0-flash)
+LLM_PRICE_PER_MILLION_PROMPT_TOKENS = 0.10
+LLM_PRICE_PER_MILLION_RESPONSE_TOKENS = 0.40
+# "separate" runs each analyzer as its own LLM call; "combined" analyzes the document in one call;
+# "fast" uses local rules only (no LLM calls)
+ANALYZER_MODE = "separate"
+# Number of documents analyzed concurrently by the batch command
+BATCH_MAX_WORKERS = 4
+
+# Headless browser fetching (see core/fetcher.BrowserPool)
+BROWSER_POOL_SIZE = 4 # Pages that can load concurrently in one browser
+BROWSER_PAGE_MAX_USES = 50 # Fetches after which a page/context is replaced
+FETCH_TIMEOUT_MS = 60000 # Navigation timeout per fetch
+
+# Plain HTTP fetching, tried before falling back to the headless browser
+FETCH_USE_HTTP = True
+HTTP_TIMEOUT_SECONDS = 15
+HTTP_POOL_SIZE = 8 # Keep-alive connections kept per host
+HTTP_USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+
+# On-disk cache of fetched HTML, revalidated with conditional GETs
+HTML_CACHE_ENABLED = True
+HTML_CACHE_DIR = os.path.join(os.path.dirname(__file__), '..', '.cache', 'html')
+HTML_CACHE_MAX_AGE_SECONDS = 60 * 60 # Pages younger than this are not revalidated
+
+# Per-section analyzer results used by incremental (--incremental) runs
+SECTION_STORE_DIR = os.path.join(os.path.dirname(__file__), '..', '.cache', 'sections')
+
+# Per-document checkpoints of each stage's output after fetching, reused by --resume and --rerun-from
+CHECKPOINT_ENABLED = False # Save checkpoints on every run, not only with --checkpoint, --resume or --rerun-from
+CHECKPOINT_DIR = os.path.join(os.path.dirname(__file__), '..', '.cache', 'checkpoints')
+
+# Token-aware chunking of long documents (see core/chunker.py)
+CHARS_PER_TOKEN = 4 # Rough average for English prose; used to estimate tokens without an API call
+CHUNK_MAX_TOKENS = 6000 # Documents estimated above this are analyzed in chunks (0 disables chunking)
+
+# BeautifulSoup tree builder used by core/parser.HTMLParser ("auto", "lxml" or "html.parser").
+# "auto" uses lxml when it is installed.
+HTML_PARSER_BACKEND = "auto"
+
+# Local readability metrics (see analyzers/readability_metrics.py)
+READABILITY_LONG_SENTENCE_WORDS = 25 # Sentences with more words than this count as long
+READABILITY_METRICS_IN_PROMPT = False # Include the computed metrics in the readability prompt
+
+# Fast mode (--analyzer-mode fast): local rule-based analysis without LLM calls (see analyzers/rule_based.py)
+FAST_MODE_MAX_PARAGRAPH_WORDS = 120
+FAST_MODE_MAX_SECTION_WORDS = 400 # Sections longer than this should be split with subheadings
+FAST_MODE_MIN_WORDS_FOR_HEADINGS = 250 # Articles longer than this need headings, lists and links
+FAST_MODE_MAX_PASSIVE_RATIO = 0.2
+FAST_MODE_MAX_CITED_ITEMS = 3 # Maximum sentences/paragraphs/steps cited per rule
+FAST_MODE_JARGON_TERMS = [
+    "API", "SDK", "endpoint", "payload", "webhook", "JSON", "callback", "token", "schema",
+    "parameter", "query string", "latency", "idempotent", "cron", "regex", "SQL", "CLI"
+]
+
+# Near-duplicate suggestion merging before prioritization (see processing/deduplicator.py)
+DEDUP_ENABLED = True
+DEDUP_SIMILARITY_THRESHOLD = 0.6 # Jaccard similarity of word shingles above which suggestions are merged
+DEDUP_MINHASH_BANDS = 21 # LSH bands x rows = MinHash permutations; 21 x 3 finds ~99% of pairs at 0.6 similarity
+DEDUP_MINHASH_ROWS = 3
+DEDUP_MINHASH_SEED = 42
+
+# Number of stages and spans listed in the trace summary (--trace)
+TRACE_TOP_N = 10
+
+# Suggestion prioritization
+PRIORITIZER_CHUNK_SIZE = 40 # Suggestions scored per LLM call; longer lists are split and scored in parallel
+PRIORITIZER_MAX_RETRIES = 1 # Times suggestions missing from the LLM's response are sent again
+
+# Suggestion grouping: "llm" asks the LLM to group suggestions, "local" clusters them locally
+# (TF-IDF, see processing/local_grouper.py), "local-named" clusters locally and asks the LLM only for theme names,
+# "fused" prioritizes and groups in a single LLM call (see processing/triage.py)
+GROUPER_MODE = "llm"
+GROUPER_MAX_THEMES = 8
+GROUPER_MIN_SIMILARITY = 0.2 # Clusters are not merged below this average cosine similarity (once at most GROUPER_MAX_THEMES)
+GROUPER_AGGLOMERATIVE_MAX_ITEMS = 400 # Above this many suggestions, k-means is used instead of agglomerative clustering
+
+# Analysis server (src/server.py)
+SERVER_HOST = "127.0.0.1" # Local only by default; the API has no authentication
+SERVER_PORT = 8080
+SERVER_WORKERS = 4 # Jobs analyzed concurrently
+SERVER_QUEUE_SIZE = 100 # Jobs waiting beyond this are rejected with 503 until the queue drains
+SERVER_MAX_FINISHED_JOBS = 1000 # Oldest finished jobs (and their reports) are forgotten beyond this
+SERVER_MAX_BODY_BYTES = 10 * 1024 * 1024 # Largest accepted job submission (including raw HTML)
@@ -0,0 +1,112 @@
+# src/core/cassette.py
+import hashlib
+import json
+import os
+import threading
+from types import SimpleNamespace
+
+CASSETTE_MODES = ("record", "replay")
+
+class CassetteMissError(Exception):
+    """Raised when replaying a prompt that is not in the cassette (i.e. the prompt changed)."""
+
+class Cassette:
+    """A file of recorded LLM prompt/response pairs for deterministic replays.
+
+    In record mode, LLMService appends every prompt it answers (including answers
+    served from the response cache) with the response text, token counts and
+    latency. In replay mode, LLMService answers from the cassette only, without
+    network access, and a prompt that was not recorded raises CassetteMissError,
+    so prompt changes show up instead of silently calling the API.
+
+    The file is JSON Lines, one entry per prompt, so it can be appended to across
+    runs and inspected or diffed with ordinary tools.
+    """
+
+    def __init__(self, path: str, mode: str, latency_scale: float = 0.0):
+        """Initializes the Cassette, loading any entries already in the file.
+
+        Args:
+            path: Path of the cassette file.
+            mode: "record" appends new prompt/response pairs (prompts already in the
+                  file are kept as recorded), "replay" serves responses from it.
+            latency_scale: In replay mode, wait this multiple of each call's recorded
+                           latency before answering (0 answers immediately, 1
+                           simulates the recorded latency).
+
+        Raises:
+            ValueError: If the mode is invalid or the cassette to replay does not exist.
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Invalid cassette mode '{mode}'. Expected one of: {', '.join(CASSETTE_MODES)}.")
+        if mode == "replay" and not os.path.exists(path):
+            raise ValueError(f"Cassette not found: {path}")
+        self.path = path
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.entries = {} # prompt key -> recorded entry
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries.setdefault(entry["key"], entry)
+        elif os.path.dirname(os.path.abspath(path)):
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    @staticmethod
+    def make_key(prompt: str) -> str:
+        """Builds the cassette key (a SHA-256 hash) for a prompt."""
+        return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+    def record(self, prompt: str, response_text: str, stage: str, prompt_tokens: int = 0,
+               response_tokens: int = 0, latency_seconds: float = 0.0):
+        """Appends a prompt/response pair to the cassette, unless the prompt is already recorded."""
+        key = self.make_key(prompt)
+        entry = {
+            "key": key,
+            "stage": stage,
+            "prompt": prompt,
+            "response": response_text,
+            "prompt_tokens": prompt_tokens,
+            "response_tokens": response_tokens,
+            "latency_seconds": round(latency_seconds, 4),
+        }
+        with self._lock:
+            if key in self.entries:
+                return
+            self.entries[key] = entry
+            # Written entry by entry so a crashed run keeps what it recorded.
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+
+    def play(self, prompt: str, stage: str) -> SimpleNamespace:
+        """Returns the recorded response for a prompt.
+
+        Returns:
+            A response object with the recorded `text`, `usage_metadata` (token
+            counts) and `latency_seconds`.
+
+        Raises:
+            CassetteMissError: If the prompt was not recorded.
+        """
+        key = self.make_key(prompt)
+        entry = self.entries.get(key)
+        if entry is None:
+            raise CassetteMissError(
+                f"No recorded response for the {stage} prompt {key[:12]} in {self.path}. "
+                "The prompt changed since the cassette was recorded; record it again."
+            )
+        return SimpleNamespace(
+            text=entry["response"],
+            latency_seconds=entry.get("latency_seconds", 0.0),
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=entry.get("prompt_tokens", 0),
+                candidates_token_count=entry.get("response_tokens", 0),
+            ),
+        )
+
+    def replay_delay(self, recorded: SimpleNamespace) -> float:
+        """Returns how long to wait before answering with a recorded response."""
+        return recorded.latency_seconds * self.latency_scale
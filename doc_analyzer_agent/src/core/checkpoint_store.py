@@ -0,0 +1,106 @@
+# src/core/checkpoint_store.py
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Pipeline stages in run order; --rerun-from STAGE re-runs STAGE and everything after it.
+STAGES = ("fetch", "parse", "analyze", "prioritize", "group", "summarize", "format")
+
+class CheckpointStore:
+    """An on-disk store of each document's pipeline stage outputs.
+
+    Every checkpoint is saved with a hash of the inputs that produced it (e.g. the
+    parsed Markdown and the analysis options for analyzer results), so a resumed
+    run can skip exactly the stages whose inputs have not changed. Each document
+    gets its own directory, keyed by a hash of its URL, with one JSON file per
+    checkpoint.
+    """
+
+    def __init__(self, directory: str):
+        """Initializes the CheckpointStore, creating the directory if needed.
+
+        Args:
+            directory: Directory to store the checkpoints in.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def hash_inputs(*inputs) -> str:
+        """Hashes a stage's inputs (any JSON-serializable values) into a checkpoint key."""
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, url: str, name: str, input_hash: str):
+        """Returns a checkpointed output, or None if it is missing or its inputs changed."""
+        try:
+            with open(self._path(url, name), "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read the {name} checkpoint for {url}: {e}")
+            return None
+        if checkpoint.get("input_hash") != input_hash:
+            return None
+        return checkpoint.get("output")
+
+    def put(self, url: str, name: str, input_hash: str, output):
+        """Saves a stage output with the hash of its inputs."""
+        path = self._path(url, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so a crash never leaves a partial checkpoint.
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"url": url, "input_hash": input_hash, "saved_at": time.time(), "output": output}, f, default=str)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not save the {name} checkpoint for {url}: {e}")
+
+    def _path(self, url: str, name: str) -> str:
+        document = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, document, f"{name}.json")
+
+class DocumentCheckpoints:
+    """The checkpoints of one document during one run.
+
+    Decides per stage whether a checkpoint may be reused (only when resuming, and
+    never for the stage given as `rerun_from` or later ones) and saves the outputs
+    of stages that succeeded. Without a store, nothing is loaded or saved.
+    """
+
+    def __init__(self, store: CheckpointStore | None, url: str, resume: bool = False, rerun_from: str | None = None):
+        """Initializes the DocumentCheckpoints.
+
+        Args:
+            store: Where checkpoints are kept, or None to disable checkpointing.
+            url: The document's URL.
+            resume: Reuse checkpoints whose inputs are unchanged.
+            rerun_from: Re-run this stage and every later one even when their
+                        checkpoints could be reused (implies `resume`).
+
+        Raises:
+            ValueError: If `rerun_from` is not a pipeline stage.
+        """
+        if rerun_from is not None and rerun_from not in STAGES:
+            raise ValueError(f"Unknown stage '{rerun_from}'. Expected one of: {', '.join(STAGES)}.")
+        self.store = store
+        self.url = url
+        self.resume = resume or rerun_from is not None
+        self.rerun_from = rerun_from
+
+    def load(self, stage: str, name: str, input_hash: str):
+        """Returns the checkpoint `name` of `stage` if it may be reused, otherwise None."""
+        if self.store is None or not self.resume:
+            return None
+        if self.rerun_from is not None and STAGES.index(stage) >= STAGES.index(self.rerun_from):
+            return None
+        return self.store.get(self.url, name, input_hash)
+
+    def save(self, name: str, input_hash: str, output, succeeded: bool = True):
+        """Saves a stage output; outputs of failed stages are not saved, so they are retried."""
+        if self.store is not None and succeeded:
+            self.store.put(self.url, name, input_hash, output)
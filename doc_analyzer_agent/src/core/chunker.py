@@ -0,0 +1,134 @@
+# src/core/chunker.py
+import hashlib
+import re
+from dataclasses import dataclass
+from core.parser import HTMLParser, CODE_FENCE_PATTERN
+import config
+
+@dataclass
+class Chunk:
+    """A part of a document small enough to analyze in a single prompt.
+
+    Attributes:
+        heading: A label for the chunk (its first heading, if any).
+        text: The Markdown of the chunk.
+        content_hash: A hash of `text`.
+        token_estimate: Estimated number of tokens in `text`.
+    """
+    heading: str
+    text: str
+    content_hash: str
+    token_estimate: int
+
+def estimate_tokens(text: str) -> int:
+    """Roughly estimates the number of LLM tokens in a text without calling the API."""
+    return max(1, round(len(text) / config.CHARS_PER_TOKEN)) if text else 0
+
+def chunk_markdown(markdown: str, max_tokens: int, parser: HTMLParser | None = None) -> list[Chunk]:
+    """Splits Markdown into chunks under a token budget at natural boundaries.
+
+    Consecutive heading-delimited sections are packed into the same chunk while they
+    fit. A section that is larger than the budget on its own is split at paragraph
+    boundaries (never inside a fenced code block), then at line boundaries, and only
+    as a last resort in the middle of a line.
+
+    Args:
+        markdown: Markdown produced by HTMLParser.parse().
+        max_tokens: Maximum estimated tokens per chunk.
+        parser: The HTMLParser used to split sections. A new one is created if omitted.
+
+    Returns:
+        The chunks in document order. A document within the budget yields one chunk.
+    """
+    parser = parser or HTMLParser()
+    max_chars = max(1, max_tokens * config.CHARS_PER_TOKEN)
+
+    pieces = [] # (heading, text) pieces, each within the budget
+    for section in parser.split_sections(markdown):
+        if len(section.text) <= max_chars:
+            pieces.append((section.heading, section.text))
+        else:
+            pieces.extend((section.heading, part) for part in _split_oversized(section.text, max_chars))
+
+    chunks = []
+    heading, parts, size = None, [], 0
+    for piece_heading, text in pieces:
+        # +2 for the blank line joining pieces
+        if parts and size + 2 + len(text) > max_chars:
+            chunks.append(_make_chunk(heading, parts))
+            heading, parts, size = None, [], 0
+        if heading is None:
+            heading = piece_heading
+        parts.append(text)
+        size += (2 if size else 0) + len(text)
+    if parts:
+        chunks.append(_make_chunk(heading, parts))
+    return chunks
+
+def _make_chunk(heading: str | None, parts: list[str]) -> Chunk:
+    text = "\n\n".join(parts)
+    return Chunk(
+        heading=heading or "",
+        text=text,
+        content_hash=hashlib.sha256(text.encode("utf-8")).hexdigest()[:16],
+        token_estimate=estimate_tokens(text)
+    )
+
+def _split_oversized(text: str, max_chars: int) -> list[str]:
+    """Splits text that exceeds max_chars into parts that fit, at paragraph boundaries where possible."""
+    parts = []
+    current = ""
+    for paragraph in _paragraphs(text):
+        candidates = [paragraph] if len(paragraph) <= max_chars else _split_lines(paragraph, max_chars)
+        for candidate in candidates:
+            joined = f"{current}\n\n{candidate}" if current else candidate
+            if len(joined) <= max_chars:
+                current = joined
+            else:
+                if current:
+                    parts.append(current)
+                current = candidate
+    if current:
+        parts.append(current)
+    return parts
+
+def _paragraphs(text: str) -> list[str]:
+    """Splits text at blank lines, keeping fenced code blocks whole."""
+    paragraphs = []
+    lines = []
+    in_code_block = False
+    for line in text.splitlines():
+        if CODE_FENCE_PATTERN.match(line):
+            in_code_block = not in_code_block
+        if not line.strip() and not in_code_block:
+            if lines:
+                paragraphs.append("\n".join(lines))
+                lines = []
+            continue
+        lines.append(line)
+    if lines:
+        paragraphs.append("\n".join(lines))
+    return paragraphs
+
+def _split_lines(paragraph: str, max_chars: int) -> list[str]:
+    """Splits a single oversized paragraph at line breaks, then sentence or hard boundaries."""
+    parts = []
+    current = ""
+    for line in paragraph.splitlines():
+        pieces = [line]
+        if len(line) > max_chars:
+            # Prefer sentence boundaries; fall back to fixed-size slices.
+            pieces = []
+            for sentence in re.split(r"(?<=[.!?])\s+", line):
+                pieces.extend(sentence[i:i + max_chars] for i in range(0, len(sentence), max_chars))
+        for piece in pieces:
+            joined = f"{current}\n{piece}" if current else piece
+            if len(joined) <= max_chars:
+                current = joined
+            else:
+                if current:
+                    parts.append(current)
+                current = piece
+    if current:
+        parts.append(current)
+    return parts
@@ -1,55 +1,446 @@
 # src/core/fetcher.py
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError, Error as PlaywrightError
+import asyncio
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from core.html_cache import HTMLCache
+import config
+
+if TYPE_CHECKING:
+    import requests
+
+# requests and Playwright are imported where they are first used, so runs served from the
+# HTML cache don't load them and the browser stack only loads when a page needs it.
+
+HTML_CACHE_MODES = ("use", "cache-only", "bypass")
+
+# Class of the element HTMLParser extracts the article from.
+ARTICLE_BODY_PATTERN = re.compile(r"""<div\b[^>]*\bclass\s*=\s*["'][^"']*(?<![\w-])article-body(?![\w-])[^>]*>(\s*</div>)?""", re.IGNORECASE)
+# Bot-check interstitials (e.g. Cloudflare) that only a real browser gets past.
+BOT_CHECK_PATTERN = re.compile(r"cf-browser-verification|challenge-platform|<title>\s*just a moment", re.IGNORECASE)
+# Markers of single-page apps that render their content with JavaScript.
+JS_RENDERED_PATTERNS = [
+    re.compile(r"<noscript\b[^>]*>[^<]*(enable|turn on)\s+javascript", re.IGNORECASE),
+    re.compile(r"""<div\b[^>]*\bid\s*=\s*["'](root|app|__next)["'][^>]*>\s*</div>""", re.IGNORECASE),
+]
+
+@dataclass
+class FetchResult:
+    """The outcome of fetching a URL.
+
+    Attributes:
+        url: The URL that was fetched.
+        html: The HTML content.
+        source: Which path served the content: "http", "browser" or "cache"
+                ("provided" for HTML handed to run_analysis directly).
+        status_code: The HTTP status code, if known.
+        elapsed_seconds: Time spent fetching.
+        not_modified: True if the content is known to be unchanged since it was
+                      cached (a 304 response, or a cache hit within max-age), so a
+                      previous analysis of it can be reused.
+    """
+    url: str
+    html: str
+    source: str
+    status_code: int | None = None
+    elapsed_seconds: float = 0.0
+    not_modified: bool = False
+
+class BrowserPool:
+    """A long-lived Playwright fetcher that reuses one browser and a pool of pages.
+
+    Starting Chromium dominates fetch latency, so the browser is launched once and a
+    fixed number of pages (each in its own browser context) are reused across
+    fetches. A page is recycled after `max_uses_per_page` fetches or when a fetch on
+    it fails, and the browser is relaunched if it crashes.
+
+    Playwright objects can only be used from the event loop that created them, so the
+    pool runs its own event loop on a background thread. fetch() can therefore be
+    called from any thread (e.g. batch workers), and afetch() from any event loop.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = config.BROWSER_POOL_SIZE,
+        max_uses_per_page: int = config.BROWSER_PAGE_MAX_USES,
+        timeout_ms: int = config.FETCH_TIMEOUT_MS
+    ):
+        """Initializes the BrowserPool. The browser is launched on first use.
+
+        Args:
+            pool_size: Number of pages that can load concurrently.
+            max_uses_per_page: Number of fetches after which a page and its context
+                               are replaced with fresh ones.
+            timeout_ms: Navigation timeout for each fetch, in milliseconds.
+        """
+        self.pool_size = max(1, pool_size)
+        self.max_uses_per_page = max_uses_per_page
+        self.timeout_ms = timeout_ms
+        self._loop = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._playwright = None
+        self._browser = None
+        self._browser_lock = None
+        self._slots = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def fetch(self, url: str) -> str | None:
+        """Fetches the rendered HTML of a URL, blocking until it is available.
+
+        Args:
+            url: The URL to fetch content from.
+
+        Returns:
+            The HTML content as a string, or None if fetching fails.
+        """
+        self._ensure_started()
+        return asyncio.run_coroutine_threadsafe(self._fetch(url), self._loop).result()
+
+    async def afetch(self, url: str) -> str | None:
+        """Async counterpart of fetch() that can be awaited from any event loop."""
+        self._ensure_started()
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._fetch(url), self._loop))
+
+    def fetch_many(self, urls: list[str]) -> list[str | None]:
+        """Fetches several URLs concurrently, up to `pool_size` pages at a time.
+
+        Returns:
+            The HTML content (or None on failure) for each URL, in input order.
+        """
+        self._ensure_started()
+
+        async def fetch_all():
+            return await asyncio.gather(*(self._fetch(url) for url in urls))
+
+        return asyncio.run_coroutine_threadsafe(fetch_all(), self._loop).result()
+
+    def start(self):
+        """Launches the browser now instead of on first use (e.g. to keep it warm in a long-lived server)."""
+        self._ensure_started()
+
+    def close(self):
+        """Closes every page, the browser and the background event loop."""
+        with self._start_lock:
+            if self._loop is None:
+                return
+            try:
+                asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+            except Exception as e:
+                print(f"Error closing browser pool: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+    def _ensure_started(self):
+        """Starts the background event loop and launches the browser if needed."""
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True)
+            thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(self._startup(), loop).result()
+            except Exception:
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+                raise
+            self._loop = loop
+            self._thread = thread
+
+    async def _startup(self):
+        # You might need to run 'playwright install' in your terminal first
+        from playwright.async_api import async_playwright
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch()
+        self._browser_lock = asyncio.Lock()
+        self._slots = asyncio.Queue()
+        for _ in range(self.pool_size):
+            # Pages are created lazily the first time a slot is used.
+            self._slots.put_nowait({"browser": None, "context": None, "page": None, "uses": 0})
+        print(f"Browser pool started with {self.pool_size} pages.")
+
+    async def _shutdown(self):
+        while not self._slots.empty():
+            await self._recycle(self._slots.get_nowait())
+        if self._browser:
+            await self._browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+        self._browser = None
+        self._playwright = None
+
+    async def _fetch(self, url: str) -> str | None:
+        from playwright.async_api import Error as PlaywrightError
+        slot = await self._slots.get()
+        try:
+            if not self._slot_is_usable(slot):
+                await self._recycle(slot)
+                await self._ensure_browser()
+                slot["browser"] = self._browser
+                slot["context"] = await self._browser.new_context()
+                slot["page"] = await slot["context"].new_page()
+
+            print(f"Navigating to {url} using Playwright...")
+            await slot["page"].goto(url, timeout=self.timeout_ms)
+            html_content = await slot["page"].content()
+            slot["uses"] += 1
+            print("Content fetched successfully using Playwright.")
+            return html_content
+        except PlaywrightError as e:
+            # PlaywrightError also covers navigation timeouts.
+            print(f"Error fetching URL {url} with Playwright: {e}")
+            await self._recycle(slot)
+            return None
+        except Exception as e:
+            print(f"An unexpected error occurred during Playwright fetch: {e}")
+            await self._recycle(slot)
+            return None
+        finally:
+            self._slots.put_nowait(slot)
+
+    def _slot_is_usable(self, slot: dict) -> bool:
+        """Checks whether a slot's page can be reused for another fetch."""
+        return (
+            slot["page"] is not None
+            and not slot["page"].is_closed()
+            and slot["uses"] < self.max_uses_per_page
+            # Pages from a browser that crashed (and was relaunched) are unusable.
+            and slot["browser"] is self._browser
+            and self._browser.is_connected()
+        )
+
+    async def _recycle(self, slot: dict):
+        """Closes a slot's context so a fresh page is created on its next use."""
+        browser_alive = slot["browser"] is not None and slot["browser"].is_connected()
+        if slot["context"] is not None and browser_alive:
+            try:
+                await slot["context"].close()
+            except Exception as close_err:
+                print(f"Error closing browser context: {close_err}")
+        slot["browser"] = None
+        slot["context"] = None
+        slot["page"] = None
+        slot["uses"] = 0
+
+    async def _ensure_browser(self):
+        """Relaunches the browser if it has crashed or been disconnected."""
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                print("Browser is not connected. Relaunching Chromium...")
+                self._browser = await self._playwright.chromium.launch()
 
 def fetch_html_content(url: str) -> str | None:
     """Fetches HTML content from a given URL using Playwright.
 
+    This is a one-off convenience wrapper; use a long-lived BrowserPool to fetch
+    several URLs without relaunching the browser each time.
+
     Args:
         url: The URL to fetch content from.
 
     Returns:
         The HTML content as a string, or None if fetching fails.
     """
-    html_content = None
     try:
-        with sync_playwright() as p:
-            # Launch a browser (chromium is usually a good default)
-            # You might need to run 'playwright install' in your terminal first
-            browser = p.chromium.launch()
-            page = browser.new_page()
-            
-            print(f"Navigating to {url} using Playwright...")
-            # Navigate to the URL with a reasonable timeout
-            page.goto(url, timeout=60000) # 60 seconds timeout
-            
-            # Wait for the page to be reasonably loaded (optional, might need adjustment)
-            # page.wait_for_load_state("networkidle", timeout=30000)
-            
-            # Get the full HTML content
-            html_content = page.content()
-            print("Content fetched successfully using Playwright.")
-            
-            browser.close()
-            
-        return html_content
-        
-    except (PlaywrightTimeoutError, PlaywrightError) as e:
-        print(f"Error fetching URL {url} with Playwright: {e}")
-        if "browser has been closed" not in str(e).lower(): # Avoid printing error if browser closed normally
-             if browser: # Ensure browser exists before trying to close
-                 try:
-                     browser.close()
-                 except Exception as close_err:
-                     print(f"Error closing browser after fetch error: {close_err}")
-        return None
+        with BrowserPool(pool_size=1) as pool:
+            return pool.fetch(url)
     except Exception as e:
-        # Catch any other unexpected errors
+        # Catch any other unexpected errors (e.g. the browser failing to launch)
         print(f"An unexpected error occurred during Playwright fetch: {e}")
-        # Ensure browser is closed if it exists and wasn't closed
-        if browser: 
-            try:
-                browser.close()
-            except Exception as close_err:
-                print(f"Error closing browser after unexpected error: {close_err}")
         return None
 
+def needs_browser(html_content: str) -> str | None:
+    """Checks whether statically fetched HTML is missing the content we analyze.
+
+    Args:
+        html_content: HTML returned by a plain HTTP request.
+
+    Returns:
+        A short reason if the page should be rendered in a browser instead,
+        otherwise None.
+    """
+    if not html_content or not html_content.strip():
+        return "empty response"
+    if BOT_CHECK_PATTERN.search(html_content):
+        return "bot check page"
+    article_match = ARTICLE_BODY_PATTERN.search(html_content)
+    if article_match is None:
+        if any(pattern.search(html_content) for pattern in JS_RENDERED_PATTERNS):
+            return "page appears to be rendered with JavaScript"
+        return "article body not found in static HTML"
+    if article_match.group(1):
+        return "article body is empty (likely filled in by JavaScript)"
+    return None
+
+class Fetcher:
+    """Fetches pages over plain HTTP first, falling back to a headless browser.
+
+    Server-rendered help-center pages can be fetched with a single keep-alive HTTP
+    request in tens of milliseconds. The browser is only used when the static HTML
+    lacks the article body or looks JavaScript-rendered, or when the HTTP request
+    fails (e.g. blocked by a bot check).
+
+    Fetched pages are kept in an HTMLCache. Pages younger than `max_age_seconds`
+    are served straight from the cache; older ones are revalidated with a
+    conditional GET (If-None-Match / If-Modified-Since), and a 304 response reuses
+    the cached copy.
+    """
+
+    def __init__(
+        self,
+        browser_pool: BrowserPool | None = None,
+        use_http: bool = config.FETCH_USE_HTTP,
+        timeout_seconds: float = config.HTTP_TIMEOUT_SECONDS,
+        pool_size: int = config.HTTP_POOL_SIZE,
+        html_cache: HTMLCache | None = None,
+        cache_mode: str = "use",
+        max_age_seconds: float = config.HTML_CACHE_MAX_AGE_SECONDS
+    ):
+        """Initializes the Fetcher.
+
+        Args:
+            browser_pool: The BrowserPool to fall back to. A single-page pool is
+                          created (and launched on first use) if omitted.
+            use_http: Whether to try the plain HTTP path at all.
+            timeout_seconds: Timeout for each HTTP request.
+            pool_size: Maximum number of keep-alive connections kept per host.
+            html_cache: The HTMLCache to use. One is created in
+                        config.HTML_CACHE_DIR if omitted (and caching is enabled).
+            cache_mode: "use" serves and revalidates cached pages, "cache-only"
+                        serves cached pages regardless of age without touching the
+                        network (offline mode), and "bypass" disables the cache.
+            max_age_seconds: Age below which a cached page is served without
+                             revalidation.
+        """
+        if cache_mode not in HTML_CACHE_MODES:
+            raise ValueError(f"Invalid HTML cache mode '{cache_mode}'. Expected one of: {', '.join(HTML_CACHE_MODES)}.")
+        self.cache_mode = cache_mode
+        self.max_age_seconds = max_age_seconds
+        if cache_mode == "bypass":
+            self.html_cache = None
+        elif html_cache is not None:
+            self.html_cache = html_cache
+        else:
+            self.html_cache = HTMLCache(config.HTML_CACHE_DIR) if config.HTML_CACHE_ENABLED else None
+        self.browser_pool = browser_pool if browser_pool is not None else BrowserPool(pool_size=1)
+        self.use_http = use_http
+        self.timeout_seconds = timeout_seconds
+        self.pool_size = pool_size
+        self.session = None # Created on the first HTTP request (see _get_session)
+        self._session_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def fetch(self, url: str, revalidate: bool = False) -> FetchResult | None:
+        """Fetches a URL, using plain HTTP when the static HTML is sufficient.
+
+        Args:
+            url: The URL to fetch content from.
+            revalidate: Check a cached page with a conditional GET even if it is
+                        younger than the cache's maximum age (e.g. before resuming
+                        from checkpoints), so changes are never missed.
+
+        Returns:
+            A FetchResult recording which path served the page, or None if both
+            paths failed.
+        """
+        start = time.perf_counter()
+        cached = self.html_cache.get(url) if self.html_cache else None
+        if cached and (self.cache_mode == "cache-only" or (not revalidate and cached.age_seconds() < self.max_age_seconds)):
+            print(f"Serving {url} from the HTML cache (fetched {cached.age_seconds():.0f}s ago).")
+            return FetchResult(url, cached.html, "cache", None, time.perf_counter() - start, not_modified=True)
+        if self.cache_mode == "cache-only":
+            print(f"{url} is not in the HTML cache and cache-only mode is enabled.")
+            return None
+
+        status_code = None
+        response = None
+        if self.use_http:
+            import requests
+            headers = {}
+            if cached and cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached and cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+            try:
+                response = self._get_session().get(url, headers=headers, timeout=self.timeout_seconds)
+                status_code = response.status_code
+                if status_code == 304 and cached:
+                    self.html_cache.touch(url)
+                    elapsed = time.perf_counter() - start
+                    print(f"{url} not modified (304). Using the cached copy.")
+                    return FetchResult(url, cached.html, "cache", status_code, elapsed, not_modified=True)
+                content_type = response.headers.get("Content-Type", "")
+                if response.ok and "html" in content_type.lower():
+                    reason = needs_browser(response.text)
+                    if reason is None:
+                        elapsed = time.perf_counter() - start
+                        print(f"Fetched {url} over HTTP in {elapsed * 1000:.0f} ms.")
+                        self._store(url, response.text, response, "http")
+                        return FetchResult(url, response.text, "http", status_code, elapsed)
+                    print(f"Static HTML not usable ({reason}). Falling back to headless browser.")
+                else:
+                    print(f"HTTP fetch returned status {status_code} ({content_type or 'no content type'}). Falling back to headless browser.")
+            except requests.RequestException as e:
+                print(f"HTTP fetch failed for {url}: {e}. Falling back to headless browser.")
+
+        try:
+            html_content = self.browser_pool.fetch(url)
+        except Exception as e:
+            # E.g. Chromium is not installed: report a failed fetch, like a failed page load.
+            print(f"Headless browser fetch failed for {url}: {e}")
+            return None
+        if not html_content:
+            return None
+        # Validators from the static response (if any) still tell us when the page changes.
+        self._store(url, html_content, response if response is not None and response.ok else None, "browser")
+        return FetchResult(url, html_content, "browser", status_code, time.perf_counter() - start)
+
+    def _get_session(self) -> "requests.Session":
+        """Returns the keep-alive HTTP session, creating it on first use."""
+        with self._session_lock:
+            if self.session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({
+                    "User-Agent": config.HTTP_USER_AGENT,
+                    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+                })
+                self.session = session
+            return self.session
+
+    def _store(self, url: str, html_content: str, response: "requests.Response | None", source: str):
+        """Saves a freshly fetched page and its validators in the HTML cache."""
+        if not self.html_cache:
+            return
+        headers = response.headers if response is not None else {}
+        try:
+            self.html_cache.put(url, html_content, headers.get("ETag"), headers.get("Last-Modified"), source)
+        except OSError as e:
+            print(f"Warning: Could not write {url} to the HTML cache: {e}")
+
+    def close(self):
+        """Closes the HTTP session and the browser pool."""
+        if self.session is not None:
+            self.session.close()
+        self.browser_pool.close()
@@ -0,0 +1,174 @@
+# src/core/html_cache.py
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+try:
+    import zstandard # Optional: pip install zstandard
+except ImportError:
+    zstandard = None
+
+@dataclass
+class CachedPage:
+    """A page stored in the HTMLCache.
+
+    Attributes:
+        url: The URL the page was fetched from.
+        html: The HTML content.
+        etag: The ETag response header, used for If-None-Match.
+        last_modified: The Last-Modified response header, used for If-Modified-Since.
+        fetched_at: Unix time the page was last fetched or revalidated.
+        source: Which fetch path produced the HTML ("http" or "browser").
+    """
+    url: str
+    html: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+    source: str
+
+    def age_seconds(self) -> float:
+        """Returns how long ago the page was fetched or last revalidated."""
+        return time.time() - self.fetched_at
+
+class HTMLCache:
+    """An on-disk cache of fetched HTML keyed by URL.
+
+    Each URL has a compressed body file (zstd if the `zstandard` package is
+    installed, gzip otherwise) and a JSON metadata file with its validators
+    (ETag / Last-Modified) and fetch time, so stale pages can be revalidated with
+    a conditional GET. The cache can also hold the last report generated for a URL,
+    so an unchanged page does not need to be analyzed again.
+    """
+
+    def __init__(self, directory: str):
+        """Initializes the HTMLCache, creating the directory if needed.
+
+        Args:
+            directory: Directory to store the cached pages in.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, url: str) -> CachedPage | None:
+        """Returns the cached page for a URL, or None if it is not cached or unreadable."""
+        meta = self._read_meta(url)
+        if meta is None:
+            return None
+        body_path = self._path(meta["body_file"])
+        try:
+            with open(body_path, "rb") as f:
+                html = self._decompress(f.read(), meta.get("compression", "gzip"))
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read cached HTML for {url}: {e}")
+            return None
+        return CachedPage(
+            url=url,
+            html=html,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            fetched_at=meta.get("fetched_at", 0.0),
+            source=meta.get("source", "http")
+        )
+
+    def put(self, url: str, html: str, etag: str | None = None, last_modified: str | None = None, source: str = "http"):
+        """Stores (or replaces) the HTML and validators for a URL."""
+        compression = "zstd" if zstandard else "gzip"
+        body_file = f"{self._key(url)}.html.{'zst' if compression == 'zstd' else 'gz'}"
+        self._write_atomic(self._path(body_file), self._compress(html, compression))
+
+        meta = self._read_meta(url) or {}
+        if meta.get("body_file") not in (None, body_file):
+            # The compression changed; remove the body written with the old one.
+            try:
+                os.remove(self._path(meta["body_file"]))
+            except OSError:
+                pass
+        meta.update({
+            "url": url,
+            "body_file": body_file,
+            "compression": compression,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+            "source": source,
+            "content_hash": hashlib.sha256(html.encode("utf-8")).hexdigest()
+        })
+        self._write_meta(url, meta)
+
+    def touch(self, url: str):
+        """Marks a cached page as freshly revalidated (e.g. after a 304 response)."""
+        meta = self._read_meta(url)
+        if meta is not None:
+            meta["fetched_at"] = time.time()
+            self._write_meta(url, meta)
+
+    def store_report(self, url: str, report: str, variant: str = ""):
+        """Stores the report generated from the currently cached HTML of a URL.
+
+        Args:
+            url: The analyzed URL.
+            report: The final report in Markdown.
+            variant: Identifies the analysis options the report was produced with,
+                     so a report is only reused for the same kind of run.
+        """
+        meta = self._read_meta(url)
+        if meta is None:
+            return
+        reports = meta.setdefault("reports", {})
+        reports[variant] = {"content_hash": meta.get("content_hash"), "report": report, "created_at": time.time()}
+        self._write_meta(url, meta)
+
+    def load_report(self, url: str, variant: str = "") -> str | None:
+        """Returns the stored report for a URL if it was generated from the cached HTML."""
+        meta = self._read_meta(url)
+        if meta is None:
+            return None
+        stored = meta.get("reports", {}).get(variant)
+        if not stored or stored.get("content_hash") != meta.get("content_hash"):
+            return None
+        return stored.get("report")
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.directory, filename)
+
+    def _read_meta(self, url: str) -> dict | None:
+        try:
+            with open(self._path(f"{self._key(url)}.json"), "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read HTML cache metadata for {url}: {e}")
+            return None
+        return meta if meta.get("url") == url else None
+
+    def _write_meta(self, url: str, meta: dict):
+        self._write_atomic(self._path(f"{self._key(url)}.json"), json.dumps(meta).encode("utf-8"))
+
+    def _write_atomic(self, path: str, data: bytes):
+        # Write to a temporary file first so concurrent readers never see a partial file.
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _compress(self, html: str, compression: str) -> bytes:
+        data = html.encode("utf-8")
+        if compression == "zstd":
+            return zstandard.ZstdCompressor().compress(data)
+        return gzip.compress(data)
+
+    def _decompress(self, data: bytes, compression: str) -> str:
+        if compression == "zstd":
+            if zstandard is None:
+                raise ValueError("entry is zstd-compressed but the zstandard package is not installed")
+            return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+        return gzip.decompress(data).decode("utf-8")
@@ -1,77 +1,353 @@
-import google.generativeai as genai
+import asyncio
 import json
 import time
 import config # Use absolute import assuming src is in sys.path
+from core.response_cache import ResponseCache
+from core.resilience import RateLimiter, CircuitBreaker, classify_error, retry_after_seconds, backoff_delay, RATE_LIMIT, PERMANENT
+from core.chunker import estimate_tokens
+from core.metrics import MetricsRecorder, CallRecord, record_call
+from core.cassette import Cassette
+
+CACHE_MODES = ("use", "refresh", "bypass")
 
 class LLMService:
     """Provides an interface to interact with the configured LLM API (Google Gemini)."""
 
-    def __init__(self):
-        """Initializes the LLMService, configuring the Gemini API."""
-        if not config.GEMINI_API_KEY:
+    def __init__(self, cache_mode: str = "use", model=None, cassette: Cassette | None = None):
+        """Initializes the LLMService, configuring the Gemini API.
+
+        Args:
+            cache_mode: How to use the on-disk response cache. "use" serves cached
+                        responses and stores new ones, "refresh" ignores cached
+                        responses but stores new ones, and "bypass" disables the cache.
+            model: A stand-in for the Gemini model, e.g. an offline backend for
+                   benchmarks. It must provide generate_content() and
+                   generate_content_async() returning Gemini-like responses. No API
+                   key is needed when it is given.
+            cassette: A Cassette to record every prompt/response pair to (record mode)
+                      or to answer from instead of the API (replay mode). Replays need
+                      no API key and bypass the response cache.
+        """
+        replaying = cassette is not None and cassette.mode == "replay"
+        if model is None and not replaying and not config.GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY environment variable not set.")
+        if cache_mode not in CACHE_MODES:
+            raise ValueError(f"Invalid cache mode '{cache_mode}'. Expected one of: {', '.join(CACHE_MODES)}.")
         
-        genai.configure(api_key=config.GEMINI_API_KEY)
-        self.model = genai.GenerativeModel(config.GEMINI_MODEL_NAME)
-        print(f"LLM Service initialized with model: {config.GEMINI_MODEL_NAME}")
+        self.generation_config = config.GEMINI_GENERATION_CONFIG
+        if replaying:
+            self.model_name = config.GEMINI_MODEL_NAME
+            self.model = None
+        elif model is None:
+            import google.generativeai as genai # Imported here: it takes about half a second to load
+            genai.configure(api_key=config.GEMINI_API_KEY)
+            self.model_name = config.GEMINI_MODEL_NAME
+            self.model = genai.GenerativeModel(self.model_name, generation_config=self.generation_config)
+        else:
+            self.model_name = getattr(model, "model_name", config.GEMINI_MODEL_NAME)
+            self.model = model
+        self.cache_mode = cache_mode
+        self.cassette = cassette
+        self.cache = None
+        if config.LLM_CACHE_ENABLED and cache_mode != "bypass" and not replaying:
+            self.cache = ResponseCache(
+                config.LLM_CACHE_PATH,
+                ttl_seconds=config.LLM_CACHE_TTL_SECONDS,
+                max_entries=config.LLM_CACHE_MAX_ENTRIES
+            )
+        self.max_concurrency = config.LLM_MAX_CONCURRENCY
+        self._semaphore = None
+        self._semaphore_loop = None
+        # Shared by every call through this service, including concurrent ones.
+        self.rate_limiter = RateLimiter(config.LLM_REQUESTS_PER_MINUTE, config.LLM_TOKENS_PER_MINUTE)
+        self.circuit_breaker = CircuitBreaker(config.LLM_CIRCUIT_FAILURE_THRESHOLD, config.LLM_CIRCUIT_RESET_SECONDS)
+        # Every call through this service; callers can also collect their own (see core/metrics.py).
+        self.metrics = MetricsRecorder()
+        print(f"LLM Service initialized with model: {self.model_name}")
 
-    def query_llm(self, prompt: str, retries: int = 3, delay: int = 5) -> dict | str | None:
+    def query_llm(self, prompt: str, retries: int = config.LLM_MAX_ATTEMPTS,
+                  delay: float = config.LLM_BACKOFF_BASE_SECONDS, stage: str = "other") -> dict | str | None:
         """Sends a prompt to the configured LLM and attempts to parse the JSON response.
 
+        Calls go through the service's rate limiter and circuit breaker. Failures
+        are classified: rate limits pause every caller until the retry-after time,
+        transient errors are retried with exponential backoff and jitter, and
+        requests the API rejected are not retried.
+
         Args:
             prompt: The prompt string to send to the LLM.
-            retries: Number of times to retry the API call in case of failure.
-            delay: Delay in seconds between retries.
+            retries: Maximum number of attempts for the API call.
+            delay: Base delay in seconds for the exponential backoff between attempts.
+            stage: The pipeline stage or analyzer making the call, used to attribute
+                   its tokens, latency and cost in the usage metrics.
 
         Returns:
             A dictionary if the LLM returns valid JSON, otherwise the raw text response,
-            or None if the API call fails after retries.
+            or None if the API call fails after retries or the circuit breaker is open.
+
+        Raises:
+            CassetteMissError: When replaying a cassette that does not contain the prompt.
         """
+        start = time.perf_counter()
+        if self._replaying():
+            recorded = self.cassette.play(prompt, stage)
+            time.sleep(self.cassette.replay_delay(recorded))
+            return self._replayed(recorded, stage, start)
+        cache_key, cached_text = self._cache_lookup(prompt)
+        if cached_text is not None:
+            self._record_call(stage, start, attempts=0, cache_hit=True)
+            self._record_to_cassette(prompt, cached_text, stage, start)
+            return self._parse_text(cached_text)
+
+        tokens = estimate_tokens(prompt)
+        attempts = 0
         for attempt in range(retries):
+            if not self._allow_request():
+                break
             try:
+                self.rate_limiter.acquire(tokens)
+                attempts += 1
                 print(f"\n--- Sending prompt to LLM (Attempt {attempt + 1}/{retries}) ---")
                 # print(prompt) # Uncomment for debugging prompts
                 print("-----------------------------------------------------")
                 
                 response = self.model.generate_content(prompt)
-                
-                # Check for safety ratings or blocks
-                if not response.candidates:
-                     print(f"Warning: LLM response blocked or empty. Prompt: {prompt[:100]}...")
-                     # You might want to inspect response.prompt_feedback here
-                     # print(f"Prompt Feedback: {response.prompt_feedback}")
-                     # Depending on the block reason, you might retry or return None
-                     # For now, let's treat it as a failure for this attempt
-                     raise Exception(f"LLM response blocked or empty. Feedback: {response.prompt_feedback}")
-
-                raw_response_text = response.text
-                print("--- Received LLM Response ---")
-                # print(raw_response_text) # Uncomment for debugging responses
-                print("---------------------------")
-
-                # Attempt to parse as JSON, assuming the prompt asked for it
-                try:
-                    # Clean the response text: remove potential markdown code fences
-                    cleaned_response = raw_response_text.strip()
-                    if cleaned_response.startswith("```json"):
-                        cleaned_response = cleaned_response[7:]
-                    if cleaned_response.endswith("```"):
-                        cleaned_response = cleaned_response[:-3]
-                    cleaned_response = cleaned_response.strip()
-                    
-                    parsed_json = json.loads(cleaned_response)
-                    return parsed_json
-                except json.JSONDecodeError:
-                    print("Warning: LLM response was not valid JSON. Returning raw text.")
-                    return raw_response_text # Return raw text if JSON parsing fails
+                result = self._handle_response(response, prompt, cache_key)
+            except Exception as e:
+                wait = self._handle_failure(e, attempt, retries, delay)
+                if wait is None:
+                    break
+                time.sleep(wait)
+                continue
+            except BaseException:
+                # Interrupted without an outcome; don't leave a half-open circuit waiting for it.
+                self.circuit_breaker.release_trial()
+                raise
+            self._record_success(response, tokens)
+            self._record_call(stage, start, attempts, response=response)
+            self._record_to_cassette(prompt, response.text, stage, start, response)
+            return result
+        self._record_call(stage, start, attempts, succeeded=False)
+        return None
+
+    async def aquery_llm(self, prompt: str, retries: int = config.LLM_MAX_ATTEMPTS,
+                  delay: float = config.LLM_BACKOFF_BASE_SECONDS, stage: str = "other") -> dict | str | None:
+        """Async counterpart of query_llm built on the Gemini async generate API.
+
+        All calls made through this service share one client and a semaphore that caps
+        the number of requests in flight (config.LLM_MAX_CONCURRENCY), so many documents
+        can be analyzed on one event loop. Rate limiting and retries wait with
+        asyncio.sleep and do not block the loop.
 
+        Args:
+            prompt: The prompt string to send to the LLM.
+            retries: Maximum number of attempts for the API call.
+            delay: Base delay in seconds for the exponential backoff between attempts.
+            stage: The pipeline stage or analyzer making the call, used to attribute
+                   its tokens, latency and cost in the usage metrics.
+
+        Returns:
+            A dictionary if the LLM returns valid JSON, otherwise the raw text response,
+            or None if the API call fails after retries or the circuit breaker is open.
+
+        Raises:
+            CassetteMissError: When replaying a cassette that does not contain the prompt.
+        """
+        start = time.perf_counter()
+        if self._replaying():
+            recorded = self.cassette.play(prompt, stage)
+            await asyncio.sleep(self.cassette.replay_delay(recorded))
+            return self._replayed(recorded, stage, start)
+        cache_key, cached_text = self._cache_lookup(prompt)
+        if cached_text is not None:
+            self._record_call(stage, start, attempts=0, cache_hit=True)
+            self._record_to_cassette(prompt, cached_text, stage, start)
+            return self._parse_text(cached_text)
+
+        tokens = estimate_tokens(prompt)
+        attempts = 0
+        for attempt in range(retries):
+            if not self._allow_request():
+                break
+            try:
+                await self.rate_limiter.aacquire(tokens)
+                attempts += 1
+                async with self._get_semaphore():
+                    print(f"\n--- Sending async prompt to LLM (Attempt {attempt + 1}/{retries}) ---")
+                    response = await self.model.generate_content_async(prompt)
+                result = self._handle_response(response, prompt, cache_key)
             except Exception as e:
-                print(f"Error querying LLM (Attempt {attempt + 1}/{retries}): {e}")
-                if attempt < retries - 1:
-                    print(f"Retrying in {delay} seconds...")
-                    time.sleep(delay)
-                else:
-                    print("LLM query failed after multiple retries.")
-                    return None
-        return None # Should not be reached if retries > 0, but added for safety
+                wait = self._handle_failure(e, attempt, retries, delay)
+                if wait is None:
+                    break
+                await asyncio.sleep(wait)
+                continue
+            except BaseException:
+                # Cancelled (e.g. by a timeout) without an outcome; don't leave a half-open circuit waiting for it.
+                self.circuit_breaker.release_trial()
+                raise
+            self._record_success(response, tokens)
+            self._record_call(stage, start, attempts, response=response)
+            self._record_to_cassette(prompt, response.text, stage, start, response)
+            return result
+        self._record_call(stage, start, attempts, succeeded=False)
+        return None
+
+    def _allow_request(self) -> bool:
+        """Checks the circuit breaker before a call."""
+        if self.circuit_breaker.allow_request():
+            return True
+        print("LLM circuit breaker is open after repeated failures; skipping the call.")
+        return False
+
+    def _handle_failure(self, error: Exception, attempt: int, retries: int, delay: float) -> float | None:
+        """Classifies a failed call and decides whether to retry it.
+
+        Returns:
+            The number of seconds to wait before the next attempt, or None to give up.
+        """
+        kind = classify_error(error)
+        print(f"Error querying LLM (Attempt {attempt + 1}/{retries}, {kind.replace('_', ' ')}): {error}")
+        if kind == PERMANENT:
+            # The backend answered, so this doesn't count against its health.
+            self.circuit_breaker.record_success()
+            print("The request was rejected; not retrying.")
+            return None
+        retry_after = retry_after_seconds(error)
+        wait = backoff_delay(attempt, delay, config.LLM_BACKOFF_MAX_SECONDS, retry_after)
+        if kind == RATE_LIMIT:
+            # Pause every caller sharing the limiter instead of letting each retry on its own.
+            self.circuit_breaker.record_success()
+            self.rate_limiter.on_rate_limited(wait)
+            wait = 0.0
+        else:
+            self.circuit_breaker.record_failure()
+        if attempt >= retries - 1:
+            print("LLM query failed after multiple retries.")
+            return None
+        print(f"Retrying in {wait:.1f} seconds..." if wait else "Retrying once the rate limiter allows...")
+        return wait
+
+    def _record_success(self, response, estimated_tokens: int):
+        """Updates the circuit breaker and rate limiter after a successful call."""
+        self.circuit_breaker.record_success()
+        self.rate_limiter.on_success()
+        total_tokens = getattr(getattr(response, "usage_metadata", None), "total_token_count", None)
+        if isinstance(total_tokens, int):
+            self.rate_limiter.record_usage(total_tokens - estimated_tokens)
+
+    def _record_call(self, stage: str, start: float, attempts: int, response=None, cache_hit: bool = False, succeeded: bool = True):
+        """Records the tokens (from the response usage metadata), latency and attempts of a call."""
+        usage = getattr(response, "usage_metadata", None)
+        record_call(CallRecord(
+            stage=stage,
+            prompt_tokens=getattr(usage, "prompt_token_count", 0) or 0,
+            response_tokens=getattr(usage, "candidates_token_count", 0) or 0,
+            latency_seconds=time.perf_counter() - start,
+            attempts=attempts,
+            cache_hit=cache_hit,
+            succeeded=succeeded
+        ), self.metrics)
+
+    def _replaying(self) -> bool:
+        """Checks whether calls are answered from a cassette instead of the API."""
+        return self.cassette is not None and self.cassette.mode == "replay"
+
+    def _replayed(self, recorded, stage: str, start: float) -> dict | list | str:
+        """Records a call answered from the cassette and parses its response."""
+        print(f"--- LLM response replayed from cassette ({stage}) ---")
+        self._record_call(stage, start, attempts=1, response=recorded)
+        return self._parse_text(recorded.text)
+
+    def _record_to_cassette(self, prompt: str, response_text: str, stage: str, start: float, response=None):
+        """Appends a prompt/response pair to the cassette when recording."""
+        if self.cassette is None or self.cassette.mode != "record":
+            return
+        usage = getattr(response, "usage_metadata", None)
+        self.cassette.record(
+            prompt,
+            response_text,
+            stage,
+            prompt_tokens=getattr(usage, "prompt_token_count", 0) or 0,
+            response_tokens=getattr(usage, "candidates_token_count", 0) or 0,
+            latency_seconds=time.perf_counter() - start
+        )
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Returns the in-flight request semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            # asyncio primitives are bound to a single loop, so recreate it if the
+            # service is reused from a new loop (e.g. successive asyncio.run calls).
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    def cache_stats(self) -> dict | None:
+        """Returns the response cache hit/miss counters, or None if caching is disabled."""
+        return self.cache.stats() if self.cache else None
+
+    def _cache_lookup(self, prompt: str) -> tuple[str | None, str | None]:
+        """Looks up a prompt in the response cache.
+
+        Returns:
+            A (cache_key, cached_text) tuple. cache_key is None when caching is
+            disabled, and cached_text is None unless a usable cached response exists.
+        """
+        if not self.cache:
+            return None, None
+        cache_key = ResponseCache.make_key(self.model_name, self.generation_config, prompt)
+        if self.cache_mode == "refresh":
+            return cache_key, None
+        cached_text = self.cache.get(cache_key)
+        if cached_text is not None:
+            print("--- LLM response served from cache ---")
+        return cache_key, cached_text
+
+    def _handle_response(self, response, prompt: str, cache_key: str | None) -> dict | str:
+        """Parses a fresh LLM response and stores it in the cache if it was valid JSON."""
+        raw_response_text = self._extract_text(response, prompt)
+        parsed = self._parse_text(raw_response_text)
+        # Only cache well-formed responses so a malformed answer is retried next run.
+        if cache_key and not isinstance(parsed, str):
+            self.cache.set(cache_key, raw_response_text)
+        return parsed
+
+    def _extract_text(self, response, prompt: str) -> str:
+        """Extracts the text from an LLM response.
+
+        Raises:
+            Exception: If the response was blocked or empty, so callers can retry.
+        """
+        # Check for safety ratings or blocks
+        if not response.candidates:
+             print(f"Warning: LLM response blocked or empty. Prompt: {prompt[:100]}...")
+             # You might want to inspect response.prompt_feedback here
+             # print(f"Prompt Feedback: {response.prompt_feedback}")
+             # Depending on the block reason, you might retry or return None
+             # For now, let's treat it as a failure for this attempt
+             raise Exception(f"LLM response blocked or empty. Feedback: {response.prompt_feedback}")
+
+        raw_response_text = response.text
+        print("--- Received LLM Response ---")
+        # print(raw_response_text) # Uncomment for debugging responses
+        print("---------------------------")
+        return raw_response_text
 
+    def _parse_text(self, raw_response_text: str) -> dict | list | str:
+        """Parses LLM response text as JSON, returning the raw text if that fails."""
+        # Attempt to parse as JSON, assuming the prompt asked for it
+        try:
+            # Clean the response text: remove potential markdown code fences
+            cleaned_response = raw_response_text.strip()
+            if cleaned_response.startswith("```json"):
+                cleaned_response = cleaned_response[7:]
+            if cleaned_response.endswith("```"):
+                cleaned_response = cleaned_response[:-3]
+            cleaned_response = cleaned_response.strip()
+            
+            parsed_json = json.loads(cleaned_response)
+            return parsed_json
+        except json.JSONDecodeError:
+            print("Warning: LLM response was not valid JSON. Returning raw text.")
+            return raw_response_text # Return raw text if JSON parsing fails
@@ -0,0 +1,164 @@
+# src/core/metrics.py
+import functools
+import inspect
+import json
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+import config
+
+# Recorders collecting the LLM calls made in the current context, innermost last.
+_active_recorders: ContextVar[tuple] = ContextVar("active_metrics_recorders", default=())
+
+@dataclass
+class CallRecord:
+    """Accounting for one LLMService call.
+
+    Attributes:
+        stage: The pipeline stage or analyzer that made the call (e.g. 'readability').
+        prompt_tokens: Prompt tokens billed, from the response usage metadata.
+        response_tokens: Response (candidate) tokens billed.
+        latency_seconds: Wall time of the call, including retries and rate limiting.
+        attempts: Number of API requests made (0 for a cache hit).
+        cache_hit: Whether the response was served from the response cache.
+        succeeded: Whether a response was obtained.
+    """
+    stage: str
+    prompt_tokens: int = 0
+    response_tokens: int = 0
+    latency_seconds: float = 0.0
+    attempts: int = 0
+    cache_hit: bool = False
+    succeeded: bool = True
+
+@dataclass
+class _StageTotals:
+    """Running totals of the calls made by one stage."""
+    calls: int = 0
+    cache_hits: int = 0
+    failed_calls: int = 0
+    retries: int = 0
+    prompt_tokens: int = 0
+    response_tokens: int = 0
+    latency_seconds: float = 0.0
+    max_latency_seconds: float = 0.0
+
+    def add(self, call: CallRecord):
+        self.calls += 1
+        self.cache_hits += call.cache_hit
+        self.failed_calls += not call.succeeded
+        self.retries += max(0, call.attempts - 1)
+        self.prompt_tokens += call.prompt_tokens
+        self.response_tokens += call.response_tokens
+        self.latency_seconds += call.latency_seconds
+        self.max_latency_seconds = max(self.max_latency_seconds, call.latency_seconds)
+
+    def merge(self, other: "_StageTotals"):
+        self.calls += other.calls
+        self.cache_hits += other.cache_hits
+        self.failed_calls += other.failed_calls
+        self.retries += other.retries
+        self.prompt_tokens += other.prompt_tokens
+        self.response_tokens += other.response_tokens
+        self.latency_seconds += other.latency_seconds
+        self.max_latency_seconds = max(self.max_latency_seconds, other.max_latency_seconds)
+
+class MetricsRecorder:
+    """Aggregates CallRecords per stage. Safe to share between threads.
+
+    Only running totals are kept, not the records themselves, so a long-lived
+    recorder (such as the server's LLMService.metrics) stays the same size and
+    summary() stays as cheap however many calls it has seen.
+    """
+
+    def __init__(self):
+        self._stages: dict[str, _StageTotals] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call: CallRecord):
+        """Adds one call record to the totals of its stage."""
+        with self._lock:
+            self._stages.setdefault(call.stage, _StageTotals()).add(call)
+
+    @contextmanager
+    def collect(self):
+        """Records every LLM call made inside this block into this recorder as well.
+
+        Calls made from threads started inside the block are included when the
+        thread runs in a copy of the caller's context (contextvars.copy_context()).
+        """
+        token = _active_recorders.set(_active_recorders.get() + (self,))
+        try:
+            yield self
+        finally:
+            _active_recorders.reset(token)
+
+    def summary(self) -> dict:
+        """Returns the totals of the recorded calls, overall and per stage.
+
+        Returns:
+            A dictionary with the totals (calls, cache hits, failed calls, retries,
+            prompt and response tokens, summed and maximum latency and the estimated
+            cost in USD, priced with config.LLM_PRICE_PER_MILLION_*_TOKENS) and the
+            same figures for each stage under "stages", most expensive first.
+        """
+        overall = _StageTotals()
+        with self._lock:
+            per_stage = {stage: _aggregate(stage_totals) for stage, stage_totals in self._stages.items()}
+            for stage_totals in self._stages.values():
+                overall.merge(stage_totals)
+        totals = _aggregate(overall)
+        totals["stages"] = dict(sorted(
+            per_stage.items(), key=lambda item: (-item[1]["estimated_cost_usd"], -item[1]["prompt_tokens"])
+        ))
+        return totals
+
+    def write_json(self, path: str, **extra):
+        """Writes the summary (plus any extra top-level keys) to a JSON file."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(dict(extra, **self.summary()), f, indent=2)
+
+def record_call(call: CallRecord, *recorders: MetricsRecorder):
+    """Adds a call record to the given recorders and to every recorder active in this context."""
+    for recorder in dict.fromkeys(recorders + _active_recorders.get()):
+        recorder.record(call)
+
+def current_metrics() -> MetricsRecorder | None:
+    """Returns the innermost recorder active in this context, if any."""
+    active = _active_recorders.get()
+    return active[-1] if active else None
+
+def collects_metrics(func):
+    """Decorator: records the LLM calls made while func runs in a new MetricsRecorder.
+
+    Inside func, the recorder is available from current_metrics(). Works on
+    coroutine functions too.
+    """
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with MetricsRecorder().collect():
+                return await func(*args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with MetricsRecorder().collect():
+            return func(*args, **kwargs)
+    return wrapper
+
+def _aggregate(totals: _StageTotals) -> dict:
+    cost = (totals.prompt_tokens * config.LLM_PRICE_PER_MILLION_PROMPT_TOKENS
+            + totals.response_tokens * config.LLM_PRICE_PER_MILLION_RESPONSE_TOKENS) / 1_000_000
+    return {
+        "calls": totals.calls,
+        "cache_hits": totals.cache_hits,
+        "failed_calls": totals.failed_calls,
+        "retries": totals.retries,
+        "prompt_tokens": totals.prompt_tokens,
+        "response_tokens": totals.response_tokens,
+        "latency_seconds": round(totals.latency_seconds, 3),
+        "max_latency_seconds": round(totals.max_latency_seconds, 3),
+        "estimated_cost_usd": round(cost, 6),
+    }
@@ -1,9 +1,70 @@
-from bs4 import BeautifulSoup
-import markdownify # Requires installation: pip install markdownify
+import hashlib
+import re
+from dataclasses import dataclass
+import config
+
+PARSER_BACKENDS = ("lxml", "html.parser")
+ARTICLE_BODY_CLASS = "article-body"
+NOISE_TAGS = ["script", "style", "header", "footer", "nav", "aside"]
+
+ATX_HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+CODE_FENCE_PATTERN = re.compile(r"^\s*(```|~~~)")
+
+@dataclass
+class Section:
+    """A heading-delimited section of a parsed Markdown document.
+
+    Attributes:
+        heading: The heading text, or "" for content before the first heading.
+        level: The heading level (1-6), or 0 for content before the first heading.
+        text: The full Markdown of the section, including its heading line.
+        content_hash: A hash of `text`, used to detect changed sections.
+    """
+    heading: str
+    level: int
+    text: str
+    content_hash: str
+
+def _has_article_body_class(class_value) -> bool:
+    # While straining, the class attribute is still the raw string, so a plain
+    # class_="article-body" would miss elements with several classes.
+    if not class_value:
+        return False
+    classes = class_value.split() if isinstance(class_value, str) else class_value
+    return ARTICLE_BODY_CLASS in classes
+
+def resolve_backend(backend: str | None = None) -> str:
+    """Returns the BeautifulSoup tree builder to use.
+
+    "auto" picks lxml when it is installed (it is several times faster than the
+    pure-Python parser) and falls back to Python's built-in html.parser.
+    """
+    from bs4.builder import builder_registry
+    backend = backend or config.HTML_PARSER_BACKEND
+    if backend == "auto":
+        return "lxml" if builder_registry.lookup("lxml") else "html.parser"
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown HTML parser backend '{backend}'. Choose from: auto, {', '.join(PARSER_BACKENDS)}")
+    if not builder_registry.lookup(backend):
+        raise ValueError(f"HTML parser backend '{backend}' is not installed.")
+    return backend
 
 class HTMLParser:
     """Parses HTML content to extract relevant text, preserving some structure."""
 
+    def __init__(self, backend: str | None = None):
+        """Initializes the HTMLParser.
+
+        Args:
+            backend: The BeautifulSoup tree builder ("lxml", "html.parser" or "auto").
+                     Defaults to config.HTML_PARSER_BACKEND.
+        """
+        # bs4 and markdownify are imported on first use, so runs that never parse
+        # HTML (e.g. when a previous report is reused) don't pay for loading them.
+        import markdownify
+        self.backend = resolve_backend(backend)
+        self.converter = markdownify.MarkdownConverter(heading_style="ATX")
+
     def parse(self, html_content: str) -> str:
         """Parses the HTML content and converts it to Markdown.
 
@@ -16,31 +77,76 @@ class HTMLParser:
         """
         if not html_content:
             return ""
-        
-        try:
-            # Use BeautifulSoup to initially parse the HTML
-            soup = BeautifulSoup(html_content, "html.parser")
+        from bs4 import BeautifulSoup, SoupStrainer
 
+        try:
             # --- Attempt to find the main content area (specific to help.moengage.com) ---
             # This often improves quality by removing headers, footers, nav bars.
             # Inspecting the MoEngage page, the main article seems to be within <article> tag
             # or a div with a specific class like 'article-body'. Let's try 'article-body'.
-            article_body = soup.find("div", class_="article-body")
-            
+            # Only the article subtree is built, so the rest of the page is never turned
+            # into tree objects.
+            article_body = None
+            if ARTICLE_BODY_CLASS in html_content:
+                strainer = SoupStrainer("div", class_=_has_article_body_class)
+                article_body = BeautifulSoup(html_content, self.backend, parse_only=strainer).find("div", class_=ARTICLE_BODY_CLASS)
+
             if article_body:
-                # Convert the relevant part to Markdown
-                # Use markdownify options for better formatting if needed
-                md = markdownify.markdownify(str(article_body), heading_style="ATX")
+                # Convert the parsed subtree directly, instead of serializing it and
+                # letting markdownify parse it again.
+                md = self.converter.convert_soup(article_body)
             else:
                 # Fallback: If specific content area isn't found, parse the whole body
                 print("Warning: Could not find specific article body. Parsing entire HTML body.")
+                soup = BeautifulSoup(html_content, self.backend)
                 # Exclude common noise tags if parsing the whole body
-                for tag in soup(["script", "style", "header", "footer", "nav", "aside"]):
+                for tag in soup(NOISE_TAGS):
                     tag.decompose()
-                md = markdownify.markdownify(str(soup.body), heading_style="ATX")
+                md = self.converter.convert_soup(soup.body or soup)
 
             return md.strip()
         except Exception as e:
             print(f"Error parsing HTML: {e}")
             return ""
 
+
+    def split_sections(self, markdown: str) -> list[Section]:
+        """Splits parsed Markdown into sections at ATX headings.
+
+        Headings inside fenced code blocks are ignored, and a heading with no
+        content of its own (e.g. a title directly followed by a subheading) is
+        kept with the next section. Each section carries a hash of its content so
+        unchanged sections can be recognized across runs.
+
+        Args:
+            markdown: Markdown produced by parse().
+
+        Returns:
+            The non-empty sections in document order.
+        """
+        sections = []
+        heading, level, lines = "", 0, []
+        carried_headings = []
+        in_code_block = False
+
+        def flush(final: bool = False):
+            body = "\n".join(lines[1:] if level else lines).strip()
+            if level and not body and not final:
+                carried_headings.append(lines[0])
+                return
+            text = "\n".join(carried_headings + lines).strip()
+            carried_headings.clear()
+            if text:
+                content_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+                sections.append(Section(heading, level, text, content_hash))
+
+        for line in markdown.splitlines():
+            if CODE_FENCE_PATTERN.match(line):
+                in_code_block = not in_code_block
+            match = None if in_code_block else ATX_HEADING_PATTERN.match(line)
+            if match:
+                flush()
+                heading, level, lines = match.group(2), len(match.group(1)), []
+            lines.append(line)
+        flush(final=True)
+        return sections
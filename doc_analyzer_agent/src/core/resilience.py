@@ -0,0 +1,217 @@
+# src/core/resilience.py
+import random
+import re
+import threading
+import time
+import asyncio
+
+RATE_LIMIT, TRANSIENT, PERMANENT = "rate_limit", "transient", "permanent"
+RETRY_AFTER_PATTERNS = (
+    re.compile(r"retry in ([\d.]+)\s*s", re.IGNORECASE),
+    re.compile(r"retry_delay\s*\{\s*seconds:\s*(\d+)", re.IGNORECASE),
+)
+MIN_RATE_SCALE = 0.1 # The limiter never slows down below this fraction of the configured rates
+
+def classify_error(error: Exception) -> str:
+    """Classifies an LLM API error by whether and how it should be retried.
+
+    Returns:
+        RATE_LIMIT for quota errors (HTTP 429 / resource exhausted), PERMANENT for
+        requests the API rejected (other 4xx, e.g. invalid argument or bad API key)
+        and TRANSIENT for everything else (5xx, timeouts, connection errors and
+        blocked or empty responses), which are worth retrying.
+    """
+    code = _status_code(error)
+    message = str(error).lower()
+    if code == 429 or "resource exhausted" in message or "resourceexhausted" in type(error).__name__.lower():
+        return RATE_LIMIT
+    if code is not None and 400 <= code < 500 and code != 408:
+        return PERMANENT
+    return TRANSIENT
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """Returns the delay the server asked for before retrying, if the error carries one."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if headers and headers.get("Retry-After"):
+        try:
+            return float(headers["Retry-After"])
+        except ValueError:
+            pass
+    for pattern in RETRY_AFTER_PATTERNS:
+        match = pattern.search(str(error))
+        if match:
+            return float(match.group(1))
+    return None
+
+def backoff_delay(attempt: int, base: float, maximum: float, retry_after: float | None = None) -> float:
+    """Exponential backoff with full jitter, honoring a server retry-after hint.
+
+    Args:
+        attempt: The zero-based number of the attempt that just failed.
+        base: Delay ceiling in seconds after the first failure; doubles per attempt.
+        maximum: Upper bound for the exponential ceiling.
+        retry_after: Delay requested by the server; the result is never shorter.
+
+    Returns:
+        The number of seconds to wait before the next attempt.
+    """
+    delay = random.uniform(0, min(maximum, base * 2 ** attempt))
+    if retry_after is not None:
+        delay = retry_after + random.uniform(0, base)
+    return delay
+
+def _status_code(error: Exception) -> int | None:
+    """Extracts an HTTP status code from an API exception, if it has one."""
+    for candidate in (getattr(error, "code", None), getattr(error, "status_code", None),
+                      getattr(getattr(error, "response", None), "status_code", None)):
+        if isinstance(candidate, int):
+            return candidate
+    return None
+
+class _TokenBucket:
+    """A token bucket that hands out reservations, so waiting happens outside the lock."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.base_rate = per_minute / 60
+        self.rate = self.base_rate
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Takes `amount` from the bucket and returns how long to wait until it is covered."""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+
+class RateLimiter:
+    """A shared, adaptive token-bucket limiter for requests and tokens per minute.
+
+    Every caller reserves one request and its estimated tokens before calling the
+    API and waits until the buckets cover the reservation, so concurrent threads
+    and coroutines together stay under the quota. When the API still reports a
+    rate limit, all callers pause until the retry-after time and the rates are
+    halved, then recover gradually with each successful call.
+    """
+
+    def __init__(self, requests_per_minute: float | None, tokens_per_minute: float | None):
+        """Initializes the RateLimiter.
+
+        Args:
+            requests_per_minute: Request quota; 0 or None disables the request bucket.
+            tokens_per_minute: Token quota; 0 or None disables the token bucket.
+        """
+        self.requests = _TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.scale = 1.0
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0):
+        """Blocks until one request with `tokens` estimated tokens may be sent."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self, tokens: int = 0):
+        """Async counterpart of acquire(); waits without blocking the event loop."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record_usage(self, token_difference: int):
+        """Corrects the token bucket once the actual token usage of a call is known."""
+        if self.tokens and token_difference:
+            with self._lock:
+                self.tokens.level -= token_difference
+
+    def on_success(self):
+        """Recovers the rates gradually after a successful call."""
+        if self.scale < 1.0:
+            with self._lock:
+                self._set_scale(min(1.0, self.scale + 0.05))
+
+    def on_rate_limited(self, pause_seconds: float):
+        """Pauses every caller for `pause_seconds` and halves the rates."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + pause_seconds)
+            self._set_scale(max(MIN_RATE_SCALE, self.scale / 2))
+
+    def _reserve(self, tokens: int) -> float:
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self.blocked_until - now)
+            if self.requests:
+                wait = max(wait, self.requests.reserve(1, now))
+            if self.tokens:
+                wait = max(wait, self.tokens.reserve(tokens, now))
+            return wait
+
+    def _set_scale(self, scale: float):
+        self.scale = scale
+        for bucket in (self.requests, self.tokens):
+            if bucket:
+                bucket.rate = bucket.base_rate * scale
+
+class CircuitBreaker:
+    """Stops calling a backend that keeps failing, then probes it again after a pause.
+
+    After `failure_threshold` consecutive transient failures the circuit opens and
+    every call fails immediately. Once `reset_seconds` have passed a single trial
+    call is let through (half-open); its success closes the circuit and its failure
+    opens it again. A trial that is cancelled must be released with release_trial().
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        """Initializes the CircuitBreaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit; 0 disables it.
+            reset_seconds: How long the circuit stays open before a trial call.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Returns whether a call may be made now."""
+        if not self.failure_threshold:
+            return True
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = "half-open"
+                self._trial_in_flight = False
+            if self.state == "half-open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return self.state == "closed"
+
+    def release_trial(self):
+        """Lets another caller make the trial call when a call ended without an outcome (e.g. it was cancelled)."""
+        with self._lock:
+            if self.state == "half-open":
+                self._trial_in_flight = False
+
+    def record_success(self):
+        """Closes the circuit and resets the failure count."""
+        with self._lock:
+            self.failures = 0
+            self.state = "closed"
+
+    def record_failure(self):
+        """Counts a failure, opening the circuit at the threshold or after a failed trial."""
+        if not self.failure_threshold:
+            return
+        with self._lock:
+            self.failures += 1
+            if self.state == "half-open" or (self.state == "closed" and self.failures >= self.failure_threshold):
+                print(f"Circuit breaker opened after {self.failures} consecutive LLM failures; "
+                      f"calls will fail fast for {self.reset_seconds} seconds.")
+                self.state = "open"
+                self.opened_at = time.monotonic()
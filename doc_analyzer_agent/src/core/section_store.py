@@ -0,0 +1,47 @@
+# src/core/section_store.py
+import hashlib
+import json
+import os
+import threading
+
+class SectionResultStore:
+    """An on-disk store of analyzer results for individual document sections.
+
+    Results are keyed by analyzer name, a variant string (e.g. the model name) and
+    the section's content hash, so a section that has not changed is never
+    analyzed twice, even if it moves within the document or appears in several
+    documents.
+    """
+
+    def __init__(self, directory: str):
+        """Initializes the SectionResultStore, creating the directory if needed.
+
+        Args:
+            directory: Directory to store the section results in.
+        """
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, analyzer_name: str, section_hash: str, variant: str = "") -> dict | None:
+        """Returns the stored result for a section, or None if it was never analyzed."""
+        try:
+            with open(self._path(analyzer_name, section_hash, variant), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read stored {analyzer_name} result for section {section_hash}: {e}")
+            return None
+
+    def put(self, analyzer_name: str, section_hash: str, result: dict, variant: str = ""):
+        """Stores an analyzer's result for a section."""
+        path = self._path(analyzer_name, section_hash, variant)
+        # Write to a temporary file first so concurrent readers never see a partial file.
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        os.replace(tmp_path, path)
+
+    def _path(self, analyzer_name: str, section_hash: str, variant: str) -> str:
+        key = hashlib.sha256(f"{analyzer_name}|{variant}|{section_hash}".encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, f"{analyzer_name}-{key}.json")
@@ -0,0 +1,154 @@
+# src/core/tracing.py
+import asyncio
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+# The tracer spans are recorded into, if tracing is enabled for the current context.
+_active_tracer: ContextVar["Tracer | None"] = ContextVar("active_tracer", default=None)
+
+@dataclass
+class Span:
+    """One timed operation.
+
+    Attributes:
+        name: What was timed (e.g. 'parse' or 'analyze:readability').
+        category: A coarse grouping ('document', 'stage' or 'analyzer').
+        start: Start time in seconds, relative to the tracer's creation.
+        duration: Duration in seconds.
+        track: The thread or asyncio task the span ran on, as a small integer.
+        args: Extra details shown with the span (e.g. the URL).
+    """
+    name: str
+    category: str
+    start: float
+    duration: float
+    track: int
+    args: dict = field(default_factory=dict)
+
+@contextmanager
+def span(name: str, category: str = "stage", **args):
+    """Times the enclosed block as a span on the active tracer; does nothing if tracing is off.
+
+    Spans follow the thread or asyncio task they run on, so concurrent documents and
+    analyzers appear on separate tracks. Worker threads see the active tracer when
+    they run in a copy of the caller's context (contextvars.copy_context()).
+    """
+    tracer = _active_tracer.get()
+    if tracer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        tracer.add_span(name, category, start, time.perf_counter(), args)
+
+class Tracer:
+    """Collects spans and exports them as a Chrome trace or a slowest-stages summary."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+        self._origin = time.perf_counter()
+        self._tracks = {} # thread ident or asyncio task -> (track number, name)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def activate(self):
+        """Records the spans of the enclosed block (and of the threads and tasks it starts)."""
+        token = _active_tracer.set(self)
+        try:
+            yield self
+        finally:
+            _active_tracer.reset(token)
+
+    def add_span(self, name: str, category: str, start: float, end: float, args: dict | None = None):
+        """Records a span from perf_counter() start and end times."""
+        key, track_name = self._current_track()
+        with self._lock:
+            if key not in self._tracks:
+                self._tracks[key] = (len(self._tracks) + 1, track_name)
+            track = self._tracks[key][0]
+            self.spans.append(Span(name, category, start - self._origin, end - start, track, dict(args or {})))
+
+    def export_chrome(self, path: str):
+        """Writes the spans as Chrome trace-event JSON (open it in https://ui.perfetto.dev or chrome://tracing)."""
+        with self._lock:
+            spans = list(self.spans)
+            tracks = list(self._tracks.values())
+        events = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "doc_analyzer_agent"}}]
+        events.extend(
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": track, "args": {"name": track_name}}
+            for track, track_name in tracks
+        )
+        events.extend(
+            {
+                "name": s.name,
+                "cat": s.category,
+                "ph": "X",
+                "ts": round(s.start * 1_000_000, 1),
+                "dur": round(s.duration * 1_000_000, 1),
+                "pid": 1,
+                "tid": s.track,
+                "args": s.args,
+            }
+            for s in sorted(spans, key=lambda s: s.start)
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+    def summary(self, top_n: int = 10) -> str:
+        """Summarizes the trace as plain text: time per stage and the slowest individual spans.
+
+        Args:
+            top_n: How many stages and spans to list.
+
+        Returns:
+            A text table of the stages with the most total time (count, total, mean,
+            95th percentile and max), the top_n slowest spans, and the average
+            number of documents in flight when several documents were traced.
+        """
+        with self._lock:
+            spans = list(self.spans)
+        if not spans:
+            return "No spans recorded."
+
+        by_name = {}
+        for s in spans:
+            by_name.setdefault(s.name, []).append(s.duration)
+        lines = [f"Slowest stages (by total time, top {top_n}):"]
+        lines.append(f"  {'stage':<32} {'count':>6} {'total s':>9} {'mean s':>8} {'p95 s':>8} {'max s':>8}")
+        for name, durations in sorted(by_name.items(), key=lambda item: -sum(item[1]))[:top_n]:
+            durations.sort()
+            p95 = durations[max(0, -(-len(durations) * 95 // 100) - 1)] # Nearest rank
+            lines.append(
+                f"  {name:<32} {len(durations):>6} {sum(durations):>9.3f} {sum(durations) / len(durations):>8.3f} "
+                f"{p95:>8.3f} {durations[-1]:>8.3f}"
+            )
+
+        lines.append(f"Slowest spans (top {top_n}):")
+        for s in sorted(spans, key=lambda s: -s.duration)[:top_n]:
+            label = s.args.get("url") or s.args.get("part")
+            detail = f" ({label})" if label else ""
+            lines.append(f"  {s.duration:>8.3f}s  {s.name}{detail}")
+
+        documents = [s for s in spans if s.category == "document"]
+        if len(documents) > 1:
+            wall = max(s.start + s.duration for s in documents) - min(s.start for s in documents)
+            busy = sum(s.duration for s in documents)
+            lines.append(f"Documents: {len(documents)} in {wall:.3f}s wall time, {busy / max(wall, 1e-9):.1f} in flight on average.")
+        return "\n".join(lines)
+
+    def _current_track(self) -> tuple:
+        """Identifies the asyncio task or thread the caller runs on."""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        if task is not None:
+            return task, task.get_name()
+        thread = threading.current_thread()
+        return thread.ident, thread.name
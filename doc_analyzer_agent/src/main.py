@@ -3,30 +3,259 @@
 
 import sys
 import os
+import argparse
+import asyncio
+import inspect
+import json
+import contextlib
+from collections.abc import Callable, Generator
+from dataclasses import dataclass
+from functools import partial
 
 # Add src directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from core.fetcher import fetch_html_content
+from core.fetcher import Fetcher, FetchResult, HTML_CACHE_MODES
 from core.parser import HTMLParser
 from core.llm_service import LLMService
+from core.cassette import Cassette, CassetteMissError
+from core.metrics import MetricsRecorder, collects_metrics, current_metrics
+from core.tracing import Tracer, span
 from analyzers.readability import ReadabilityAnalyzer
 from analyzers.structure_flow import StructureFlowAnalyzer
 from analyzers.completeness_examples import CompletenessExamplesAnalyzer
 from analyzers.style_adherence import StyleAdherenceAnalyzer
+from analyzers.combined import CombinedAnalyzer
+from analyzers.runner import run_analyzers, arun_analyzers, is_complete_result, analyzer_prompt_version
+from analyzers.piecewise import run_piecewise_analysis
+from core.section_store import SectionResultStore
+from core.checkpoint_store import CheckpointStore, DocumentCheckpoints, STAGES
+from core.chunker import chunk_markdown, estimate_tokens
 from processing.aggregator import aggregate_suggestions # Need to create this simple aggregator
 from processing.prioritizer import SuggestionPrioritizer
 from processing.grouper import SuggestionGrouper
-from processing.summary_generator import SummaryGenerator
+from processing.triage import SuggestionTriager
+from processing.summary_generator import SummaryGenerator, FALLBACK_SUMMARY_PREFIX
+from processing.rule_based import RuleBasedPrioritizer, RuleBasedGrouper, TemplateSummaryGenerator
 from reporting.formatter import ReportFormatter
 import config # To check if API key is set
+# Stages backed by NumPy (readability metrics, deduplication, local grouping and the
+# rule-based fast mode) are imported where they run, so that --help and runs that
+# reuse a previous report start quickly.
 
-def run_analysis(url: str):
-    """Runs the full documentation analysis pipeline for a given URL."""
+ANALYZER_MODES = ("separate", "combined", "fast")
+GROUPER_MODES = ("llm", "local", "local-named", "fused")
+
+@collects_metrics
+def run_analysis(
+    url: str,
+    cache_mode: str = "use",
+    analyzer_mode: str = config.ANALYZER_MODE,
+    incremental: bool = False,
+    max_chunk_tokens: int | None = config.CHUNK_MAX_TOKENS,
+    grouper_mode: str = config.GROUPER_MODE,
+    llm_service: LLMService | None = None,
+    cassette: Cassette | None = None,
+    fetcher: Fetcher | None = None,
+    html_cache_mode: str = "use",
+    html: str | None = None,
+    reuse_unchanged: bool = True,
+    checkpoint: bool = config.CHECKPOINT_ENABLED,
+    resume: bool = False,
+    rerun_from: str | None = None,
+    output_path: str | None = "analysis_report.md",
+    metrics_path: str | None = None,
+    print_report: bool = True,
+    details: dict | None = None
+) -> str | None:
+    """Runs the full documentation analysis pipeline for a given URL.
+
+    Args:
+        url: The URL of the documentation article to analyze.
+        cache_mode: LLM response cache mode ("use", "refresh" or "bypass").
+                    Ignored when `llm_service` is provided.
+        analyzer_mode: "separate" runs the four analyzers as concurrent LLM calls,
+                       "combined" sends the document once and asks for all four
+                       analyses in a single structured response, and "fast" uses
+                       local rules for every step, without any LLM calls.
+        incremental: Analyze the document section by section and reuse the stored
+                     results of sections that have not changed since a previous run.
+        max_chunk_tokens: Documents estimated to be longer than this many tokens are
+                          split into chunks at section boundaries, analyzed in parallel
+                          and the results merged (map-reduce). 0 or None disables it.
+        grouper_mode: "llm" groups suggestions into themes with an LLM call, "local"
+                      clusters them locally, and "local-named" clusters them locally
+                      and only asks the LLM to name the clusters. "fused" prioritizes and
+                      groups in a single LLM call. Ignored in fast mode.
+        llm_service: An existing LLMService to reuse (e.g. shared across a batch).
+                     A new one is created if omitted.
+        cassette: A Cassette to record the LLM calls to or replay them from (see
+                  core/cassette.py). Ignored when `llm_service` is provided.
+        fetcher: A long-lived Fetcher to reuse (e.g. shared across a batch). If
+                 omitted, one is created just for this URL.
+        html_cache_mode: HTML cache mode ("use", "cache-only" or "bypass").
+                         Ignored when `fetcher` is provided.
+        html: The page's HTML, if it is already at hand (e.g. submitted to the
+              analysis server). It is analyzed as is, `url` only labels the
+              report, and nothing is fetched or stored in the HTML cache.
+        reuse_unchanged: Reuse the previous report when the page has not been
+                         modified since it was last analyzed with the same model and options.
+        checkpoint: Save each stage's output after fetching (parsed Markdown,
+                    analyzer results, prioritized and grouped suggestions, summary)
+                    to the document's checkpoints in config.CHECKPOINT_DIR, keyed by
+                    a hash of the stage's inputs. Outputs of stages whose LLM calls
+                    failed, even partly, are not saved. Implied by `resume` and
+                    `rerun_from`.
+        resume: Reuse the checkpoint of every stage whose inputs are unchanged
+                instead of running it again. The page is always fetched (a cached
+                copy is revalidated with a conditional GET), so a changed page is
+                analyzed again, and the report is always formatted again.
+        rerun_from: Resume, but run this stage and every later one again (one of
+                    core.checkpoint_store.STAGES, e.g. "group" re-groups, re-summarizes
+                    and re-formats without re-analyzing).
+        output_path: File to save the report to, or None to skip saving.
+        metrics_path: File to save this document's LLM usage metrics to as JSON
+                      (calls, tokens, latency and estimated cost per stage), or None.
+        print_report: Whether to print the final report to the console.
+        details: A dictionary to fill with the structured results (executive
+                 summary, prioritized and grouped suggestions, analyzer results,
+                 statistics and LLM usage) for callers that need more than the
+                 Markdown. Left empty when a previous report is reused.
+
+    Returns:
+        The final report in Markdown, or None if the pipeline could not complete.
+    """
+    return _run_steps(_analysis_steps(
+        url=url,
+        cache_mode=cache_mode,
+        analyzer_mode=analyzer_mode,
+        incremental=incremental,
+        max_chunk_tokens=max_chunk_tokens,
+        grouper_mode=grouper_mode,
+        llm_service=llm_service,
+        cassette=cassette,
+        fetcher=fetcher,
+        html_cache_mode=html_cache_mode,
+        html=html,
+        reuse_unchanged=reuse_unchanged,
+        checkpoint=checkpoint,
+        resume=resume,
+        rerun_from=rerun_from,
+        output_path=output_path,
+        metrics_path=metrics_path,
+        print_report=print_report,
+        details=details
+    ))
+
+@collects_metrics
+async def arun_analysis(url: str, **kwargs) -> str | None:
+    """Async counterpart of run_analysis(), taking the same arguments.
+
+    The LLM-bound stages await the async entry points of the analyzers,
+    prioritizer, grouper, triager and summary generator (LLMService.aquery_llm),
+    so many documents can be analyzed concurrently on one event loop. Steps
+    without an async counterpart (fetching and piecewise analysis) run in worker
+    threads, and the local stages run inline.
+
+    Returns:
+        The final report in Markdown, or None if the pipeline could not complete.
+
+    Raises:
+        TypeError: If an argument is not one of run_analysis()'s.
+    """
+    arguments = inspect.signature(run_analysis).bind(url, **kwargs)
+    arguments.apply_defaults()
+    return await _arun_steps(_analysis_steps(**arguments.arguments))
+
+@dataclass
+class _Step:
+    """A blocking pipeline step, yielded by _analysis_steps() for a driver to run.
+
+    Attributes:
+        call: Runs the step and returns its result.
+        acall: Returns an awaitable of the same result, or None if the step has no
+               async counterpart (the async driver then runs `call` in a worker thread).
+    """
+    call: Callable
+    acall: Callable | None = None
+
+def _analyzers_step(analyzers: dict, parsed_content: str) -> _Step:
+    """The step that runs several analyzers concurrently (thread pool or event loop)."""
+    return _Step(
+        partial(run_analyzers, analyzers, parsed_content,
+                max_workers=config.ANALYZER_MAX_WORKERS, timeout=config.ANALYZER_TIMEOUT_SECONDS),
+        partial(arun_analyzers, analyzers, parsed_content, timeout=config.ANALYZER_TIMEOUT_SECONDS)
+    )
+
+def _run_steps(steps):
+    """Drives an _analysis_steps() generator, running each step it yields in this thread."""
+    result, error = None, None
+    while True:
+        try:
+            step = steps.throw(error) if error is not None else steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            result, error = step.call(), None
+        except Exception as e:
+            result, error = None, e
+
+async def _arun_steps(steps):
+    """Drives an _analysis_steps() generator, awaiting each step it yields."""
+    result, error = None, None
+    while True:
+        try:
+            step = steps.throw(error) if error is not None else steps.send(result)
+        except StopIteration as stop:
+            return stop.value
+        try:
+            result = await (step.acall() if step.acall is not None else asyncio.to_thread(step.call))
+            error = None
+        except Exception as e:
+            result, error = None, e
+
+def _analysis_steps(
+    url: str,
+    cache_mode: str,
+    analyzer_mode: str,
+    incremental: bool,
+    max_chunk_tokens: int | None,
+    grouper_mode: str,
+    llm_service: LLMService | None,
+    cassette: Cassette | None,
+    fetcher: Fetcher | None,
+    html_cache_mode: str,
+    html: str | None,
+    reuse_unchanged: bool,
+    checkpoint: bool,
+    resume: bool,
+    rerun_from: str | None,
+    output_path: str | None,
+    metrics_path: str | None,
+    print_report: bool,
+    details: dict | None
+) -> Generator[_Step, object, str | None]:
+    """The analysis pipeline shared by run_analysis() and arun_analysis().
+
+    Takes run_analysis()'s arguments. Every blocking step (fetching, the analyzer
+    calls and the LLM-backed stages) is yielded as a _Step, and the driver sends
+    back its result (or throws its exception), so the same pipeline runs
+    synchronously or on an event loop.
+    """
     print(f"Starting analysis for URL: {url}")
+    document_metrics = current_metrics() # Collects the LLM calls made for this document
+    if rerun_from is not None and rerun_from not in STAGES:
+        print(f"Error: Unknown stage '{rerun_from}'. Expected one of: {', '.join(STAGES)}.")
+        return
+    checkpoints = DocumentCheckpoints(
+        CheckpointStore(config.CHECKPOINT_DIR) if checkpoint or resume or rerun_from else None,
+        url, resume=resume, rerun_from=rerun_from
+    )
 
     # --- 0. Check API Key --- 
-    if not config.GEMINI_API_KEY:
+    fast_mode = analyzer_mode == "fast"
+    replaying = cassette is not None and cassette.mode == "replay"
+    if not fast_mode and llm_service is None and not replaying and not config.GEMINI_API_KEY:
         print("Error: GEMINI_API_KEY environment variable is not set.")
         print("Please set the environment variable before running.")
         print("Example: export GEMINI_API_KEY=\'YOUR_API_KEY\'")
@@ -34,16 +263,56 @@ def run_analysis(url: str):
 
     # --- 1. Fetch Content --- 
     print("\n--- Fetching Content ---")
-    html_content = fetch_html_content(url)
-    if not html_content:
+    # The page itself is not checkpointed: the HTML cache keeps it, and a resumed run
+    # revalidates it so that later stages are only reused while it is unchanged.
+    if html is not None:
+        fetch_result = FetchResult(url, html, "provided")
+    else:
+        with span("fetch", url=url):
+            owns_fetcher = fetcher is None
+            if owns_fetcher:
+                fetcher = Fetcher(cache_mode=html_cache_mode)
+            try:
+                fetch_result = yield _Step(partial(fetcher.fetch, url, revalidate=checkpoints.resume))
+            finally:
+                if owns_fetcher:
+                    fetcher.close()
+    if not fetch_result:
         print("Failed to fetch content. Exiting.")
         return
-    print("Content fetched successfully.")
+    html_content = fetch_result.html
+    print(f"Content fetched successfully (via {fetch_result.source}).")
+
+    # A report is only reused for a run with the same model and analysis options.
+    if fast_mode:
+        report_model = "fast"
+    else:
+        report_model = llm_service.model_name if llm_service is not None else config.GEMINI_MODEL_NAME
+    report_variant = json.dumps(
+        {"analyzer_mode": analyzer_mode, "incremental": incremental, "max_chunk_tokens": max_chunk_tokens or 0,
+         "grouper_mode": grouper_mode, "model": report_model, "dedup": config.DEDUP_ENABLED,
+         "readability_metrics_in_prompt": config.READABILITY_METRICS_IN_PROMPT},
+        sort_keys=True
+    )
+    if html is None and fetch_result.not_modified and reuse_unchanged and rerun_from is None and fetcher.html_cache:
+        previous_report = fetcher.html_cache.load_report(url, report_variant)
+        if previous_report:
+            print("Page not modified since it was last analyzed. Reusing the previous report.")
+            _output_report(previous_report, output_path, print_report)
+            return previous_report
 
     # --- 2. Parse Content --- 
     print("\n--- Parsing Content ---")
-    parser = HTMLParser()
-    parsed_content = parser.parse(html_content)
+    parse_key = CheckpointStore.hash_inputs(html_content, config.HTML_PARSER_BACKEND)
+    with span("parse"):
+        parser = HTMLParser()
+        parsed_content = checkpoints.load("parse", "markdown", parse_key)
+        if parsed_content is not None:
+            print("Resuming: using the checkpointed Markdown.")
+        else:
+            parsed_content = parser.parse(html_content)
+            if parsed_content:
+                checkpoints.save("markdown", parse_key, parsed_content)
     if not parsed_content:
         print("Failed to parse content or content is empty. Exiting.")
         return
@@ -54,83 +323,347 @@ def run_analysis(url: str):
 
     # --- 3. Initialize Services --- 
     print("\n--- Initializing Services ---")
-    try:
-        llm_service = LLMService()
-    except ValueError as e:
-        print(f"Error initializing LLM Service: {e}")
-        return
-        
-    readability_analyzer = ReadabilityAnalyzer(llm_service)
-    structure_analyzer = StructureFlowAnalyzer(llm_service)
-    completeness_analyzer = CompletenessExamplesAnalyzer(llm_service)
-    style_analyzer = StyleAdherenceAnalyzer(llm_service)
-    prioritizer = SuggestionPrioritizer(llm_service)
-    grouper = SuggestionGrouper(llm_service)
-    summary_gen = SummaryGenerator(llm_service)
+    triager = None
+    if fast_mode:
+        # Deterministic local rules only: no API key or network needed.
+        from analyzers.rule_based import rule_based_analyzers
+        analyzers = rule_based_analyzers()
+        prioritizer = RuleBasedPrioritizer()
+        grouper = RuleBasedGrouper()
+        summary_gen = TemplateSummaryGenerator()
+    else:
+        if llm_service is None:
+            try:
+                llm_service = LLMService(cache_mode=cache_mode, cassette=cassette)
+            except ValueError as e:
+                print(f"Error initializing LLM Service: {e}")
+                return
+
+        analyzers = {
+            "readability": ReadabilityAnalyzer(llm_service),
+            "structure_flow": StructureFlowAnalyzer(llm_service),
+            "completeness_examples": CompletenessExamplesAnalyzer(llm_service),
+            "style_adherence": StyleAdherenceAnalyzer(llm_service),
+        }
+        prioritizer = SuggestionPrioritizer(llm_service)
+        if grouper_mode == "fused":
+            triager = SuggestionTriager(llm_service)
+        elif grouper_mode == "llm":
+            grouper = SuggestionGrouper(llm_service)
+        else:
+            from processing.local_grouper import LocalSuggestionGrouper
+            grouper = LocalSuggestionGrouper(llm_service, name_with_llm=grouper_mode == "local-named")
+        summary_gen = SummaryGenerator(llm_service)
     formatter = ReportFormatter()
+    model_name = None if fast_mode else llm_service.model_name
     print("Services initialized.")
 
     # --- 4. Run Analyzers --- 
     print("\n--- Running Analyzers ---")
-    analysis_results = {}
-    analysis_results["readability"] = readability_analyzer.analyze(parsed_content)
-    print("Readability analysis complete.")
-    analysis_results["structure_flow"] = structure_analyzer.analyze(parsed_content)
-    print("Structure/Flow analysis complete.")
-    analysis_results["completeness_examples"] = completeness_analyzer.analyze(parsed_content)
-    print("Completeness/Examples analysis complete.")
-    analysis_results["style_adherence"] = style_analyzer.analyze(parsed_content)
-    print("Style Adherence analysis complete.")
+    analysis_stats = {}
+    combined_analyzer = CombinedAnalyzer(llm_service) if analyzer_mode == "combined" else None
+    # Checkpoints are only reused for the same model and the same analyzer prompts.
+    prompt_versions = [analyzer_prompt_version(a) for a in [*analyzers.values(), combined_analyzer] if a is not None]
+    analysis_key = CheckpointStore.hash_inputs(parsed_content, analyzer_mode, incremental, max_chunk_tokens or 0, model_name,
+                                               prompt_versions)
+    stored_results = {}
+    for name in analyzers:
+        result = checkpoints.load("analyze", f"analysis-{name}", analysis_key)
+        if result is not None:
+            stored_results[name] = result
+    stored_stats = checkpoints.load("analyze", "analysis-stats", analysis_key)
+    with span("analyze"):
+        document_tokens = estimate_tokens(parsed_content)
+        chunked = not fast_mode and max_chunk_tokens and document_tokens > max_chunk_tokens
+        missing = [name for name in analyzers if name not in stored_results]
+        if not missing and stored_stats is not None:
+            print("Resuming: using the checkpointed results of all analyzers.")
+            analysis_results, analysis_stats = stored_results, stored_stats
+        elif stored_results and not incremental and not chunked and combined_analyzer is None:
+            # Separate analyzer calls: only the analyzers without a checkpoint (e.g. the
+            # ones that failed last time) run again.
+            print(f"Resuming: using the checkpointed results of {len(stored_results)} analyzers; running {', '.join(missing)}.")
+            fresh_results = yield _analyzers_step({name: analyzers[name] for name in missing}, parsed_content)
+            analysis_results = {name: stored_results.get(name) or fresh_results[name] for name in analyzers}
+        elif incremental:
+            sections = parser.split_sections(parsed_content)
+            analysis_results, analysis_stats["Incremental Analysis"] = yield _Step(partial(
+                run_piecewise_analysis,
+                analyzers,
+                sections,
+                SectionResultStore(config.SECTION_STORE_DIR),
+                variant=analyzer_mode if fast_mode else f"{model_name}|{analyzer_mode}",
+                combined_analyzer=combined_analyzer,
+                max_workers=config.ANALYZER_MAX_WORKERS,
+                timeout=config.ANALYZER_TIMEOUT_SECONDS
+            ))
+        elif chunked:
+            # Map: analyze each chunk in parallel. Reduce: merge the per-chunk results
+            # and drop suggestions repeated across chunks.
+            chunks = chunk_markdown(parsed_content, max_chunk_tokens, parser)
+            print(f"Document is ~{document_tokens} tokens; analyzing it in {len(chunks)} chunks of at most ~{max_chunk_tokens} tokens.")
+            analysis_results, chunk_stats = yield _Step(partial(
+                run_piecewise_analysis,
+                analyzers,
+                chunks,
+                combined_analyzer=combined_analyzer,
+                max_workers=config.ANALYZER_MAX_WORKERS,
+                timeout=config.ANALYZER_TIMEOUT_SECONDS,
+                deduplicate=True
+            ))
+            analysis_stats["Chunking"] = {
+                "estimated_document_tokens": document_tokens,
+                "token_budget_per_chunk": max_chunk_tokens,
+                "chunks": chunk_stats["parts"],
+                "largest_chunk_tokens": max(chunk.token_estimate for chunk in chunks),
+                "duplicate_suggestions_removed": chunk_stats["duplicate_suggestions_removed"],
+            }
+        elif combined_analyzer is not None:
+            analysis_results = yield _Step(partial(combined_analyzer.analyze, parsed_content),
+                                           partial(combined_analyzer.aanalyze, parsed_content))
+        else:
+            analysis_results = yield _analyzers_step(analyzers, parsed_content)
+    # Failed analyzers (or ones with failed sections or chunks) are not checkpointed,
+    # so a resumed run retries just those.
+    for name, result in analysis_results.items():
+        if name not in stored_results and is_complete_result(result):
+            checkpoints.save(f"analysis-{name}", analysis_key, result)
+    checkpoints.save("analysis-stats", analysis_key, analysis_stats)
     print("All analyzers finished.")
+    # Computed locally over the whole document, whichever way it was analyzed.
+    with span("readability_metrics"):
+        from analyzers.readability_metrics import compute_readability_metrics
+        analysis_results["readability"]["metrics"] = compute_readability_metrics(parsed_content)
 
     # --- 5. Aggregate Suggestions --- 
     print("\n--- Aggregating Suggestions ---")
-    all_suggestions = aggregate_suggestions(analysis_results)
-    print(f"Aggregated {len(all_suggestions)} suggestions.")
+    with span("aggregate"):
+        all_suggestions = aggregate_suggestions(analysis_results)
+        print(f"Aggregated {len(all_suggestions)} suggestions.")
+        if config.DEDUP_ENABLED and all_suggestions:
+            from processing.deduplicator import deduplicate_suggestions
+            all_suggestions, analysis_stats["Suggestion Deduplication"] = deduplicate_suggestions(all_suggestions)
+            print(f"Merged {analysis_stats['Suggestion Deduplication']['near_duplicates_merged']} near-duplicate suggestions.")
 
-    # --- 6. Prioritize Suggestions --- 
-    print("\n--- Prioritizing Suggestions ---")
-    prioritized_suggestions = prioritizer.prioritize(all_suggestions)
-    print("Suggestions prioritized.")
+    prioritize_key = CheckpointStore.hash_inputs(all_suggestions, triager is not None, model_name)
+    if triager is not None:
+        # --- 6-7. Prioritize and Group Suggestions in one call ---
+        print("\n--- Prioritizing and Grouping Suggestions ---")
+        with span("triage"):
+            prioritized_suggestions = checkpoints.load("prioritize", "prioritized", prioritize_key)
+            grouped_suggestions = checkpoints.load("group", "grouped", prioritize_key)
+            if prioritized_suggestions is not None and grouped_suggestions is not None:
+                print("Resuming: using the checkpointed prioritized and grouped suggestions.")
+            else:
+                with MetricsRecorder().collect() as stage_metrics:
+                    prioritized_suggestions, grouped_suggestions = yield _Step(partial(triager.triage, all_suggestions),
+                                                                                partial(triager.atriage, all_suggestions))
+                succeeded = _stage_succeeded(stage_metrics) and _all_scored(prioritized_suggestions)
+                checkpoints.save("prioritized", prioritize_key, prioritized_suggestions, succeeded)
+                checkpoints.save("grouped", prioritize_key, grouped_suggestions, succeeded)
+        print("Suggestions prioritized and grouped thematically.")
+    else:
+        # --- 6. Prioritize Suggestions --- 
+        print("\n--- Prioritizing Suggestions ---")
+        with span("prioritize"):
+            prioritized_suggestions = checkpoints.load("prioritize", "prioritized", prioritize_key)
+            if prioritized_suggestions is not None:
+                print("Resuming: using the checkpointed prioritized suggestions.")
+            else:
+                with MetricsRecorder().collect() as stage_metrics:
+                    prioritized_suggestions = yield _Step(partial(prioritizer.prioritize, all_suggestions),
+                                                          partial(prioritizer.aprioritize, all_suggestions))
+                checkpoints.save("prioritized", prioritize_key, prioritized_suggestions,
+                                 _stage_succeeded(stage_metrics) and _all_scored(prioritized_suggestions))
+        print("Suggestions prioritized.")
 
-    # --- 7. Group Suggestions --- 
-    print("\n--- Grouping Suggestions ---")
-    grouped_suggestions = grouper.group(prioritized_suggestions)
-    print("Suggestions grouped thematically.")
+        # --- 7. Group Suggestions --- 
+        print("\n--- Grouping Suggestions ---")
+        group_key = CheckpointStore.hash_inputs(prioritized_suggestions, grouper_mode, model_name)
+        with span("group"):
+            grouped_suggestions = checkpoints.load("group", "grouped", group_key)
+            if grouped_suggestions is not None:
+                print("Resuming: using the checkpointed suggestion groups.")
+            else:
+                with MetricsRecorder().collect() as stage_metrics:
+                    grouped_suggestions = yield _Step(partial(grouper.group, prioritized_suggestions),
+                                                      partial(grouper.agroup, prioritized_suggestions))
+                checkpoints.save("grouped", group_key, grouped_suggestions, _stage_succeeded(stage_metrics))
+        print("Suggestions grouped thematically.")
 
     # --- 8. Generate Summary --- 
     print("\n--- Generating Summary ---")
-    executive_summary = summary_gen.generate(analysis_results, grouped_suggestions)
+    summary_key = CheckpointStore.hash_inputs(analysis_results, grouped_suggestions, model_name)
+    with span("summarize"):
+        executive_summary = checkpoints.load("summarize", "summary", summary_key)
+        if executive_summary is not None:
+            print("Resuming: using the checkpointed executive summary.")
+        else:
+            with MetricsRecorder().collect() as stage_metrics:
+                executive_summary = yield _Step(partial(summary_gen.generate, analysis_results, grouped_suggestions),
+                                                partial(summary_gen.agenerate, analysis_results, grouped_suggestions))
+            checkpoints.save("summary", summary_key, executive_summary,
+                             _stage_succeeded(stage_metrics) and not executive_summary.startswith(FALLBACK_SUMMARY_PREFIX))
     print("Executive summary generated.")
 
     # --- 9. Format Report --- 
     print("\n--- Formatting Report ---")
-    final_report = formatter.format_report(
-        url=url,
-        analysis_results=analysis_results,
-        prioritized_suggestions=prioritized_suggestions,
-        grouped_suggestions=grouped_suggestions,
-        executive_summary=executive_summary
-    )
+    with span("format"):
+        final_report = formatter.format_report(
+            url=url,
+            analysis_results=analysis_results,
+            prioritized_suggestions=prioritized_suggestions,
+            grouped_suggestions=grouped_suggestions,
+            executive_summary=executive_summary,
+            fetch_source=fetch_result.source,
+            analysis_stats=analysis_stats,
+            llm_usage=document_metrics.summary()
+        )
     print("Report formatted.")
 
+    cache_stats = llm_service.cache_stats() if llm_service else None
+    if cache_stats:
+        print(f"LLM response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['entries']} entries stored.")
+
+    if html is None and fetcher.html_cache:
+        fetcher.html_cache.store_report(url, final_report, report_variant)
+    if details is not None:
+        details.update({
+            "url": url,
+            "fetch_source": fetch_result.source,
+            "executive_summary": executive_summary,
+            "prioritized_suggestions": prioritized_suggestions,
+            "grouped_suggestions": grouped_suggestions,
+            "analysis_results": analysis_results,
+            "analysis_stats": analysis_stats,
+            "llm_usage": document_metrics.summary(),
+        })
+
+    if metrics_path:
+        document_metrics.write_json(metrics_path, url=url)
+        print(f"LLM usage metrics saved to: {os.path.abspath(metrics_path)}")
+
     # --- 10. Output Report --- 
-    print("\n--- Final Report ---")
-    print(final_report)
+    _output_report(final_report, output_path, print_report)
+    return final_report
+
+def _stage_succeeded(stage_metrics: MetricsRecorder) -> bool:
+    """Checks that none of the LLM calls recorded for a stage failed."""
+    return stage_metrics.summary()["failed_calls"] == 0
+
+def _all_scored(prioritized_suggestions: list[dict]) -> bool:
+    """Checks that the prioritizer scored every suggestion."""
+    return all(s.get("impact") != "N/A" for s in prioritized_suggestions)
+
+def _output_report(final_report: str, output_path: str | None, print_report: bool):
+    """Prints the report and/or saves it to a file."""
+    if print_report:
+        print("\n--- Final Report ---")
+        print(final_report)
 
     # Optionally save to file
-    output_filename = "analysis_report.md"
-    try:
-        with open(output_filename, "w", encoding="utf-8") as f:
-            f.write(final_report)
-        print(f"\nReport also saved to: {os.path.abspath(output_filename)}")
-    except IOError as e:
-        print(f"\nError saving report to file: {e}")
+    if output_path:
+        try:
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(final_report)
+            print(f"\nReport also saved to: {os.path.abspath(output_path)}")
+        except IOError as e:
+            print(f"\nError saving report to file: {e}")
 
-if __name__ == "__main__":
-    target_url = "https://help.moengage.com/hc/en-us/articles/19708702327572-Raise-a-Support-Ticket-Through-MoEngage-Dashboard"
-    if len(sys.argv) > 1:
-        target_url = sys.argv[1] # Allow overriding URL via command line argument
-    
-    run_analysis(target_url)
+DEFAULT_URL = "https://help.moengage.com/hc/en-us/articles/19708702327572-Raise-a-Support-Ticket-Through-MoEngage-Dashboard"
+
+def add_analysis_arguments(arg_parser: argparse.ArgumentParser):
+    """Adds the pipeline options shared by the single-URL and batch commands."""
+    cache_group = arg_parser.add_mutually_exclusive_group()
+    cache_group.add_argument("--no-cache", dest="cache_mode", action="store_const", const="bypass",
+                             help="Bypass the LLM response cache entirely.")
+    cache_group.add_argument("--refresh-cache", dest="cache_mode", action="store_const", const="refresh",
+                             help="Ignore cached LLM responses but store the new ones.")
+    arg_parser.set_defaults(cache_mode="use")
+    arg_parser.add_argument("--analyzer-mode", choices=ANALYZER_MODES, default=config.ANALYZER_MODE,
+                            help="separate: one LLM call per analyzer; combined: all four analyses in one LLM call; "
+                                 "fast: local rules only, with no LLM calls.")
+    arg_parser.add_argument("--incremental", action="store_true",
+                            help="Analyze section by section, re-analyzing only sections that changed since a previous run.")
+    arg_parser.add_argument("--max-chunk-tokens", type=int, default=config.CHUNK_MAX_TOKENS,
+                            help="Split documents estimated above this many tokens into chunks analyzed in parallel (0 disables).")
+    arg_parser.add_argument("--grouper-mode", choices=GROUPER_MODES, default=config.GROUPER_MODE,
+                            help="Group suggestions into themes with the LLM, by local clustering, by local clustering with LLM-named themes, "
+                                 "or together with prioritization in a single LLM call (fused).")
+    arg_parser.add_argument("--html-cache", dest="html_cache_mode", choices=HTML_CACHE_MODES, default="use",
+                            help="Use the HTML cache with revalidation, serve only cached pages (offline), or bypass it.")
+    arg_parser.add_argument("--reanalyze", dest="reuse_unchanged", action="store_false",
+                            help="Analyze pages even if they have not changed since their last report.")
+    arg_parser.add_argument("--checkpoint", action="store_true", default=config.CHECKPOINT_ENABLED,
+                            help="Save each stage's output as a checkpoint, so an interrupted or failed run can be resumed.")
+    arg_parser.add_argument("--resume", action="store_true",
+                            help="Reuse the checkpointed output of every stage whose inputs are unchanged (e.g. after a crash); "
+                                 "the page is revalidated first, so a changed page is analyzed again.")
+    arg_parser.add_argument("--rerun-from", choices=STAGES, default=None, metavar="STAGE",
+                            help=f"Resume, but run this stage and all later ones again ({', '.join(STAGES)}); "
+                                 "e.g. 'group' re-groups, re-summarizes and re-formats without re-analyzing.")
+    cassette_group = arg_parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record-llm", dest="record_path", metavar="CASSETTE",
+                                help="Record every LLM prompt and response to this cassette file.")
+    cassette_group.add_argument("--replay-llm", dest="replay_path", metavar="CASSETTE",
+                                help="Answer LLM calls from this cassette without network access; "
+                                     "fails on any prompt that was not recorded.")
+    arg_parser.add_argument("--replay-latency", type=float, default=0.0, metavar="SCALE",
+                            help="When replaying, wait this multiple of each call's recorded latency (0 = no delay, 1 = as recorded).")
+
+def analysis_options(args: argparse.Namespace) -> dict:
+    """Extracts the run_analysis keyword arguments from parsed command-line arguments."""
+    return {
+        "analyzer_mode": args.analyzer_mode,
+        "incremental": args.incremental,
+        "max_chunk_tokens": args.max_chunk_tokens,
+        "grouper_mode": args.grouper_mode,
+        "reuse_unchanged": args.reuse_unchanged,
+        "checkpoint": args.checkpoint,
+        "resume": args.resume,
+        "rerun_from": args.rerun_from,
+    }
+
+def cassette_from_args(args: argparse.Namespace) -> Cassette | None:
+    """Creates the record or replay cassette requested on the command line, if any.
+
+    Raises:
+        ValueError: If the cassette to replay does not exist.
+    """
+    if args.record_path:
+        return Cassette(args.record_path, "record")
+    if args.replay_path:
+        return Cassette(args.replay_path, "replay", latency_scale=args.replay_latency)
+    return None
 
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parses the command-line arguments."""
+    arg_parser = argparse.ArgumentParser(description="Analyze a documentation article and generate an improvement report.")
+    arg_parser.add_argument("url", nargs="?", default=DEFAULT_URL, help="URL of the article to analyze.")
+    arg_parser.add_argument("--metrics-json", dest="metrics_path", default=None,
+                            help="Save the LLM usage metrics (tokens, latency and estimated cost per stage) to this JSON file.")
+    arg_parser.add_argument("--trace", dest="trace_path", default=None,
+                            help="Time each pipeline stage and save a Chrome trace (viewable in Perfetto) to this JSON file.")
+    add_analysis_arguments(arg_parser)
+    return arg_parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        cassette = cassette_from_args(args)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    tracer = Tracer()
+    try:
+        with tracer.activate() if args.trace_path else contextlib.nullcontext():
+            with span("document", category="document", url=args.url):
+                run_analysis(args.url, cache_mode=args.cache_mode, html_cache_mode=args.html_cache_mode,
+                             metrics_path=args.metrics_path, cassette=cassette, **analysis_options(args))
+    except CassetteMissError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    if args.trace_path:
+        tracer.export_chrome(args.trace_path)
+        print(f"\n--- Trace Summary ---\n{tracer.summary(config.TRACE_TOP_N)}")
+        print(f"Trace saved to: {os.path.abspath(args.trace_path)}")
@@ -0,0 +1,147 @@
+# src/processing/deduplicator.py
+import re
+import zlib
+import numpy as np
+import config
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+QUOTE_PATTERN = re.compile(r"[\"\u201c]([^\"\u201d]+)[\"\u201d]")
+STOPWORDS = frozenset(
+    "a an the and or of to in on for with by as at from this that these those is are be it its "
+    "consider please could should would may might can will your you their".split()
+)
+SUFFIXES = ("ations", "ation", "ings", "ing", "ies", "ied", "ed", "es", "ly", "s")
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = np.uint64((1 << 32) - 1)
+
+def deduplicate_suggestions(all_suggestions: list[dict], threshold: float = config.DEDUP_SIMILARITY_THRESHOLD) -> tuple[list[dict], dict]:
+    """Merges near-duplicate suggestions, keeping every contributing source.
+
+    Suggestions are compared by the Jaccard similarity of their word shingles
+    (stopwords removed, crudely stemmed), and are never merged if they quote
+    different passages. Candidate pairs are found with MinHash
+    locality-sensitive hashing, so the cost grows roughly linearly with the
+    number of suggestions, and are then confirmed with the exact similarity.
+
+    Args:
+        all_suggestions: Suggestion dictionaries from aggregate_suggestions().
+        threshold: Minimum Jaccard similarity (0-1) for two suggestions to be merged.
+
+    Returns:
+        A (suggestions, stats) tuple. Each group of near-duplicates is replaced by
+        its first suggestion, with 'source' listing every contributing source and
+        'merged_suggestions' holding the texts that were merged into it. stats has
+        the number of suggestions before and after, and how many were merged.
+    """
+    shingle_sets = [_shingles(s.get("suggestion", "")) for s in all_suggestions]
+    citations = [_citation(s.get("suggestion", "")) for s in all_suggestions]
+    parent = list(range(len(all_suggestions)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in _candidate_pairs(shingle_sets):
+        root_i, root_j = find(i), find(j)
+        if root_i != root_j and _jaccard(shingle_sets[i], shingle_sets[j]) >= threshold and not (
+            # Suggestions quoting different passages are about different places in the document.
+            citations[i] and citations[j] and _jaccard(citations[i], citations[j]) < threshold
+        ):
+            # The earlier suggestion stays the representative of the group.
+            parent[max(root_i, root_j)] = min(root_i, root_j)
+
+    groups = {}
+    for i in range(len(all_suggestions)):
+        groups.setdefault(find(i), []).append(i)
+
+    deduplicated = []
+    for root in sorted(groups):
+        members = [all_suggestions[i] for i in groups[root]]
+        representative = members[0]
+        if len(members) > 1:
+            sources = []
+            for member in members:
+                for source in str(member.get("source", "Unknown")).split(", "):
+                    if source not in sources:
+                        sources.append(source)
+            representative["source"] = ", ".join(sources)
+            representative["merged_suggestions"] = [m.get("suggestion", "") for m in members[1:]]
+        deduplicated.append(representative)
+
+    stats = {
+        "suggestions_before": len(all_suggestions),
+        "suggestions_after": len(deduplicated),
+        "near_duplicates_merged": len(all_suggestions) - len(deduplicated),
+    }
+    return deduplicated, stats
+
+def content_tokens(text: str) -> list[str]:
+    """Returns the stemmed words of a text, without stopwords, in order."""
+    return [stem(t) for t in TOKEN_PATTERN.findall(text.lower()) if t not in STOPWORDS]
+
+def _shingles(text: str) -> frozenset:
+    """Returns the stemmed content words of a text plus their adjacent pairs."""
+    tokens = content_tokens(text)
+    return frozenset(tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])])
+
+def _citation(text: str) -> frozenset:
+    """Returns the shingles of the longest quoted passage in a suggestion, if any."""
+    quotes = QUOTE_PATTERN.findall(text)
+    return _shingles(max(quotes, key=len)) if quotes else frozenset()
+
+def stem(token: str) -> str:
+    for suffix in SUFFIXES:
+        if len(token) > len(suffix) + 2 and token.endswith(suffix):
+            token = token[:-len(suffix)]
+            break
+    # "define" and "defining" both become "defin".
+    return token[:-1] if len(token) > 4 and token.endswith("e") else token
+
+def _jaccard(a: frozenset, b: frozenset) -> float:
+    # Suggestions with too little text to shingle are never considered duplicates.
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def _candidate_pairs(shingle_sets: list[frozenset]) -> set[tuple[int, int]]:
+    """Finds pairs of sets likely to be similar, using MinHash signatures and LSH banding."""
+    bands, rows = config.DEDUP_MINHASH_BANDS, config.DEDUP_MINHASH_ROWS
+    signatures = _minhash_signatures(shingle_sets, bands * rows)
+    pairs = set()
+    for band in range(bands):
+        buckets = {}
+        band_rows = signatures[:, band * rows:(band + 1) * rows]
+        for i, key in enumerate(map(bytes, band_rows)):
+            buckets.setdefault(key, []).append(i)
+        for members in buckets.values():
+            # Pair each member with the first and with its predecessor rather than
+            # with every other member, so a large bucket stays linear.
+            for k in range(1, len(members)):
+                pairs.add((members[0], members[k]))
+                pairs.add((members[k - 1], members[k]))
+    return pairs
+
+def _minhash_signatures(shingle_sets: list[frozenset], num_permutations: int, block_size: int = 2048) -> np.ndarray:
+    """Computes a MinHash signature (one row per set), vectorized over blocks of sets."""
+    signatures = np.full((len(shingle_sets), num_permutations), MAX_HASH, dtype=np.uint64)
+    rng = np.random.default_rng(config.DEDUP_MINHASH_SEED)
+    a = rng.integers(1, 1 << 31, size=num_permutations, dtype=np.uint64)
+    b = rng.integers(0, 1 << 31, size=num_permutations, dtype=np.uint64)
+    for block_start in range(0, len(shingle_sets), block_size):
+        block = shingle_sets[block_start:block_start + block_size]
+        lengths = np.array([len(s) for s in block], dtype=np.int64)
+        if not lengths.sum():
+            continue
+        hashes = np.fromiter(
+            (zlib.crc32(shingle.encode("utf-8")) for shingles in block for shingle in shingles),
+            dtype=np.uint64, count=int(lengths.sum())
+        )
+        # (a * x + b) mod p stays below 2**64 because a, b < 2**31 and x < 2**32.
+        permuted = ((hashes[:, None] * a[None, :] + b[None, :]) % np.uint64(MERSENNE_PRIME)) & MAX_HASH
+        non_empty = lengths > 0
+        starts = (np.cumsum(lengths) - lengths)[non_empty]
+        rows = block_start + np.flatnonzero(non_empty)
+        signatures[rows] = np.minimum.reduceat(permuted, starts, axis=0)
+    return signatures
@@ -22,6 +22,29 @@ class SuggestionGrouper:
             print("No suggestions provided for grouping.")
             return {}
 
+        prompt, suggestion_map_by_id = self._build_prompt(prioritized_suggestions)
+
+        print("--- Sending grouping prompt to LLM ---")
+        # Removed expect_json=True
+        llm_response_raw = self.llm_service.query_llm(prompt, stage="grouper")
+        print("--- Received LLM grouping response ---")
+        return self._process_response(prioritized_suggestions, suggestion_map_by_id, llm_response_raw)
+
+    async def agroup(self, prioritized_suggestions: list[dict]) -> dict:
+        """Async counterpart of group(), returning the same result structure."""
+        if not prioritized_suggestions:
+            print("No suggestions provided for grouping.")
+            return {}
+
+        prompt, suggestion_map_by_id = self._build_prompt(prioritized_suggestions)
+
+        print("--- Sending async grouping prompt to LLM ---")
+        llm_response_raw = await self.llm_service.aquery_llm(prompt, stage="grouper")
+        print("--- Received LLM grouping response ---")
+        return self._process_response(prioritized_suggestions, suggestion_map_by_id, llm_response_raw)
+
+    def _build_prompt(self, prioritized_suggestions: list[dict]) -> tuple[str, dict]:
+        """Builds the grouping prompt and the map from prompt IDs to suggestions."""
         suggestion_map_by_id = {}
         suggestions_for_prompt = []
         for i, s in enumerate(prioritized_suggestions):
@@ -50,18 +73,18 @@ Example output format:
   "User Experience": ["sugg_2", "sugg_3", "sugg_5"]
 }}
 """
+        return prompt, suggestion_map_by_id
 
-        print("--- Sending grouping prompt to LLM ---")
-        # Removed expect_json=True
-        llm_response_raw = self.llm_service.query_llm(prompt)
-        print("--- Received LLM grouping response ---")
-
+    def _process_response(self, prioritized_suggestions: list[dict], suggestion_map_by_id: dict, llm_response_raw: dict | list | str | None) -> dict:
+        """Turns the LLM's theme -> IDs response into theme -> suggestions, with fallbacks."""
         grouped_suggestions_dict = {}
         processed_ids = set()
         raw_grouped_ids = None
 
-        # Manually parse the JSON response
-        if llm_response_raw and isinstance(llm_response_raw, str):
+        # LLMService already returns parsed JSON when it can; otherwise parse manually
+        if isinstance(llm_response_raw, dict):
+            raw_grouped_ids = llm_response_raw
+        elif llm_response_raw and isinstance(llm_response_raw, str):
             try:
                 # Clean potential markdown code fences
                 cleaned_response = re.sub(r"^```json\n?|\n?```$", "", llm_response_raw.strip(), flags=re.MULTILINE)
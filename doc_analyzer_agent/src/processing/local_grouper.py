@@ -0,0 +1,216 @@
+# src/processing/local_grouper.py
+from collections import Counter
+import numpy as np
+from core.llm_service import LLMService
+from processing.deduplicator import TOKEN_PATTERN, STOPWORDS, stem
+import config
+
+OTHER_THEME = "Other Suggestions"
+# Words that say what to do rather than what the suggestion is about; they make poor theme labels.
+GENERIC_LABEL_WORDS = frozenset(
+    "add use make ensure improve provide include remove replace rewrite avoid explain start split break "
+    "article section text content page document more better clear user users reader readers".split()
+)
+
+class LocalSuggestionGrouper:
+    """Groups suggestions into themes locally by clustering their TF-IDF vectors.
+
+    A drop-in alternative to SuggestionGrouper that needs no LLM round trip for
+    the grouping itself. Themes are labeled with the most characteristic words of
+    each cluster; optionally the LLM is asked only to name the clusters, with a
+    much smaller prompt than full grouping.
+    """
+
+    def __init__(self, llm_service: LLMService | None = None, name_with_llm: bool = False):
+        """Initializes the LocalSuggestionGrouper.
+
+        Args:
+            llm_service: The LLMService used to name clusters (only if name_with_llm).
+            name_with_llm: Ask the LLM for theme names instead of using keyword labels.
+        """
+        self.llm_service = llm_service
+        self.name_with_llm = name_with_llm and llm_service is not None
+
+    def group(self, prioritized_suggestions: list[dict]) -> dict:
+        """Groups prioritized suggestions into thematic clusters.
+
+        Args:
+            prioritized_suggestions: Suggestions in priority order.
+
+        Returns:
+            A dictionary of theme -> suggestions (the same structure as
+            SuggestionGrouper.group()). Themes are ordered by their highest-priority
+            suggestion and suggestions keep their priority order within a theme.
+        """
+        if not prioritized_suggestions:
+            print("No suggestions provided for grouping.")
+            return {}
+        clusters, labels = self._cluster(prioritized_suggestions)
+        if self.name_with_llm:
+            prompt = self._build_naming_prompt(prioritized_suggestions, clusters, labels)
+            labels = self._apply_names(labels, self.llm_service.query_llm(prompt, stage="grouper_naming"))
+        return self._build_groups(prioritized_suggestions, clusters, labels)
+
+    async def agroup(self, prioritized_suggestions: list[dict]) -> dict:
+        """Async counterpart of group(), returning the same result structure."""
+        if not prioritized_suggestions:
+            print("No suggestions provided for grouping.")
+            return {}
+        clusters, labels = self._cluster(prioritized_suggestions)
+        if self.name_with_llm:
+            prompt = self._build_naming_prompt(prioritized_suggestions, clusters, labels)
+            labels = self._apply_names(labels, await self.llm_service.aquery_llm(prompt, stage="grouper_naming"))
+        return self._build_groups(prioritized_suggestions, clusters, labels)
+
+    def _cluster(self, suggestions: list[dict]) -> tuple[list[list[int]], list[str]]:
+        """Clusters the suggestions and labels each cluster with its top keywords.
+
+        Returns:
+            (clusters, labels): lists of suggestion indices and a label for each.
+        """
+        documents = []
+        surface_forms = {} # stem -> Counter of the words it came from, for readable labels
+        for s in suggestions:
+            tokens = []
+            for word in TOKEN_PATTERN.findall(s.get("suggestion", "").lower()):
+                if word in STOPWORDS or word.isdigit():
+                    continue
+                token = stem(word)
+                surface_forms.setdefault(token, Counter())[word] += 1
+                tokens.append(token)
+            documents.append(tokens)
+
+        vocabulary = {token: i for i, token in enumerate(sorted(surface_forms))}
+        matrix = _tfidf_matrix(documents, vocabulary)
+        if len(suggestions) <= config.GROUPER_AGGLOMERATIVE_MAX_ITEMS:
+            clusters = _agglomerative(matrix, config.GROUPER_MIN_SIMILARITY, config.GROUPER_MAX_THEMES)
+        else:
+            clusters = _spherical_kmeans(matrix, min(config.GROUPER_MAX_THEMES, int(np.sqrt(len(suggestions) / 2)) + 1))
+
+        terms = sorted(vocabulary, key=vocabulary.get)
+        labels = [_label(matrix[cluster].sum(axis=0), terms, surface_forms) for cluster in clusters]
+
+        # Singletons don't make a theme; collect them under a shared heading.
+        singletons = [c[0] for c in clusters if len(c) == 1]
+        if len(suggestions) >= 4 and len(singletons) > 1:
+            labels = [label for cluster, label in zip(clusters, labels) if len(cluster) > 1] + [OTHER_THEME]
+            clusters = [cluster for cluster in clusters if len(cluster) > 1] + [sorted(singletons)]
+        return clusters, _unique(labels)
+
+    def _build_naming_prompt(self, suggestions: list[dict], clusters: list[list[int]], labels: list[str]) -> str:
+        """Builds a short prompt asking only for a name for each cluster."""
+        lines = []
+        for i, (cluster, label) in enumerate(zip(clusters, labels)):
+            examples = "; ".join(suggestions[j].get("suggestion", "")[:120] for j in cluster[:3])
+            lines.append(f"- cluster_{i} (keywords: {label}): {examples}")
+        clusters_text = "\n".join(lines)
+        return f"""The following clusters group suggestions for improving a documentation article. Give each cluster a concise, descriptive theme name (2-4 words, e.g. "Clarity & Conciseness", "Example Addition").
+
+Clusters (keywords and example suggestions):
+{clusters_text}
+
+Format the output STRICTLY as a JSON object mapping each cluster ID to its theme name, e.g. {{"cluster_0": "Clarity & Conciseness"}}.
+"""
+
+    def _apply_names(self, labels: list[str], response: dict | list | str | None) -> list[str]:
+        """Replaces keyword labels with the LLM's names where it returned a usable one."""
+        if not isinstance(response, dict):
+            print(f"Warning: Cluster naming failed or returned unexpected format: {response}. Using keyword labels.")
+            return labels
+        named = []
+        for i, label in enumerate(labels):
+            name = response.get(f"cluster_{i}")
+            named.append(name.strip() if isinstance(name, str) and name.strip() and label != OTHER_THEME else label)
+        return _unique(named)
+
+    def _build_groups(self, suggestions: list[dict], clusters: list[list[int]], labels: list[str]) -> dict:
+        order = sorted(range(len(clusters)), key=lambda c: (labels[c] == OTHER_THEME, min(clusters[c])))
+        grouped = {labels[c]: [suggestions[i] for i in sorted(clusters[c])] for c in order}
+        print(f"Grouped suggestions locally into themes: {list(grouped.keys())}")
+        return grouped
+
+def _tfidf_matrix(documents: list[list[str]], vocabulary: dict) -> np.ndarray:
+    """Builds L2-normalized TF-IDF rows (one per document) with smoothed IDF."""
+    matrix = np.zeros((len(documents), max(1, len(vocabulary))), dtype=np.float64)
+    rows = np.repeat(np.arange(len(documents)), [len(d) for d in documents])
+    columns = np.array([vocabulary[t] for d in documents for t in d], dtype=np.int64)
+    np.add.at(matrix, (rows, columns), 1.0)
+    document_frequency = np.count_nonzero(matrix, axis=0)
+    matrix *= np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+def _agglomerative(matrix: np.ndarray, min_similarity: float, max_clusters: int) -> list[list[int]]:
+    """Average-linkage agglomerative clustering on cosine similarity.
+
+    Merges the most similar pair of clusters until no pair is at least
+    min_similarity similar and there are at most max_clusters clusters.
+    """
+    n = len(matrix)
+    clusters = [[i] for i in range(n)]
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, -np.inf)
+    sizes = np.ones(n)
+    active = np.ones(n, dtype=bool)
+    while active.sum() > 1:
+        i, j = np.unravel_index(np.argmax(similarity), similarity.shape)
+        if similarity[i, j] < min_similarity and active.sum() <= max_clusters:
+            break
+        i, j = min(i, j), max(i, j)
+        # Average linkage (Lance-Williams update): the merged cluster's similarity to
+        # every other cluster is the size-weighted mean of the two.
+        merged = (sizes[i] * similarity[i] + sizes[j] * similarity[j]) / (sizes[i] + sizes[j])
+        similarity[i, :] = merged
+        similarity[:, i] = merged
+        similarity[j, :] = -np.inf
+        similarity[:, j] = -np.inf
+        similarity[i, i] = -np.inf
+        sizes[i] += sizes[j]
+        active[j] = False
+        clusters[i].extend(clusters[j])
+    return [sorted(clusters[i]) for i in np.flatnonzero(active)]
+
+def _spherical_kmeans(matrix: np.ndarray, k: int, iterations: int = 20) -> list[list[int]]:
+    """K-means on unit vectors (cosine similarity), seeded deterministically with k-means++."""
+    n = len(matrix)
+    k = max(1, min(k, n))
+    rng = np.random.default_rng(0)
+    centroids = [matrix[rng.integers(n)]]
+    for _ in range(1, k):
+        distance = np.clip(1 - np.max(matrix @ np.array(centroids).T, axis=1), 0, None)
+        total = distance.sum()
+        centroids.append(matrix[rng.choice(n, p=distance / total) if total > 0 else rng.integers(n)])
+    centroids = np.array(centroids)
+    assignment = np.zeros(n, dtype=np.int64)
+    for iteration in range(iterations):
+        new_assignment = np.argmax(matrix @ centroids.T, axis=1)
+        if iteration and np.array_equal(new_assignment, assignment):
+            break
+        assignment = new_assignment
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, matrix)
+        norms = np.linalg.norm(sums, axis=1, keepdims=True)
+        centroids = np.where(norms > 0, sums / np.where(norms > 0, norms, 1), centroids)
+    return [sorted(np.flatnonzero(assignment == c).tolist()) for c in range(k) if np.any(assignment == c)]
+
+def _label(weights: np.ndarray, terms: list[str], surface_forms: dict) -> str:
+    """Builds a theme label from the two highest-weighted, non-generic terms of a cluster."""
+    words = []
+    for index in np.argsort(-weights, kind="stable"):
+        if weights[index] <= 0 or len(words) == 2:
+            break
+        word = surface_forms[terms[index]].most_common(1)[0][0]
+        if word not in GENERIC_LABEL_WORDS and len(word) > 2:
+            words.append(word)
+    if not words:
+        return "General Improvements"
+    return " & ".join(word.capitalize() for word in words)
+
+def _unique(labels: list[str]) -> list[str]:
+    """Makes labels unique by numbering repeats ("Jargon", "Jargon (2)")."""
+    seen = Counter()
+    unique = []
+    for label in labels:
+        seen[label] += 1
+        unique.append(label if seen[label] == 1 else f"{label} ({seen[label]})")
+    return unique
@@ -1,20 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import contextvars
 from core.llm_service import LLMService
-import json
+import config
+
+LEVELS = ("High", "Medium", "Low")
+IMPACT_ORDER = {"High": 0, "Medium": 1, "Low": 2, "N/A": 3}
 
 class SuggestionPrioritizer:
     """Prioritizes suggestions based on estimated impact and difficulty using an LLM."""
 
-    def __init__(self, llm_service: LLMService):
+    def __init__(self, llm_service: LLMService, chunk_size: int = config.PRIORITIZER_CHUNK_SIZE,
+                 max_workers: int = config.ANALYZER_MAX_WORKERS, max_retries: int = config.PRIORITIZER_MAX_RETRIES):
         """Initializes the SuggestionPrioritizer.
 
         Args:
             llm_service: An instance of the LLMService to use for analysis.
+            chunk_size: Maximum number of suggestions scored per LLM call. Longer
+                        lists are split into chunks that are scored in parallel.
+            max_workers: Maximum number of chunk calls in flight at once.
+            max_retries: How many times suggestions missing from the LLM's
+                         responses are sent again.
         """
         self.llm_service = llm_service
+        self.chunk_size = max(1, chunk_size)
+        self.max_workers = max(1, max_workers)
+        self.max_retries = max_retries
 
     def prioritize(self, all_suggestions: list[dict]) -> list[dict]:
         """Prioritizes a list of suggestions using the LLM.
 
+        Each suggestion is sent under a short ID (sugg_0, sugg_1, ...) and the LLM
+        answers with scores per ID, so scores never depend on the LLM echoing the
+        suggestion text back exactly.
+
         Args:
             all_suggestions: A list of suggestion dictionaries. Each dictionary
                              should at least contain a 'suggestion' key with the text.
@@ -23,81 +42,101 @@ class SuggestionPrioritizer:
         Returns:
             A list of suggestion dictionaries, each augmented with 'impact' (e.g., High, Medium, Low)
             and 'difficulty' (e.g., High, Medium, Low) scores, and sorted by impact.
-            Returns the original list if prioritization fails.
+            Suggestions that could not be scored get 'N/A' and are sorted last.
         """
         if not all_suggestions:
             return []
 
+        scores = {}
+        pending = list(range(len(all_suggestions)))
+        def score(chunk: list[int]) -> dict | list | str | None:
+            return self.llm_service.query_llm(self._build_prompt(all_suggestions, chunk), stage="prioritizer")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for attempt in range(self.max_retries + 1):
+                chunks = self._chunks(pending)
+                # Context copies carry the caller's metrics recorders into the worker threads.
+                futures = [executor.submit(contextvars.copy_context().run, score, chunk) for chunk in chunks]
+                responses = [future.result() for future in futures]
+                pending = self._collect_scores(chunks, responses, scores, attempt)
+                if not pending:
+                    break
+        return self._apply_scores(all_suggestions, scores)
+
+    async def aprioritize(self, all_suggestions: list[dict]) -> list[dict]:
+        """Async counterpart of prioritize(), returning the same result structure."""
+        if not all_suggestions:
+            return []
+
+        scores = {}
+        pending = list(range(len(all_suggestions)))
+        for attempt in range(self.max_retries + 1):
+            chunks = self._chunks(pending)
+            responses = await asyncio.gather(
+                *(self.llm_service.aquery_llm(self._build_prompt(all_suggestions, chunk), stage="prioritizer") for chunk in chunks)
+            )
+            pending = self._collect_scores(chunks, responses, scores, attempt)
+            if not pending:
+                break
+        return self._apply_scores(all_suggestions, scores)
+
+    def _chunks(self, indices: list[int]) -> list[list[int]]:
+        """Splits suggestion indices into chunks of at most chunk_size."""
+        return [indices[i:i + self.chunk_size] for i in range(0, len(indices), self.chunk_size)]
+
+    def _build_prompt(self, all_suggestions: list[dict], indices: list[int]) -> str:
+        """Builds the prioritization prompt for the suggestions at the given indices."""
         # Prepare the suggestions for the prompt
-        suggestions_text = "\n".join([f"- {s.get('suggestion', 'N/A')} (Source: {s.get('source', 'Unknown')})" for s in all_suggestions])
+        suggestions_text = "\n".join(
+            f"- ID: sugg_{i}, Suggestion: {all_suggestions[i].get('suggestion', 'N/A')} (Source: {all_suggestions[i].get('source', 'Unknown')})"
+            for i in indices
+        )
 
-        prompt = f"""Given the following list of suggestions for improving documentation, please evaluate each suggestion based on its potential **impact** on user understanding/experience and the estimated **difficulty** to implement the change. 
+        prompt = f"""Given the following list of suggestions for improving documentation, each with a unique ID, please evaluate each suggestion based on its potential **impact** on user understanding/experience and the estimated **difficulty** to implement the change.
 
 Use categories: High, Medium, Low for both impact and difficulty.
 
 Suggestions:
 {suggestions_text}
 
-Format the output as a JSON list of objects. Each object should contain:
-1.  "suggestion": The original suggestion text.
-2.  "impact": "High", "Medium", or "Low".
-3.  "difficulty": "High", "Medium", or "Low".
+Format the output STRICTLY as a JSON object mapping each suggestion ID to an object with "impact" and "difficulty". Do NOT include the suggestion text, only the IDs.
 
 Example output format:
-[
-  {{
-    "suggestion": "Sentence X is too long...",
-    "impact": "Medium",
-    "difficulty": "Low"
-  }},
-  {{
-    "suggestion": "Add an example demonstrating feature Y.",
-    "impact": "High",
-    "difficulty": "Medium"
-  }}
-]
+{{
+  "sugg_0": {{"impact": "Medium", "difficulty": "Low"}},
+  "sugg_1": {{"impact": "High", "difficulty": "Medium"}}
+}}
 """
-
-        prioritization_result = self.llm_service.query_llm(prompt)
-
-        if prioritization_result and isinstance(prioritization_result, list):
-            # Add scores back to the original suggestions (match by suggestion text)
-            scored_suggestions = []
-            original_suggestions_map = {s.get('suggestion'): s for s in all_suggestions}
-            
-            for scored_item in prioritization_result:
-                original_suggestion_text = scored_item.get('suggestion')
-                if original_suggestion_text in original_suggestions_map:
-                    original_suggestion = original_suggestions_map[original_suggestion_text]
-                    original_suggestion['impact'] = scored_item.get('impact', 'N/A')
-                    original_suggestion['difficulty'] = scored_item.get('difficulty', 'N/A')
-                    scored_suggestions.append(original_suggestion)
+        return prompt
+
+    def _collect_scores(self, chunks: list[list[int]], responses, scores: dict, attempt: int) -> list[int]:
+        """Records the scores from each chunk's response and returns the indices still unscored."""
+        pending = []
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, list):
+                # Tolerate a list of {"id": ..., ...} objects instead of an ID-keyed object.
+                response = {item.get("id"): item for item in response if isinstance(item, dict)}
+            if not isinstance(response, dict):
+                print(f"Suggestion prioritization failed or returned unexpected format: {response}")
+                response = {}
+            for i in chunk:
+                item = response.get(f"sugg_{i}")
+                if isinstance(item, dict) and item.get("impact") in LEVELS:
+                    scores[i] = item
                 else:
-                    # Handle cases where the LLM might slightly alter the suggestion text
-                    print(f"Warning: Could not map prioritized suggestion back: {original_suggestion_text}")
-                    # Add it anyway, but mark it
-                    scored_item['source'] = 'Unknown (Mapping Failed)'
-                    scored_suggestions.append(scored_item)
-
-            # Sort by impact (High > Medium > Low)
-            impact_order = {"High": 0, "Medium": 1, "Low": 2, "N/A": 3}
-            scored_suggestions.sort(key=lambda x: impact_order.get(x.get('impact', 'N/A'), 3))
-            
-            # Ensure all original suggestions are included, even if scoring failed for some
-            returned_suggestions_texts = {s.get('suggestion') for s in scored_suggestions}
-            for original in all_suggestions:
-                if original.get('suggestion') not in returned_suggestions_texts:
-                    original['impact'] = 'N/A'
-                    original['difficulty'] = 'N/A'
-                    scored_suggestions.append(original)
-                    print(f"Warning: Suggestion not scored by LLM: {original.get('suggestion')}")
-
-            return scored_suggestions
-        else:
-            print(f"Suggestion prioritization failed or returned unexpected format: {prioritization_result}")
-            # Return original suggestions with N/A scores if LLM fails
-            for s in all_suggestions:
-                s['impact'] = 'N/A'
-                s['difficulty'] = 'N/A'
-            return all_suggestions
-
+                    pending.append(i)
+        if pending and attempt < self.max_retries:
+            print(f"Warning: {len(pending)} suggestions were not scored by the LLM; retrying them.")
+        return pending
+
+    def _apply_scores(self, all_suggestions: list[dict], scores: dict) -> list[dict]:
+        """Merges the LLM's impact/difficulty scores back into the suggestions and sorts them."""
+        for i, s in enumerate(all_suggestions):
+            item = scores.get(i, {})
+            s['impact'] = item.get('impact', 'N/A')
+            s['difficulty'] = item.get('difficulty') if item.get('difficulty') in LEVELS else 'N/A'
+            if i not in scores:
+                print(f"Warning: Suggestion not scored by LLM: {s.get('suggestion')}")
+
+        # Sort by impact (High > Medium > Low); the sort is stable, so ties keep their order.
+        return sorted(all_suggestions, key=lambda x: IMPACT_ORDER.get(x.get('impact', 'N/A'), 3))
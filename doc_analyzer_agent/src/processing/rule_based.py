@@ -0,0 +1,92 @@
+# src/processing/rule_based.py
+# Local replacements for the LLM-backed processing steps, used in fast mode.
+
+IMPACT_ORDER = {"High": 0, "Medium": 1, "Low": 2, "N/A": 3}
+DIFFICULTY_ORDER = {"Low": 0, "Medium": 1, "High": 2, "N/A": 3}
+
+class RuleBasedPrioritizer:
+    """Sorts suggestions by the impact and difficulty assigned by the rule-based analyzers."""
+
+    def prioritize(self, all_suggestions: list[dict]) -> list[dict]:
+        """Sorts suggestions by impact (High first), then by difficulty (Low first).
+
+        Args:
+            all_suggestions: Suggestion dictionaries from aggregate_suggestions(). Any
+                             without 'impact' or 'difficulty' get 'N/A'.
+
+        Returns:
+            The same suggestions, sorted. The sort is stable, so ties keep their
+            document order.
+        """
+        for s in all_suggestions:
+            s.setdefault("impact", "N/A")
+            s.setdefault("difficulty", "N/A")
+        return sorted(
+            all_suggestions,
+            key=lambda s: (IMPACT_ORDER.get(s["impact"], 3), DIFFICULTY_ORDER.get(s["difficulty"], 3))
+        )
+
+    async def aprioritize(self, all_suggestions: list[dict]) -> list[dict]:
+        """Async counterpart of prioritize()."""
+        return self.prioritize(all_suggestions)
+
+class RuleBasedGrouper:
+    """Groups suggestions by the theme assigned by the rule-based analyzers."""
+
+    def group(self, prioritized_suggestions: list[dict]) -> dict:
+        """Groups suggestions by their 'theme' key, falling back to their source.
+
+        Args:
+            prioritized_suggestions: Suggestions in priority order.
+
+        Returns:
+            A dictionary of theme -> suggestions, keeping the priority order within
+            each theme.
+        """
+        grouped = {}
+        for s in prioritized_suggestions:
+            grouped.setdefault(s.get("theme") or s.get("source", "Unknown"), []).append(s)
+        return grouped
+
+    async def agroup(self, prioritized_suggestions: list[dict]) -> dict:
+        """Async counterpart of group()."""
+        return self.group(prioritized_suggestions)
+
+class TemplateSummaryGenerator:
+    """Builds the executive summary from the analysis results without an LLM."""
+
+    def generate(self, analysis_results: dict, grouped_suggestions: dict) -> str:
+        """Generates a short summary listing the strengths and the main areas to improve.
+
+        Args:
+            analysis_results: Results from each analyzer.
+            grouped_suggestions: Suggestions grouped by theme.
+
+        Returns:
+            The summary text.
+        """
+        strengths = [
+            result["positive_feedback"] for result in analysis_results.values()
+            if isinstance(result, dict) and result.get("positive_feedback")
+        ]
+        total = sum(len(suggestions) for suggestions in grouped_suggestions.values())
+        high_impact = sum(
+            1 for suggestions in grouped_suggestions.values() for s in suggestions if s.get("impact") == "High"
+        )
+
+        summary = []
+        if strengths:
+            summary.append("Strengths: " + " ".join(strengths))
+        if total:
+            themes = sorted(grouped_suggestions, key=lambda theme: -len(grouped_suggestions[theme]))
+            summary.append(
+                f"Automated checks found {total} issue{'s' if total != 1 else ''} "
+                f"({high_impact} high impact), mostly in: {', '.join(themes[:3])}."
+            )
+        else:
+            summary.append("Automated checks found no issues.")
+        return " ".join(summary)
+
+    async def agenerate(self, analysis_results: dict, grouped_suggestions: dict) -> str:
+        """Async counterpart of generate()."""
+        return self.generate(analysis_results, grouped_suggestions)
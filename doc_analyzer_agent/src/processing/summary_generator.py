@@ -3,6 +3,9 @@ from core.llm_service import LLMService
 import json
 import re # Import regex for cleaning
 
+# Start of the summary used when the LLM's summary could not be obtained.
+FALLBACK_SUMMARY_PREFIX = "Executive summary could not be automatically generated."
+
 class SummaryGenerator:
     """Generates an executive summary of the analysis findings using an LLM."""
 
@@ -15,6 +18,28 @@ class SummaryGenerator:
         if not analysis_results and not grouped_suggestions:
             return "No analysis results or suggestions available to generate a summary."
 
+        prompt, findings_summary, suggestion_themes = self._build_prompt(analysis_results, grouped_suggestions)
+
+        print("--- Sending summary prompt to LLM ---")
+        # Removed expect_json=True
+        llm_response_raw = self.llm_service.query_llm(prompt, stage="summary")
+        print("--- Received LLM summary response ---")
+        return self._process_response(llm_response_raw, findings_summary, suggestion_themes)
+
+    async def agenerate(self, analysis_results: dict, grouped_suggestions: dict) -> str:
+        """Async counterpart of generate(), returning the same summary string."""
+        if not analysis_results and not grouped_suggestions:
+            return "No analysis results or suggestions available to generate a summary."
+
+        prompt, findings_summary, suggestion_themes = self._build_prompt(analysis_results, grouped_suggestions)
+
+        print("--- Sending async summary prompt to LLM ---")
+        llm_response_raw = await self.llm_service.aquery_llm(prompt, stage="summary")
+        print("--- Received LLM summary response ---")
+        return self._process_response(llm_response_raw, findings_summary, suggestion_themes)
+
+    def _build_prompt(self, analysis_results: dict, grouped_suggestions: dict) -> tuple[str, str, str]:
+        """Builds the summary prompt along with the findings and themes it was built from."""
         # Prepare a concise summary of findings and suggestions for the prompt
         # CORRECTED: Use standard single quotes inside the f-string expression
         findings_summary = "\n".join([
@@ -41,14 +66,16 @@ Example output format:
   "summary": "The documentation is generally clear but lacks sufficient examples and could benefit from structural improvements like subheadings."
 }}
 """
-        print("--- Sending summary prompt to LLM ---")
-        # Removed expect_json=True
-        llm_response_raw = self.llm_service.query_llm(prompt)
-        print("--- Received LLM summary response ---")
+        return prompt, findings_summary, suggestion_themes
 
+    def _process_response(self, llm_response_raw: dict | list | str | None, findings_summary: str, suggestion_themes: str) -> str:
+        """Extracts the summary text from the LLM response, falling back to a basic summary."""
         summary_text = None
-        # Manually parse the JSON response
-        if llm_response_raw and isinstance(llm_response_raw, str):
+        # LLMService already returns parsed JSON when it can; otherwise parse manually
+        if isinstance(llm_response_raw, dict) and isinstance(llm_response_raw.get("summary"), str):
+            summary_text = llm_response_raw["summary"]
+            print("Executive summary generated successfully.")
+        elif llm_response_raw and isinstance(llm_response_raw, str):
             try:
                 # Clean potential markdown code fences
                 cleaned_response = re.sub(r"^```json\n?|\n?```$", "", llm_response_raw.strip(), flags=re.MULTILINE)
@@ -71,7 +98,7 @@ Example output format:
         if summary_text is None:
             print("Using fallback summary.")
             findings_str = findings_summary if isinstance(findings_summary, str) else "N/A"
-            fallback_summary = "Executive summary could not be automatically generated. Key findings include: " + findings_str.replace("\n", "; ") + ". Key suggestion themes: " + suggestion_themes + "."
+            fallback_summary = FALLBACK_SUMMARY_PREFIX + " Key findings include: " + findings_str.replace("\n", "; ") + ". Key suggestion themes: " + suggestion_themes + "."
             if len(fallback_summary) > 300:
                  fallback_summary = fallback_summary[:297] + "..."
             return fallback_summary
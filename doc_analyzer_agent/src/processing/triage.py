@@ -0,0 +1,116 @@
+# src/processing/triage.py
+from core.llm_service import LLMService
+from processing.rule_based import IMPACT_ORDER
+
+LEVELS = ("High", "Medium", "Low")
+UNCATEGORIZED_THEME = "Uncategorized"
+
+class SuggestionTriager:
+    """Prioritizes and groups suggestions in a single LLM call.
+
+    Replaces running SuggestionPrioritizer and then SuggestionGrouper: the LLM
+    returns impact, difficulty and theme for every suggestion ID in one structured
+    response, so the suggestion list is sent once and there is one round trip
+    instead of two.
+    """
+
+    def __init__(self, llm_service: LLMService):
+        """Initializes the SuggestionTriager.
+
+        Args:
+            llm_service: An instance of the LLMService to use for analysis.
+        """
+        self.llm_service = llm_service
+
+    def triage(self, all_suggestions: list[dict]) -> tuple[list[dict], dict]:
+        """Scores and groups suggestions using one LLM call.
+
+        Args:
+            all_suggestions: Suggestion dictionaries from aggregate_suggestions().
+
+        Returns:
+            A (prioritized_suggestions, grouped_suggestions) tuple with the same
+            structures as SuggestionPrioritizer.prioritize() and
+            SuggestionGrouper.group(): the suggestions, each augmented with
+            'impact', 'difficulty' and 'theme' and sorted by impact, and a
+            dictionary of theme -> suggestions in priority order.
+        """
+        if not all_suggestions:
+            return [], {}
+        prompt = self._build_prompt(all_suggestions)
+        print("--- Sending triage prompt to LLM ---")
+        llm_response = self.llm_service.query_llm(prompt, stage="triage")
+        print("--- Received LLM triage response ---")
+        return self._apply_response(all_suggestions, llm_response)
+
+    async def atriage(self, all_suggestions: list[dict]) -> tuple[list[dict], dict]:
+        """Async counterpart of triage(), returning the same result structure."""
+        if not all_suggestions:
+            return [], {}
+        prompt = self._build_prompt(all_suggestions)
+        print("--- Sending async triage prompt to LLM ---")
+        llm_response = await self.llm_service.aquery_llm(prompt, stage="triage")
+        print("--- Received LLM triage response ---")
+        return self._apply_response(all_suggestions, llm_response)
+
+    def _build_prompt(self, all_suggestions: list[dict]) -> str:
+        """Builds the triage prompt, listing every suggestion under a short ID."""
+        suggestions_text = "\n".join(
+            f"- ID: sugg_{i}, Suggestion: {s.get('suggestion', 'N/A')} (Source: {s.get('source', 'Unknown')})"
+            for i, s in enumerate(all_suggestions)
+        )
+        return f"""Given the following list of suggestions for improving documentation, each with a unique ID, do two things for every suggestion:
+1. Evaluate its potential **impact** on user understanding/experience and the estimated **difficulty** to implement the change, using the categories High, Medium and Low.
+2. Assign it to a thematic category. Choose concise, descriptive category names (e.g., "Clarity & Conciseness", "Structural Enhancements", "Example Addition", "Tone Adjustment", "User Experience") and reuse the same name for suggestions that belong together.
+
+Suggestions:
+{suggestions_text}
+
+Format the output STRICTLY as a JSON object mapping each suggestion ID to an object with "impact", "difficulty" and "theme". Do NOT include the suggestion text. Ensure the output is only the JSON object, with no surrounding text or markdown formatting.
+
+Example output format:
+{{
+  "sugg_0": {{"impact": "High", "difficulty": "Low", "theme": "Clarity & Conciseness"}},
+  "sugg_1": {{"impact": "Medium", "difficulty": "Medium", "theme": "Example Addition"}}
+}}
+"""
+
+    def _apply_response(self, all_suggestions: list[dict], llm_response: dict | list | str | None) -> tuple[list[dict], dict]:
+        """Merges the LLM's scores and themes into the suggestions, then sorts and groups them."""
+        if isinstance(llm_response, list):
+            # Tolerate a list of {"id": ..., ...} objects instead of an ID-keyed object.
+            llm_response = {item.get("id"): item for item in llm_response if isinstance(item, dict)}
+        if not isinstance(llm_response, dict) or not llm_response:
+            print(f"Suggestion triage failed or returned unexpected format: {llm_response}. Falling back to grouping by source.")
+            for s in all_suggestions:
+                s["impact"] = "N/A"
+                s["difficulty"] = "N/A"
+            grouped = {}
+            for s in all_suggestions:
+                grouped.setdefault(s.get("source", "Unknown"), []).append(s)
+            return all_suggestions, grouped
+
+        unscored = 0
+        for i, s in enumerate(all_suggestions):
+            item = llm_response.get(f"sugg_{i}")
+            if not isinstance(item, dict):
+                item = {}
+                unscored += 1
+            s["impact"] = item.get("impact") if item.get("impact") in LEVELS else "N/A"
+            s["difficulty"] = item.get("difficulty") if item.get("difficulty") in LEVELS else "N/A"
+            theme = item.get("theme")
+            s["theme"] = theme.strip() if isinstance(theme, str) and theme.strip() else UNCATEGORIZED_THEME
+        if unscored:
+            print(f"Warning: {unscored} suggestions were not triaged by the LLM and placed in '{UNCATEGORIZED_THEME}'.")
+
+        # Sort by impact (High > Medium > Low); the sort is stable, so ties keep their order.
+        prioritized = sorted(all_suggestions, key=lambda s: IMPACT_ORDER.get(s["impact"], 3))
+        grouped = {}
+        for s in prioritized:
+            if s["theme"] != UNCATEGORIZED_THEME:
+                grouped.setdefault(s["theme"], []).append(s)
+        uncategorized = [s for s in prioritized if s["theme"] == UNCATEGORIZED_THEME]
+        if uncategorized:
+            grouped[UNCATEGORIZED_THEME] = uncategorized
+        print(f"Triaged suggestions into themes: {list(grouped.keys())}")
+        return prioritized, grouped
@@ -10,7 +10,10 @@ class ReportFormatter:
         prioritized_suggestions: list[dict],
         grouped_suggestions: dict,
         executive_summary: str,
-        top_n: int = 5 # Number of top suggestions to highlight
+        top_n: int = 5, # Number of top suggestions to highlight
+        fetch_source: str | None = None,
+        analysis_stats: dict | None = None,
+        llm_usage: dict | None = None
     ) -> str:
         """Generates a formatted report string (Markdown).
 
@@ -21,6 +24,11 @@ class ReportFormatter:
             grouped_suggestions: Dictionary of thematically grouped suggestions.
             executive_summary: The generated executive summary string.
             top_n: The number of top-priority suggestions to list separately.
+            fetch_source: How the page was fetched ("http", "browser", "cache" or "provided"), if known.
+            analysis_stats: Optional statistics about how the analysis was run, as a
+                            mapping of group title to {stat name: value}.
+            llm_usage: Optional LLM usage metrics for this document, as returned by
+                       MetricsRecorder.summary().
 
         Returns:
             A string containing the formatted report in Markdown.
@@ -31,6 +39,10 @@ class ReportFormatter:
         # Format datetime string outside the f-string
         report_time_str = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
         report.append(f"**Report Generated:** {report_time_str}") 
+        if fetch_source:
+            fetch_source_labels = {"http": "Plain HTTP", "browser": "Headless browser", "cache": "HTML cache",
+                                   "provided": "Submitted HTML"}
+            report.append(f"**Fetched Via:** {fetch_source_labels.get(fetch_source, fetch_source)}")
         report.append("\n---")
 
         # --- Executive Summary ---
@@ -63,12 +75,15 @@ class ReportFormatter:
                  report.append(f"**Quantified Issues:** {result.get('quantified_issues')}")
             if result.get("snippet_specific_feedback"): # Specific to Style
                  report.append(f"**Snippet-Specific Feedback:** {result.get('snippet_specific_feedback')}")
+            if result.get("metrics", {}).get("sentences"): # Specific to Readability (computed locally)
+                report.extend(self._format_readability_metrics(result["metrics"]))
             
             suggestions = result.get("suggestions", [])
             if suggestions:
                 report.append("**Suggestions:**")
                 for sugg in suggestions:
-                    report.append(f"- {sugg}") # Suggestions from raw analysis might be just strings
+                    # Suggestions from raw analysis might be just strings; rule-based ones are dicts
+                    report.append(f"- {sugg.get('suggestion', 'N/A') if isinstance(sugg, dict) else sugg}")
             report.append("") # Add a newline for spacing
         report.append("\n---")
 
@@ -97,7 +112,68 @@ class ReportFormatter:
                  report.append("No suggestions available.")
 
         report.append("\n---")
+
+        # --- Analysis Statistics ---
+        if analysis_stats:
+            report.append("## Analysis Statistics")
+            for group_title, stats in analysis_stats.items():
+                report.append(f"### {group_title}")
+                for stat_name, value in stats.items():
+                    report.append(f"- *{stat_name.replace('_', ' ').capitalize()}:* {value}")
+                report.append("") # Add a newline for spacing
+            report.append("\n---")
+
+        # --- LLM Usage ---
+        if llm_usage and llm_usage.get("calls"):
+            report.extend(self._format_llm_usage(llm_usage))
+            report.append("\n---")
+
         report.append("*End of Report*")
 
         return "\n".join(report)
 
+    def _format_readability_metrics(self, metrics: dict) -> list[str]:
+        """Formats locally computed readability metrics as a summary line and a per-section table."""
+        lines = []
+        lines.append(
+            f"**Readability Metrics:** Flesch reading ease {metrics['flesch_reading_ease']}, "
+            f"Flesch-Kincaid grade {metrics['flesch_kincaid_grade']}, "
+            f"{metrics['avg_sentence_length']} words per sentence on average "
+            f"(median {metrics['median_sentence_length']}, 90th percentile {metrics['p90_sentence_length']}, "
+            f"longest {metrics['max_sentence_length']}), long sentences: {metrics['long_sentences']}, "
+            f"{round(metrics['passive_voice_ratio'] * 100)}% passive voice."
+        )
+        sections = [section for section in metrics.get("sections", []) if section.get("sentences")]
+        if len(sections) > 1:
+            lines.append("")
+            lines.append("| Section | Sentences | Avg. Words/Sentence | Long Sentences | Passive Voice | Flesch Reading Ease |")
+            lines.append("|---------|-----------|---------------------|----------------|---------------|---------------------|")
+            for section in sections:
+                heading = (section.get("heading") or "Introduction").replace("|", "\\|")
+                lines.append(
+                    f"| {heading} | {section['sentences']} | {section['avg_sentence_length']} | "
+                    f"{section['long_sentences']} | {round(section['passive_voice_ratio'] * 100)}% | "
+                    f"{section['flesch_reading_ease']} |"
+                )
+            lines.append("")
+        return lines
+
+    def _format_llm_usage(self, usage: dict) -> list[str]:
+        """Formats per-stage LLM token, latency and cost metrics as a summary line and a table."""
+        lines = ["## LLM Usage"]
+        lines.append(
+            f"**Total:** {usage['calls']} calls ({usage['cache_hits']} from cache, {usage['retries']} retries, "
+            f"{usage['failed_calls']} failed), {usage['prompt_tokens']} prompt tokens, "
+            f"{usage['response_tokens']} response tokens, estimated cost ${usage['estimated_cost_usd']:.4f}"
+        )
+        lines.append("")
+        lines.append("| Stage | Calls | Cache Hits | Retries | Prompt Tokens | Response Tokens | Latency (s) | Est. Cost (USD) |")
+        lines.append("|-------|-------|------------|---------|---------------|-----------------|-------------|-----------------|")
+        for stage, stats in usage.get("stages", {}).items():
+            lines.append(
+                f"| {stage.replace('_', ' ').title()} | {stats['calls']} | {stats['cache_hits']} | {stats['retries']} | "
+                f"{stats['prompt_tokens']} | {stats['response_tokens']} | {stats['latency_seconds']} | "
+                f"{stats['estimated_cost_usd']:.4f} |"
+            )
+        lines.append("")
+        return lines
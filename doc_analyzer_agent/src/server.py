@@ -0,0 +1,412 @@
+# -*- coding: utf-8 -*-
+"""Server command: a long-lived analysis daemon with a local HTTP job API.
+
+The server keeps one LLMService (client, response cache and rate limiter), one
+fetcher (keep-alive HTTP session and browser pool) and the on-disk caches
+resident, and runs analysis jobs from a bounded queue with a fixed number of
+workers, so a job costs little more than its LLM calls.
+
+Endpoints:
+    POST /jobs               Submit a job: {"url": ...} to fetch and analyze a page, or
+                             {"html": ..., "url": optional label} to analyze raw HTML, with
+                             optional "options" overriding the server's analysis options.
+                             Returns 202 with the job, or 503 when the queue is full.
+    GET  /jobs/<id>          The job's status.
+    GET  /jobs/<id>/report   The report as Markdown, or ?format=json for the structured results.
+    GET  /health             Queue, worker and job counts, and LLM usage since start-up.
+"""
+
+import sys
+import os
+import argparse
+import json
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+# Add src directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.fetcher import BrowserPool, Fetcher
+from core.llm_service import LLMService
+from core.cassette import Cassette
+from core.checkpoint_store import STAGES
+from main import run_analysis, add_analysis_arguments, analysis_options, cassette_from_args, ANALYZER_MODES, GROUPER_MODES
+import config
+
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the job queue is full."""
+
+@dataclass
+class Job:
+    """One analysis request and its outcome.
+
+    Attributes:
+        id: The job ID used in the API paths.
+        url: The page to analyze, or a label for submitted HTML.
+        options: The run_analysis() options for this job.
+        html: Submitted HTML to analyze instead of fetching `url`.
+        status: "queued", "running", "done" or "failed".
+        submitted_at, started_at, finished_at: Epoch timestamps.
+        report: The Markdown report once the job is done.
+        details: The structured results (see run_analysis(details=...)).
+        error: Why the job failed, if it did.
+    """
+    id: str
+    url: str
+    options: dict
+    html: str | None = None
+    status: str = "queued"
+    submitted_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    report: str | None = None
+    details: dict = field(default_factory=dict)
+    error: str | None = None
+
+    def to_dict(self) -> dict:
+        """Returns the job's status as sent by the API (without the report)."""
+        duration = None
+        if self.started_at is not None:
+            duration = round((self.finished_at or time.time()) - self.started_at, 2)
+        return {
+            "id": self.id,
+            "url": self.url,
+            "status": self.status,
+            "options": self.options,
+            "submitted_at": _timestamp(self.submitted_at),
+            "started_at": _timestamp(self.started_at),
+            "finished_at": _timestamp(self.finished_at),
+            "duration_seconds": duration,
+            "error": self.error,
+            "report": f"/jobs/{self.id}/report" if self.status == "done" else None,
+        }
+
+def _timestamp(epoch: float | None) -> str | None:
+    if epoch is None:
+        return None
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def validate_options(options: dict) -> dict:
+    """Checks the per-job analysis options submitted to the API.
+
+    Raises:
+        ValueError: If an option is unknown or has an invalid value.
+    """
+    if not isinstance(options, dict):
+        raise ValueError("'options' must be an object.")
+    checks = {
+        "analyzer_mode": lambda v: v in ANALYZER_MODES,
+        "grouper_mode": lambda v: v in GROUPER_MODES,
+        "incremental": lambda v: isinstance(v, bool),
+        "reuse_unchanged": lambda v: isinstance(v, bool),
+        "checkpoint": lambda v: isinstance(v, bool),
+        "resume": lambda v: isinstance(v, bool),
+        "rerun_from": lambda v: v is None or v in STAGES,
+        "max_chunk_tokens": lambda v: v is None or (isinstance(v, int) and not isinstance(v, bool) and v >= 0),
+    }
+    for name, value in options.items():
+        if name not in checks:
+            raise ValueError(f"Unknown option '{name}'. Expected one of: {', '.join(checks)}.")
+        if not checks[name](value):
+            raise ValueError(f"Invalid value for option '{name}': {value!r}.")
+    return options
+
+class AnalysisJobQueue:
+    """Runs analysis jobs on a pool of worker threads that share one set of long-lived services."""
+
+    def __init__(
+        self,
+        workers: int = config.SERVER_WORKERS,
+        queue_size: int = config.SERVER_QUEUE_SIZE,
+        max_finished_jobs: int = config.SERVER_MAX_FINISHED_JOBS,
+        cache_mode: str = "use",
+        html_cache_mode: str = "use",
+        cassette: Cassette | None = None,
+        llm_service: LLMService | None = None,
+        warm_browser: bool = False,
+        **analysis_defaults
+    ):
+        """Initializes the AnalysisJobQueue and starts its workers.
+
+        Args:
+            workers: Number of jobs analyzed concurrently.
+            queue_size: Maximum number of jobs waiting to run; submissions beyond
+                        it are rejected with QueueFullError.
+            max_finished_jobs: Number of finished jobs (and reports) kept for polling.
+            cache_mode: LLM response cache mode ("use", "refresh" or "bypass").
+            html_cache_mode: HTML cache mode ("use", "cache-only" or "bypass").
+            cassette: A Cassette the LLMService records to or replays from.
+            llm_service: An existing LLMService to share between the jobs. One is
+                         created if omitted (except when the default mode is fast).
+            warm_browser: Launch the headless browser at start-up rather than on
+                          the first page that needs it.
+            **analysis_defaults: Default run_analysis() options for every job; jobs
+                                 can override them.
+
+        Raises:
+            ValueError: If the LLM service cannot be created (e.g. no API key).
+        """
+        self.workers = max(1, workers)
+        self.max_finished_jobs = max_finished_jobs
+        self.cache_mode = cache_mode
+        self.cassette = cassette
+        self.analysis_defaults = analysis_defaults
+        if llm_service is None and analysis_defaults.get("analyzer_mode") != "fast":
+            llm_service = LLMService(cache_mode=cache_mode, cassette=cassette)
+        self.llm_service = llm_service
+        self.fetcher = Fetcher(browser_pool=BrowserPool(pool_size=self.workers), cache_mode=html_cache_mode)
+        if warm_browser:
+            try:
+                self.fetcher.browser_pool.start()
+            except Exception as e:
+                print(f"Warning: Could not start the headless browser: {e}. It will be started on first use.")
+
+        self._queue = queue.Queue(maxsize=max(1, queue_size))
+        self._jobs = OrderedDict() # job ID -> Job, in submission order
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(target=self._work, name=f"analysis-worker-{i + 1}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, url: str | None = None, html: str | None = None, options: dict | None = None) -> Job:
+        """Queues a job to analyze a URL, or submitted HTML.
+
+        Args:
+            url: The page to fetch and analyze, or a label for `html`.
+            html: HTML to analyze instead of fetching `url`.
+            options: run_analysis() options overriding the server defaults.
+
+        Returns:
+            The queued Job.
+
+        Raises:
+            QueueFullError: If the queue is full.
+        """
+        job_id = uuid.uuid4().hex[:12]
+        options = {**self.analysis_defaults, **(options or {})}
+        if url is None:
+            # Unlabeled HTML gets a one-off label, so its checkpoints could never be resumed.
+            options.update(checkpoint=False, resume=False, rerun_from=None)
+        job = Job(job_id, url or f"submitted-html:{job_id}", options, html)
+        with self._lock:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise QueueFullError(f"The job queue is full ({self._queue.maxsize} jobs waiting).") from None
+            self._jobs[job.id] = job
+            self._forget_finished_jobs()
+        print(f"Queued job {job.id}: {job.url}")
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        """Returns a job by ID, or None if it is unknown (or was forgotten)."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> dict:
+        """Returns the queue, worker and job counts, and the LLM usage since start-up."""
+        with self._lock:
+            counts = {status: 0 for status in JOB_STATUSES}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        stats = {"workers": self.workers, "queue_capacity": self._queue.maxsize, "jobs": counts}
+        if self.llm_service:
+            usage = self.llm_service.metrics.summary()
+            usage.pop("stages", None)
+            stats["llm_usage"] = usage
+        return stats
+
+    def close(self):
+        """Fails the jobs still queued, waits for running jobs to finish and closes the fetcher."""
+        while True:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if job is not None:
+                job.status = "failed"
+                job.error = "The server shut down before the job started."
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self.fetcher.close()
+
+    def _work(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            self._run(job)
+
+    def _run(self, job: Job):
+        job.status = "running"
+        job.started_at = time.time()
+        try:
+            report = run_analysis(
+                job.url,
+                cache_mode=self.cache_mode,
+                llm_service=self.llm_service,
+                cassette=self.cassette,
+                fetcher=self.fetcher,
+                html=job.html,
+                output_path=None,
+                print_report=False,
+                details=job.details,
+                **job.options
+            )
+            if report is None:
+                job.error = "Pipeline did not complete (see the server log for details)."
+            else:
+                job.report = report
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+        job.html = None # Not needed anymore; don't keep large pages in memory
+        job.finished_at = time.time()
+        job.status = "done" if job.report is not None else "failed"
+        print(f"Job {job.id} {job.status} in {job.finished_at - job.started_at:.1f}s: {job.url}")
+
+    def _forget_finished_jobs(self):
+        """Drops the oldest finished jobs beyond max_finished_jobs (call with the lock held)."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in ("done", "failed")]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+class JobHTTPServer(ThreadingHTTPServer):
+    """An HTTP server exposing an AnalysisJobQueue."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], jobs: AnalysisJobQueue, max_body_bytes: int = config.SERVER_MAX_BODY_BYTES):
+        super().__init__(address, JobRequestHandler)
+        self.jobs = jobs
+        self.max_body_bytes = max_body_bytes
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """Handles the job API requests (see the module docstring for the endpoints)."""
+
+    server_version = "DocAnalyzer"
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        parts = [part for part in path.split("/") if part]
+        if parts == ["health"]:
+            self._send_json(200, {"status": "ok", **self.server.jobs.stats()})
+            return
+        if len(parts) not in (2, 3) or parts[0] != "jobs" or (len(parts) == 3 and parts[2] != "report"):
+            self._send_json(404, {"error": f"No such endpoint: {path}"})
+            return
+        job = self.server.jobs.get(parts[1])
+        if job is None:
+            self._send_json(404, {"error": f"Unknown job: {parts[1]}"})
+            return
+        if len(parts) == 2:
+            self._send_json(200, job.to_dict())
+            return
+
+        if job.status != "done":
+            self._send_json(409, {"error": f"The job is {job.status}; no report is available.", "job": job.to_dict()})
+            return
+        report_format = parse_qs(query).get("format", ["markdown"])[0]
+        if report_format == "json":
+            self._send_json(200, {"job": job.to_dict(), "report_markdown": job.report, "results": job.details})
+        elif report_format == "markdown":
+            self._send(200, job.report.encode("utf-8"), "text/markdown; charset=utf-8")
+        else:
+            self._send_json(400, {"error": f"Unknown report format '{report_format}'. Expected 'markdown' or 'json'."})
+
+    def do_POST(self):
+        if self.path.partition("?")[0].rstrip("/") != "/jobs":
+            self._send_json(404, {"error": f"No such endpoint: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0 or length > self.server.max_body_bytes:
+            self._send_json(413, {"error": f"The request body must be at most {self.server.max_body_bytes} bytes."})
+            return
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(body, dict):
+                raise ValueError("The request body must be a JSON object.")
+            url, html = body.get("url"), body.get("html")
+            if url is not None and not isinstance(url, str) or html is not None and not isinstance(html, str):
+                raise ValueError("'url' and 'html' must be strings.")
+            if not url and not html:
+                raise ValueError("Submit a 'url' to analyze, or the page's 'html'.")
+            options = validate_options(body.get("options", {}))
+        except ValueError as e: # Includes JSON decoding errors
+            self._send_json(400, {"error": str(e)})
+            return
+
+        try:
+            job = self.server.jobs.submit(url, html, options)
+        except QueueFullError as e:
+            self._send_json(503, {"error": str(e)}, {"Retry-After": "30"})
+            return
+        self._send_json(202, job.to_dict(), {"Location": f"/jobs/{job.id}"})
+
+    def _send_json(self, status: int, payload: dict, headers: dict | None = None):
+        # default=str covers values such as NumPy scalars in the analyzer results.
+        self._send(status, json.dumps(payload, default=str).encode("utf-8"), "application/json", headers)
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: dict | None = None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Parses the command-line arguments."""
+    arg_parser = argparse.ArgumentParser(description="Run the analysis server: a local HTTP API that queues and runs analysis jobs.")
+    arg_parser.add_argument("--host", default=config.SERVER_HOST, help="Address to listen on.")
+    arg_parser.add_argument("--port", type=int, default=config.SERVER_PORT, help="Port to listen on.")
+    arg_parser.add_argument("--workers", type=int, default=config.SERVER_WORKERS, help="Number of jobs analyzed concurrently.")
+    arg_parser.add_argument("--queue-size", type=int, default=config.SERVER_QUEUE_SIZE,
+                            help="Maximum number of waiting jobs; further submissions get 503 until the queue drains.")
+    arg_parser.add_argument("--warm-browser", action="store_true",
+                            help="Launch the headless browser at start-up instead of on the first page that needs it.")
+    add_analysis_arguments(arg_parser)
+    return arg_parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        jobs = AnalysisJobQueue(
+            workers=args.workers,
+            queue_size=args.queue_size,
+            cache_mode=args.cache_mode,
+            html_cache_mode=args.html_cache_mode,
+            cassette=cassette_from_args(args),
+            warm_browser=args.warm_browser,
+            **analysis_options(args)
+        )
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    server = JobHTTPServer((args.host, args.port), jobs)
+    print(f"Analysis server listening on http://{args.host}:{server.server_address[1]} "
+          f"with {jobs.workers} workers (queue size {args.queue_size}).")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.server_close()
+        jobs.close()
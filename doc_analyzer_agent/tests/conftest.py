@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Shared fixtures for the test suite.
+
+The tests run offline: LLM calls go to the fake backend in benchmarks/fake_llm.py,
+pages are served from benchmarks/fixtures/ by a local HTTP server, and every
+on-disk cache and checkpoint directory is redirected to a temporary directory.
+"""
+
+import contextlib
+import functools
+import io
+import os
+import shutil
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, "..", "benchmarks"))
+sys.path.insert(0, os.path.join(TESTS_DIR, "..", "src"))
+
+import config
+from core.llm_service import LLMService
+from fake_llm import FakeGeminiModel
+from pipeline_benchmark import QuietHandler, FIXTURES_DIR
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Keeps caches, section results and checkpoints of each test in its own directory."""
+    monkeypatch.setattr(config, "LLM_CACHE_PATH", str(tmp_path / "cache" / "llm_responses.sqlite3"))
+    monkeypatch.setattr(config, "HTML_CACHE_DIR", str(tmp_path / "cache" / "html"))
+    monkeypatch.setattr(config, "SECTION_STORE_DIR", str(tmp_path / "cache" / "sections"))
+    monkeypatch.setattr(config, "CHECKPOINT_DIR", str(tmp_path / "cache" / "checkpoints"))
+
+@pytest.fixture
+def fake_model():
+    """A FakeGeminiModel that answers immediately and never fails."""
+    return FakeGeminiModel(latency=0.0, jitter=0.0)
+
+@pytest.fixture
+def llm_service(fake_model):
+    """An LLMService backed by `fake_model`, without the response cache."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return LLMService(cache_mode="bypass", model=fake_model)
+
+@pytest.fixture
+def site(tmp_path):
+    """Serves a copy of the HTML fixtures (which tests may edit) and yields (directory, base URL)."""
+    directory = tmp_path / "site"
+    shutil.copytree(FIXTURES_DIR, directory)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=str(directory)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield directory, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Helpers shared by the tests that run the whole pipeline."""
+
+import contextlib
+import io
+import re
+
+from main import run_analysis
+
+def analyze(url: str, llm_service, **kwargs) -> str | None:
+    """Runs the pipeline quietly, without the HTML cache, report reuse or report output (unless overridden)."""
+    options = {"html_cache_mode": "bypass", "reuse_unchanged": False, **kwargs}
+    with contextlib.redirect_stdout(io.StringIO()):
+        return run_analysis(url, llm_service=llm_service, output_path=None, print_report=False, **options)
+
+def calls_for(model, run) -> int:
+    """Returns how many LLM calls `model` received while `run()` ran."""
+    before = model.calls
+    run()
+    return model.calls - before
+
+def comparable(report: str) -> str:
+    """Drops the parts of a report that differ between otherwise identical runs."""
+    return re.sub(r"(?s)## LLM Usage.*", "", re.sub(r"\*\*Report Generated:\*\*.*", "", report))
+
+def add_paragraph(path, text: str):
+    """Adds a paragraph at the start of a served fixture's article body."""
+    html = path.read_text(encoding="utf-8")
+    start = html.index("<p>", html.index("article-body"))
+    path.write_text(html[:start] + f"<p>{text}</p>" + html[start:], encoding="utf-8")
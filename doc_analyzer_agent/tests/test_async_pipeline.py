@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import contextlib
+import inspect
+import io
+
+import pytest
+
+from main import _analysis_steps, arun_analysis, run_analysis
+from tests.helpers import analyze, comparable
+
+@pytest.mark.parametrize("options", [
+    {"analyzer_mode": "separate", "grouper_mode": "llm"},
+    {"analyzer_mode": "combined", "grouper_mode": "fused"},
+    {"max_chunk_tokens": 800, "grouper_mode": "local-named"},
+    {"analyzer_mode": "fast"},
+])
+def test_async_pipeline_matches_the_sync_one(site, llm_service, options):
+    _, base_url = site
+    url = f"{base_url}/medium.html"
+    sync_report = analyze(url, llm_service, **options)
+    with contextlib.redirect_stdout(io.StringIO()):
+        async_report = asyncio.run(arun_analysis(
+            url, llm_service=llm_service, html_cache_mode="bypass", reuse_unchanged=False,
+            output_path=None, print_report=False, **options
+        ))
+    assert async_report is not None
+    assert comparable(async_report) == comparable(sync_report)
+
+def test_async_pipeline_rejects_unknown_arguments():
+    with pytest.raises(TypeError):
+        asyncio.run(arun_analysis("https://example.com", analyzer_modes="fast"))
+
+def test_both_drivers_pass_every_argument():
+    assert list(inspect.signature(run_analysis).parameters) == list(inspect.signature(_analysis_steps).parameters)
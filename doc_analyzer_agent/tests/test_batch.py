@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+import json
+import warnings
+
+import pytest
+
+from batch import run_batch
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_batch_writes_reports_and_an_index(site, llm_service, tmp_path, use_async):
+    _, base_url = site
+    urls = [f"{base_url}/small.html", f"{base_url}/medium.html", f"{base_url}/missing.html"]
+    output_dir = tmp_path / "reports"
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", DeprecationWarning)
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = run_batch(urls, str(output_dir), workers=2, html_cache_mode="bypass", use_async=use_async,
+                                llm_service=llm_service, reuse_unchanged=False)
+
+    assert [r["url"] for r in results] == urls
+    assert [r["status"] for r in results] == ["ok", "ok", "failed"]
+    assert all((output_dir / r["report"]).exists() for r in results[:2])
+    index = json.loads((output_dir / "index.json").read_text(encoding="utf-8"))
+    assert index["succeeded"] == 2
+    assert (output_dir / "index.md").read_text(encoding="utf-8").startswith("# Batch Analysis Index")
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+import json
+
+import pytest
+
+from core.cassette import Cassette, CassetteMissError
+from core.llm_service import LLMService
+from fake_llm import FakeGeminiModel
+
+def test_record_appends_each_prompt_once(tmp_path):
+    path = tmp_path / "cassettes" / "run.jsonl"
+    cassette = Cassette(str(path), "record")
+    cassette.record("prompt one", '{"a": 1}', "readability", prompt_tokens=3, response_tokens=2, latency_seconds=0.123456)
+    cassette.record("prompt one", '{"a": 2}', "readability")
+    cassette.record("prompt two", '{"b": 1}', "summary")
+
+    entries = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [e["prompt"] for e in entries] == ["prompt one", "prompt two"]
+    assert entries[0]["response"] == '{"a": 1}'
+    assert entries[0]["latency_seconds"] == 0.1235
+
+def test_replay_serves_recorded_responses(tmp_path):
+    path = tmp_path / "run.jsonl"
+    Cassette(str(path), "record").record("prompt", '{"a": 1}', "readability", prompt_tokens=3, response_tokens=2, latency_seconds=0.5)
+
+    cassette = Cassette(str(path), "replay", latency_scale=2)
+    recorded = cassette.play("prompt", "readability")
+    assert recorded.text == '{"a": 1}'
+    assert recorded.usage_metadata.prompt_token_count == 3
+    assert recorded.usage_metadata.candidates_token_count == 2
+    assert cassette.replay_delay(recorded) == 1.0
+    with pytest.raises(CassetteMissError):
+        cassette.play("a changed prompt", "readability")
+
+def test_invalid_mode_or_missing_cassette_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        Cassette(str(tmp_path / "run.jsonl"), "rewind")
+    with pytest.raises(ValueError):
+        Cassette(str(tmp_path / "missing.jsonl"), "replay")
+
+def test_llm_service_replays_a_recording_without_calling_the_model(tmp_path):
+    path = str(tmp_path / "run.jsonl")
+    prompt = 'Respond with a JSON object containing "summary".'
+    with contextlib.redirect_stdout(io.StringIO()):
+        recording = LLMService(cache_mode="bypass", model=FakeGeminiModel(latency=0.0, jitter=0.0),
+                               cassette=Cassette(path, "record"))
+        recorded = recording.query_llm(prompt, stage="summary")
+
+        model = FakeGeminiModel(latency=0.0, jitter=0.0)
+        replaying = LLMService(cache_mode="bypass", model=model, cassette=Cassette(path, "replay"))
+        replayed = replaying.query_llm(prompt, stage="summary")
+        with pytest.raises(CassetteMissError):
+            replaying.query_llm("A prompt that was never recorded.", stage="summary")
+
+    assert replayed == recorded
+    assert model.calls == 0
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+import json
+import os
+
+import pytest
+
+from analyzers.readability import ReadabilityAnalyzer
+from core.checkpoint_store import CheckpointStore, DocumentCheckpoints
+from core.llm_service import LLMService
+from fake_llm import FakeBackendError, FakeGeminiModel
+from main import run_analysis
+import config
+from tests.helpers import add_paragraph, analyze, calls_for
+
+URL = "https://example.com/docs/article"
+
+def test_checkpoints_are_reused_only_for_the_same_inputs(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    key = CheckpointStore.hash_inputs("markdown", {"analyzer_mode": "separate"})
+    store.put(URL, "analyze", key, {"suggestions": ["Add an example."]})
+
+    assert store.get(URL, "analyze", key) == {"suggestions": ["Add an example."]}
+    assert store.get(URL, "analyze", CheckpointStore.hash_inputs("changed markdown", {"analyzer_mode": "separate"})) is None
+    assert store.get(URL, "parse", key) is None
+    assert store.get("https://example.com/other", "analyze", key) is None
+
+def test_hash_inputs_ignores_key_order():
+    assert CheckpointStore.hash_inputs({"a": 1, "b": 2}) == CheckpointStore.hash_inputs({"b": 2, "a": 1})
+    assert CheckpointStore.hash_inputs({"a": 1}) != CheckpointStore.hash_inputs({"a": 2})
+
+def test_unreadable_checkpoint_is_ignored(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    store.put(URL, "parse", "key", "markdown")
+    path = store._path(URL, "parse")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{not json")
+    assert store.get(URL, "parse", "key") is None
+    store.put(URL, "parse", "key", "markdown")
+    with open(path, "r", encoding="utf-8") as f:
+        assert json.load(f)["output"] == "markdown"
+
+def test_document_checkpoints_load_only_when_resuming(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    DocumentCheckpoints(store, URL).save("parse", "key", "markdown")
+
+    assert DocumentCheckpoints(store, URL).load("parse", "parse", "key") is None
+    assert DocumentCheckpoints(store, URL, resume=True).load("parse", "parse", "key") == "markdown"
+    assert DocumentCheckpoints(None, URL, resume=True).load("parse", "parse", "key") is None
+
+def test_rerun_from_skips_that_stage_and_later_ones(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    for stage in ("parse", "analyze", "prioritize"):
+        store.put(URL, stage, "key", stage)
+
+    checkpoints = DocumentCheckpoints(store, URL, rerun_from="analyze")
+    assert checkpoints.resume
+    assert checkpoints.load("parse", "parse", "key") == "parse"
+    assert checkpoints.load("analyze", "analyze", "key") is None
+    assert checkpoints.load("prioritize", "prioritize", "key") is None
+    with pytest.raises(ValueError):
+        DocumentCheckpoints(store, URL, rerun_from="deploy")
+
+def test_failed_stages_are_not_saved(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    checkpoints = DocumentCheckpoints(store, URL, resume=True)
+    checkpoints.save("analyze", "key", {"error": "timeout"}, succeeded=False)
+    assert checkpoints.load("analyze", "analyze", "key") is None
+
+def test_checkpoints_are_off_by_default(site, llm_service):
+    _, base_url = site
+    analyze(f"{base_url}/small.html", llm_service)
+    assert not os.path.exists(config.CHECKPOINT_DIR)
+
+def test_resume_reuses_checkpoints_and_revalidates_the_page(site, llm_service, fake_model):
+    directory, base_url = site
+    url = f"{base_url}/medium.html"
+    analyze(url, llm_service, html_cache_mode="use", checkpoint=True)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        calls = calls_for(fake_model, lambda: run_analysis(url, llm_service=llm_service, reuse_unchanged=False, resume=True,
+                                                          output_path=None, print_report=False))
+    assert calls == 0
+    assert "not modified" in output.getvalue().lower()
+
+    # The HTML cache is fresh, but resuming still asks the server whether the page changed.
+    page = directory / "medium.html"
+    add_paragraph(page, "A new paragraph explains how escalations are routed.")
+    os.utime(page, (os.path.getmtime(page) + 5,) * 2) # Last-Modified has a resolution of one second
+    details = {}
+    assert calls_for(fake_model, lambda: analyze(url, llm_service, html_cache_mode="use", resume=True, details=details)) > 0
+    assert details["fetch_source"] != "cache"
+
+def test_prompt_changes_invalidate_the_analyze_checkpoint(site, llm_service, fake_model, monkeypatch):
+    _, base_url = site
+    url = f"{base_url}/medium.html"
+    first = calls_for(fake_model, lambda: analyze(url, llm_service, checkpoint=True))
+    build_prompt = ReadabilityAnalyzer._build_prompt
+    monkeypatch.setattr(ReadabilityAnalyzer, "_build_prompt", lambda self, text: "Be brief.\n" + build_prompt(self, text))
+    assert calls_for(fake_model, lambda: analyze(url, llm_service, checkpoint=True, resume=True)) == first
+
+@pytest.mark.parametrize("stage, reruns_analyzers", [("analyze", True), ("group", False), ("format", False)])
+def test_rerun_from_reruns_that_stage_and_later_ones(site, llm_service, fake_model, stage, reruns_analyzers):
+    _, base_url = site
+    url = f"{base_url}/medium.html"
+    first = calls_for(fake_model, lambda: analyze(url, llm_service, checkpoint=True))
+    rerun = calls_for(fake_model, lambda: analyze(url, llm_service, rerun_from=stage))
+    if reruns_analyzers:
+        assert rerun == first
+    elif stage == "format":
+        assert rerun == 0
+    else:
+        # Grouping and the summary only.
+        assert 0 < rerun < first
+
+class FlakyModel(FakeGeminiModel):
+    """A FakeGeminiModel that rejects the first `failures` style adherence prompts."""
+
+    failures = 1
+
+    def _respond(self, prompt, fail):
+        if self.failures and "style guide" in prompt.lower():
+            self.failures -= 1
+            raise FakeBackendError("Invalid argument", 400)
+        return super()._respond(prompt, fail)
+
+@pytest.mark.parametrize("max_chunk_tokens", [0, 800])
+def test_failed_results_are_not_checkpointed(site, max_chunk_tokens):
+    _, base_url = site
+    url = f"{base_url}/large.html"
+    model = FlakyModel(latency=0.0, jitter=0.0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        llm_service = LLMService(cache_mode="bypass", model=model)
+
+    details = {}
+    first = calls_for(model, lambda: analyze(url, llm_service, max_chunk_tokens=max_chunk_tokens, checkpoint=True, details=details))
+    style = details["analysis_results"]["style_adherence"]
+    if max_chunk_tokens:
+        # One chunk failed: the merged result is usable but marked incomplete.
+        assert style.get("failed_parts") and not style.get("failed")
+    else:
+        assert style.get("failed")
+
+    retried = calls_for(model, lambda: analyze(url, llm_service, max_chunk_tokens=max_chunk_tokens, resume=True, details=details))
+    assert retried > 0
+    if not max_chunk_tokens:
+        # Only the failed analyzer runs again, then the stages after it.
+        assert retried < first
+    assert not any(result.get("failed_parts") or result.get("failed") for result in details["analysis_results"].values())
+    assert calls_for(model, lambda: analyze(url, llm_service, max_chunk_tokens=max_chunk_tokens, resume=True)) == 0
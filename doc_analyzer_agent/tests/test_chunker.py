@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+from core.chunker import chunk_markdown, estimate_tokens
+import config
+from tests.helpers import analyze, calls_for
+
+def test_estimate_tokens_uses_characters_per_token():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("a") == 1
+    assert estimate_tokens("a" * 40) == 40 // config.CHARS_PER_TOKEN
+
+def test_small_document_is_a_single_chunk():
+    markdown = "# Title\n\nIntro paragraph.\n\n## Setup\n\nInstall it."
+    chunks = chunk_markdown(markdown, max_tokens=1000)
+    assert len(chunks) == 1
+    assert chunks[0].heading == "Title"
+    assert "Install it." in chunks[0].text
+
+def test_sections_are_packed_into_chunks_within_the_budget():
+    sections = [f"## Section {i}\n\n" + " ".join(["word"] * 30) for i in range(10)]
+    markdown = "\n\n".join(sections)
+    max_tokens = 100
+    chunks = chunk_markdown(markdown, max_tokens=max_tokens)
+
+    assert len(chunks) > 1
+    assert all(len(c.text) <= max_tokens * config.CHARS_PER_TOKEN for c in chunks)
+    assert [c.heading for c in chunks][0] == "Section 0"
+    # Every section ends up in exactly one chunk, in order, and whole.
+    assert "\n\n".join(c.text for c in chunks) == markdown
+
+def test_oversized_section_is_split_without_breaking_code_blocks():
+    code = "```python\n" + "\n\n".join(f"print({i})" for i in range(20)) + "\n```"
+    paragraphs = [" ".join(["text"] * 40) for _ in range(4)]
+    markdown = "## Big section\n\n" + "\n\n".join(paragraphs[:2] + [code] + paragraphs[2:])
+    chunks = chunk_markdown(markdown, max_tokens=60)
+
+    assert len(chunks) > 1
+    assert sum(c.text.count("```") for c in chunks) == 2
+    assert any(code in c.text for c in chunks)
+
+def test_single_long_line_is_split_as_a_last_resort():
+    markdown = "## Long line\n\n" + "x" * 1000
+    max_tokens = 50
+    chunks = chunk_markdown(markdown, max_tokens=max_tokens)
+    assert all(len(c.text) <= max_tokens * config.CHARS_PER_TOKEN for c in chunks)
+    assert "".join(c.text for c in chunks).count("x") == 1000
+
+def test_chunk_hashes_follow_their_content():
+    first = chunk_markdown("## A\n\nSame text.", max_tokens=1000)[0]
+    second = chunk_markdown("## A\n\nSame text.", max_tokens=1000)[0]
+    changed = chunk_markdown("## A\n\nOther text.", max_tokens=1000)[0]
+    assert first.content_hash == second.content_hash != changed.content_hash
+
+def test_long_documents_are_analyzed_in_chunks(site, llm_service, fake_model):
+    _, base_url = site
+    url = f"{base_url}/large.html"
+    details = {}
+    whole = calls_for(fake_model, lambda: analyze(url, llm_service, max_chunk_tokens=0))
+    chunked = calls_for(fake_model, lambda: analyze(url, llm_service, max_chunk_tokens=800, details=details))
+    assert chunked > whole
+    assert details["analysis_stats"]["Chunking"]["chunks"] > 1
+    assert details["analysis_stats"]["Chunking"]["largest_chunk_tokens"] <= 800
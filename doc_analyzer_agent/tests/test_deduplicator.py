@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import itertools
+
+from processing.deduplicator import _candidate_pairs, _jaccard, _shingles, deduplicate_suggestions
+
+def suggestion(text: str, source: str) -> dict:
+    return {"suggestion": text, "source": source}
+
+def test_near_duplicates_are_merged_keeping_every_source():
+    suggestions = [
+        suggestion("Define the term webhook before using it in the setup section.", "Readability"),
+        suggestion("Add a worked example of the billing export.", "Completeness & Examples"),
+        suggestion("Define the term webhook before it is used in the setup section.", "Style Adherence"),
+    ]
+    deduplicated, stats = deduplicate_suggestions(suggestions)
+
+    assert [s["suggestion"] for s in deduplicated] == [suggestions[0]["suggestion"], suggestions[1]["suggestion"]]
+    assert deduplicated[0]["source"] == "Readability, Style Adherence"
+    assert deduplicated[0]["merged_suggestions"] == [suggestions[2]["suggestion"]]
+    assert stats == {"suggestions_before": 3, "suggestions_after": 2, "near_duplicates_merged": 1}
+
+def test_suggestions_quoting_different_passages_are_kept_apart():
+    suggestions = [
+        suggestion('Shorten the sentence "Configure the webhook endpoint before enabling retries."', "Readability"),
+        suggestion('Shorten the sentence "Export invoices monthly from the billing dashboard."', "Readability"),
+    ]
+    deduplicated, _ = deduplicate_suggestions(suggestions, threshold=0.1)
+    assert len(deduplicated) == 2
+
+def test_suggestions_without_shingles_are_never_merged():
+    suggestions = [suggestion("", "Readability"), suggestion("The.", "Structure & Flow"), suggestion("!!!", "Style Adherence")]
+    deduplicated, stats = deduplicate_suggestions(suggestions)
+    assert len(deduplicated) == 3
+    assert stats["near_duplicates_merged"] == 0
+    assert _jaccard(frozenset(), frozenset()) == 0.0
+
+def test_minhash_finds_the_similar_pairs_among_many_suggestions():
+    topics = ["webhook retries", "billing export", "api token rotation", "dashboard filters", "error codes"]
+    texts = []
+    for topic, variant in itertools.product(topics, range(3)):
+        texts.append(f"Explain how {topic} work and add an example of {topic} to the guide section {variant}.")
+    for i in range(200):
+        texts.append(f"Unrelated suggestion number {i} about paragraph {i * 7} and heading {i * 13}.")
+    shingle_sets = [_shingles(t) for t in texts]
+
+    pairs = _candidate_pairs(shingle_sets)
+    similar = {(i, j) for i, j in itertools.combinations(range(len(texts)), 2) if _jaccard(shingle_sets[i], shingle_sets[j]) >= 0.6}
+    found = {tuple(sorted(p)) for p in pairs}
+    # LSH may miss a rare pair, but the groups must stay connected.
+    assert len(similar & found) >= 0.9 * len(similar)
+    deduplicated, _ = deduplicate_suggestions([suggestion(t, "Readability") for t in texts])
+    assert len(deduplicated) < len(texts) - len(topics)
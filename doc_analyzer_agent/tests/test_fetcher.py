@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+
+import pytest
+
+from core.fetcher import Fetcher, needs_browser
+
+ARTICLE = '<html><body><div class="article-body"><p>Hello.</p></div></body></html>'
+SPA_SHELL = '<html><body><div class="article-body-wrapper"><div id="root"></div></div></body></html>'
+
+class StubBrowserPool:
+    """A BrowserPool stand-in that returns fixed HTML, or raises it if it is an exception."""
+
+    def __init__(self, result):
+        self.result = result
+        self.fetched = []
+
+    def fetch(self, url: str) -> str | None:
+        self.fetched.append(url)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+    def close(self):
+        pass
+
+@pytest.mark.parametrize("html, needs", [
+    (ARTICLE, False),
+    ('<div class="help-center article-body main"><p>Hello.</p></div>', False),
+    ("", True),
+    ('<div class="article-body"></div>', True),
+    (SPA_SHELL, True),
+    ('<div class="my-article-body"><p>Hello.</p></div>', True),
+    ("<title>Just a moment...</title>", True),
+])
+def test_needs_browser(html, needs):
+    assert (needs_browser(html) is not None) == needs
+
+def fetch(fetcher: Fetcher, url: str):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fetcher.fetch(url)
+
+def serve(site, name: str, html: str) -> str:
+    directory, base_url = site
+    (directory / name).write_text(html, encoding="utf-8")
+    return f"{base_url}/{name}"
+
+def test_static_pages_are_fetched_over_http(site):
+    pool = StubBrowserPool(ARTICLE)
+    result = fetch(Fetcher(browser_pool=pool, cache_mode="bypass"), serve(site, "article.html", ARTICLE))
+    assert result.source == "http"
+    assert result.html == ARTICLE
+    assert pool.fetched == []
+
+def test_javascript_rendered_pages_fall_back_to_the_browser(site):
+    pool = StubBrowserPool(ARTICLE)
+    url = serve(site, "shell.html", SPA_SHELL)
+    result = fetch(Fetcher(browser_pool=pool, cache_mode="bypass"), url)
+    assert result.source == "browser"
+    assert result.html == ARTICLE
+    assert pool.fetched == [url]
+
+def test_http_errors_fall_back_to_the_browser(site):
+    _, base_url = site
+    result = fetch(Fetcher(browser_pool=StubBrowserPool(ARTICLE), cache_mode="bypass"), f"{base_url}/missing.html")
+    assert result.source == "browser"
+    assert result.status_code == 404
+
+@pytest.mark.parametrize("browser_result", [RuntimeError("Executable doesn't exist"), None])
+def test_failed_browser_fallback_returns_none(site, browser_result):
+    _, base_url = site
+    assert fetch(Fetcher(browser_pool=StubBrowserPool(browser_result), cache_mode="bypass"), f"{base_url}/missing.html") is None
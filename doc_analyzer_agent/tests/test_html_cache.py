@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+import os
+
+import pytest
+
+import config
+from core.fetcher import Fetcher
+from core.html_cache import HTMLCache
+from tests.helpers import analyze, calls_for
+
+URL = "https://example.com/docs/article"
+
+def test_pages_round_trip_with_their_validators(tmp_path):
+    cache = HTMLCache(str(tmp_path))
+    cache.put(URL, "<p>Café — ünïcode</p>", etag='"v1"', last_modified="Mon, 05 Oct 2026 10:00:00 GMT", source="browser")
+
+    page = HTMLCache(str(tmp_path)).get(URL)
+    assert page.html == "<p>Café — ünïcode</p>"
+    assert page.etag == '"v1"'
+    assert page.last_modified == "Mon, 05 Oct 2026 10:00:00 GMT"
+    assert page.source == "browser"
+    assert page.age_seconds() < 60
+    assert cache.get("https://example.com/other") is None
+
+def test_reports_are_reused_only_for_the_same_html_and_variant(tmp_path):
+    cache = HTMLCache(str(tmp_path))
+    cache.put(URL, "<p>v1</p>")
+    cache.store_report(URL, "# Report", variant="separate")
+
+    assert cache.load_report(URL, "separate") == "# Report"
+    assert cache.load_report(URL, "combined") is None
+    cache.put(URL, "<p>v1</p>") # Refetched, unchanged
+    assert cache.load_report(URL, "separate") == "# Report"
+    cache.put(URL, "<p>v2</p>")
+    assert cache.load_report(URL, "separate") is None
+
+def test_unreadable_metadata_is_a_miss(tmp_path):
+    cache = HTMLCache(str(tmp_path))
+    cache.put(URL, "<p>v1</p>")
+    with open(os.path.join(str(tmp_path), f"{cache._key(URL)}.json"), "w", encoding="utf-8") as f:
+        f.write("{not json")
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert cache.get(URL) is None
+
+def fetch(fetcher: Fetcher, url: str, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fetcher.fetch(url, **kwargs)
+
+def test_stale_pages_are_revalidated_with_a_conditional_get(site, tmp_path):
+    directory, base_url = site
+    url = f"{base_url}/small.html"
+    cache = HTMLCache(str(tmp_path / "html"))
+
+    first = fetch(Fetcher(html_cache=cache, max_age_seconds=3600), url)
+    assert (first.source, first.not_modified) == ("http", False)
+    fresh = fetch(Fetcher(html_cache=cache, max_age_seconds=3600), url)
+    assert (fresh.source, fresh.status_code, fresh.not_modified) == ("cache", None, True)
+
+    stale = fetch(Fetcher(html_cache=cache, max_age_seconds=0), url)
+    assert (stale.source, stale.status_code, stale.not_modified) == ("cache", 304, True)
+    assert stale.html == first.html
+    forced = fetch(Fetcher(html_cache=cache, max_age_seconds=3600), url, revalidate=True)
+    assert forced.status_code == 304
+
+    page = directory / "small.html"
+    page.write_text(page.read_text(encoding="utf-8").replace("</body>", "<p>Changed.</p></body>"), encoding="utf-8")
+    os.utime(page, (os.path.getmtime(page) + 5,) * 2) # Last-Modified has a resolution of one second
+    changed = fetch(Fetcher(html_cache=cache, max_age_seconds=0), url)
+    assert (changed.source, changed.status_code, changed.not_modified) == ("http", 200, False)
+    assert "Changed." in cache.get(url).html
+
+def test_cache_only_mode_never_touches_the_network(tmp_path):
+    cache = HTMLCache(str(tmp_path))
+    cache.put(URL, "<p>Cached.</p>")
+    cache_only = Fetcher(html_cache=cache, cache_mode="cache-only", max_age_seconds=0)
+    assert fetch(cache_only, URL).html == "<p>Cached.</p>"
+    assert fetch(cache_only, "https://example.com/uncached") is None
+
+@pytest.mark.parametrize("change", ["model", "dedup", "readability_metrics_in_prompt", "analyzer_mode"])
+def test_previous_report_is_reused_only_for_the_same_settings(site, llm_service, fake_model, monkeypatch, change):
+    _, base_url = site
+    url = f"{base_url}/small.html"
+    first = calls_for(fake_model, lambda: analyze(url, llm_service, html_cache_mode="use", reuse_unchanged=True))
+    assert first > 0
+    assert calls_for(fake_model, lambda: analyze(url, llm_service, html_cache_mode="use", reuse_unchanged=True)) == 0
+
+    options = {}
+    if change == "model":
+        fake_model.model_name = "fake-gemini-2"
+        llm_service.model_name = fake_model.model_name
+    elif change == "dedup":
+        monkeypatch.setattr(config, "DEDUP_ENABLED", not config.DEDUP_ENABLED)
+    elif change == "readability_metrics_in_prompt":
+        monkeypatch.setattr(config, "READABILITY_METRICS_IN_PROMPT", not config.READABILITY_METRICS_IN_PROMPT)
+    else:
+        options["analyzer_mode"] = "combined"
+    rerun = calls_for(fake_model, lambda: analyze(url, llm_service, html_cache_mode="use", reuse_unchanged=True, **options))
+    assert rerun > 0
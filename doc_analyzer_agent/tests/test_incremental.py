@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import config
+from analyzers.readability import ReadabilityAnalyzer
+from analyzers.rule_based import rule_based_analyzers
+from analyzers.runner import analyzer_prompt_version
+from core.section_store import SectionResultStore
+from tests.helpers import add_paragraph, analyze, calls_for
+
+def test_section_results_are_keyed_by_variant(tmp_path):
+    store = SectionResultStore(str(tmp_path))
+    store.put("readability", "hash", {"suggestions": ["Shorten it."]}, variant="model|separate|v1")
+    assert store.get("readability", "hash", "model|separate|v1") == {"suggestions": ["Shorten it."]}
+    assert store.get("readability", "hash", "model|separate|v2") is None
+    assert store.get("readability", "other-hash", "model|separate|v1") is None
+
+def test_incremental_runs_reanalyze_only_changed_sections(site, llm_service, fake_model):
+    directory, base_url = site
+    url = f"{base_url}/large.html"
+    first = calls_for(fake_model, lambda: analyze(url, llm_service, incremental=True))
+    unchanged = calls_for(fake_model, lambda: analyze(url, llm_service, incremental=True))
+    add_paragraph(directory / "large.html", "A new paragraph explains how escalations are routed.")
+    changed = calls_for(fake_model, lambda: analyze(url, llm_service, incremental=True))
+    # Prioritization, grouping and the summary always run; analyzer calls shrink.
+    assert unchanged < changed < first
+
+@pytest.mark.parametrize("change", ["template", "metrics_in_prompt"])
+def test_prompt_changes_invalidate_stored_sections(site, llm_service, fake_model, monkeypatch, change):
+    _, base_url = site
+    url = f"{base_url}/large.html"
+    first = calls_for(fake_model, lambda: analyze(url, llm_service, incremental=True))
+    unchanged = calls_for(fake_model, lambda: analyze(url, llm_service, incremental=True))
+
+    if change == "template":
+        build_prompt = ReadabilityAnalyzer._build_prompt
+        monkeypatch.setattr(ReadabilityAnalyzer, "_build_prompt", lambda self, text: "Be brief.\n" + build_prompt(self, text))
+    else:
+        # The analyzers read the setting when main.py creates them.
+        monkeypatch.setattr(config, "READABILITY_METRICS_IN_PROMPT", True)
+        monkeypatch.setattr(ReadabilityAnalyzer.__init__, "__defaults__", (True,))
+    changed = calls_for(fake_model, lambda: analyze(url, llm_service, incremental=True))
+    # Every section is sent to the readability analyzer again, but not to the others.
+    assert unchanged < changed < first
+
+def test_prompt_version_follows_the_prompt(llm_service):
+    version = analyzer_prompt_version(ReadabilityAnalyzer(llm_service))
+    assert version == analyzer_prompt_version(ReadabilityAnalyzer(llm_service))
+    assert version != analyzer_prompt_version(ReadabilityAnalyzer(llm_service, include_metrics=True))
+    rules = rule_based_analyzers()
+    assert len({analyzer_prompt_version(analyzer) for analyzer in rules.values()}) == len(rules)
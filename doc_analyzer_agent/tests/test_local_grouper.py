@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+
+import numpy as np
+
+from processing.local_grouper import OTHER_THEME, LocalSuggestionGrouper, _spherical_kmeans, _tfidf_matrix
+
+SUGGESTIONS = [
+    "Define the jargon term webhook for new readers.",
+    "Add a code example showing the export request.",
+    "Define the jargon term idempotent in the glossary.",
+    "Add a code example of the retry configuration.",
+    "Define the jargon term payload where it first appears.",
+    "Add a code example for pagination.",
+]
+
+def group(texts: list[str], **kwargs) -> dict:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return LocalSuggestionGrouper(**kwargs).group([{"suggestion": t} for t in texts])
+
+def test_similar_suggestions_are_grouped_under_keyword_labels():
+    grouped = group(SUGGESTIONS)
+    themes = {label: [s["suggestion"] for s in items] for label, items in grouped.items()}
+
+    assert len(themes) == 2
+    jargon = next(items for label, items in themes.items() if "Jargon" in label)
+    example = next(items for label, items in themes.items() if "Example" in label)
+    assert jargon == [SUGGESTIONS[0], SUGGESTIONS[2], SUGGESTIONS[4]]
+    assert example == [SUGGESTIONS[1], SUGGESTIONS[3], SUGGESTIONS[5]]
+    # Themes are ordered by their highest-priority suggestion.
+    assert list(themes.values())[0][0] == SUGGESTIONS[0]
+
+def test_unrelated_suggestions_are_collected_under_other():
+    grouped = group(SUGGESTIONS + ["Fix the broken link to pricing.", "Mention supported browsers."])
+    assert list(grouped)[-1] == OTHER_THEME
+    assert len(grouped[OTHER_THEME]) == 2
+
+def test_every_suggestion_is_grouped_exactly_once():
+    grouped = group(SUGGESTIONS)
+    assert sorted(s["suggestion"] for items in grouped.values() for s in items) == sorted(SUGGESTIONS)
+    assert group([]) == {}
+
+def test_llm_names_replace_keyword_labels(llm_service, fake_model):
+    grouped = group(SUGGESTIONS, llm_service=llm_service, name_with_llm=True)
+    assert fake_model.calls == 1
+    assert all(label[-1].isdigit() for label in grouped)
+
+def test_tfidf_rows_are_unit_vectors():
+    matrix = _tfidf_matrix([["a", "b"], ["b", "c", "c"], []], {"a": 0, "b": 1, "c": 2})
+    assert np.allclose(np.linalg.norm(matrix[:2], axis=1), 1.0)
+    assert not matrix[2].any()
+
+def test_spherical_kmeans_separates_clear_clusters():
+    matrix = np.array([[1, 0], [0.99, 0.1], [0, 1], [0.1, 0.99]], dtype=np.float64)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    assert sorted(_spherical_kmeans(matrix, 2)) == [[0, 1], [2, 3]]
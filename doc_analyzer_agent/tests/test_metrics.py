@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import contextvars
+import json
+import threading
+
+import pytest
+
+import config
+from core.metrics import CallRecord, MetricsRecorder, collects_metrics, current_metrics, record_call
+
+@pytest.fixture(autouse=True)
+def prices(monkeypatch):
+    monkeypatch.setattr(config, "LLM_PRICE_PER_MILLION_PROMPT_TOKENS", 1.0)
+    monkeypatch.setattr(config, "LLM_PRICE_PER_MILLION_RESPONSE_TOKENS", 4.0)
+
+def recorder_with_calls() -> MetricsRecorder:
+    recorder = MetricsRecorder()
+    recorder.record(CallRecord("readability", prompt_tokens=1000, response_tokens=200, latency_seconds=1.5, attempts=1))
+    recorder.record(CallRecord("readability", prompt_tokens=3000, response_tokens=100, latency_seconds=2.25, attempts=3))
+    recorder.record(CallRecord("readability", latency_seconds=0.001, cache_hit=True))
+    recorder.record(CallRecord("grouper", prompt_tokens=500, response_tokens=500, latency_seconds=4.0, attempts=2))
+    recorder.record(CallRecord("prioritizer", latency_seconds=0.5, attempts=4, succeeded=False))
+    return recorder
+
+def test_summary_aggregates_totals_and_stages():
+    summary = recorder_with_calls().summary()
+    stages = summary.pop("stages")
+    assert summary == {
+        "calls": 5,
+        "cache_hits": 1,
+        "failed_calls": 1,
+        "retries": 6,
+        "prompt_tokens": 4500,
+        "response_tokens": 800,
+        "latency_seconds": 8.251,
+        "max_latency_seconds": 4.0,
+        "estimated_cost_usd": 0.0077,
+    }
+    assert stages["readability"] == {
+        "calls": 3,
+        "cache_hits": 1,
+        "failed_calls": 0,
+        "retries": 2,
+        "prompt_tokens": 4000,
+        "response_tokens": 300,
+        "latency_seconds": 3.751,
+        "max_latency_seconds": 2.25,
+        "estimated_cost_usd": 0.0052,
+    }
+    # Most expensive stage first.
+    assert list(stages) == ["readability", "grouper", "prioritizer"]
+
+def test_recorder_size_does_not_grow_with_the_calls():
+    recorder = MetricsRecorder()
+    for i in range(10_000):
+        recorder.record(CallRecord("readability" if i % 2 else "grouper", prompt_tokens=10, latency_seconds=0.001))
+    summary = recorder.summary()
+    assert (summary["calls"], summary["prompt_tokens"], summary["latency_seconds"]) == (10_000, 100_000, 10.0)
+    assert [stage["calls"] for stage in summary["stages"].values()] == [5_000, 5_000]
+    assert len(recorder._stages) == 2
+
+def test_empty_summary():
+    summary = MetricsRecorder().summary()
+    assert summary["calls"] == 0
+    assert summary["max_latency_seconds"] == 0.0
+    assert summary["stages"] == {}
+
+def test_write_json_adds_extra_keys(tmp_path):
+    path = tmp_path / "usage.json"
+    recorder_with_calls().write_json(str(path), url="https://example.com")
+    written = json.loads(path.read_text(encoding="utf-8"))
+    assert written["url"] == "https://example.com"
+    assert written["calls"] == 5
+    assert list(written["stages"]) == ["readability", "grouper", "prioritizer"]
+
+def test_collect_nests_and_records_each_call_once():
+    service_metrics, outer, inner = MetricsRecorder(), MetricsRecorder(), MetricsRecorder()
+    with outer.collect():
+        record_call(CallRecord("parse"), service_metrics)
+        with inner.collect():
+            assert current_metrics() is inner
+            record_call(CallRecord("analyze"), service_metrics, inner)
+        assert current_metrics() is outer
+    assert current_metrics() is None
+    assert [r.summary()["calls"] for r in (service_metrics, outer, inner)] == [2, 2, 1]
+
+def test_collect_reaches_threads_running_in_a_context_copy():
+    recorder = MetricsRecorder()
+    with recorder.collect():
+        threads = [
+            threading.Thread(target=contextvars.copy_context().run, args=(record_call, CallRecord("analyze")))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert recorder.summary()["calls"] == 8
+
+def test_collects_metrics_gives_each_call_its_own_recorder():
+    @collects_metrics
+    def document(calls):
+        for _ in range(calls):
+            record_call(CallRecord("analyze"))
+        return current_metrics().summary()["calls"]
+
+    @collects_metrics
+    async def adocument(calls):
+        await asyncio.sleep(0)
+        for _ in range(calls):
+            record_call(CallRecord("analyze"))
+        return current_metrics().summary()["calls"]
+
+    async def concurrent():
+        return await asyncio.gather(adocument(2), adocument(3))
+
+    assert document(2) == 2
+    assert asyncio.run(concurrent()) == [2, 3]
+    assert current_metrics() is None
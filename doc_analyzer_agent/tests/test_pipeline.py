@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+"""End-to-end runs of the pipeline on the HTML fixtures with the fake LLM backend."""
+
+import pytest
+
+from tests.helpers import analyze
+
+@pytest.mark.parametrize("analyzer_mode, grouper_mode", [
+    ("separate", "llm"),
+    ("separate", "local"),
+    ("separate", "local-named"),
+    ("combined", "fused"),
+    ("fast", "local"),
+])
+def test_pipeline_modes(site, llm_service, fake_model, analyzer_mode, grouper_mode):
+    _, base_url = site
+    details = {}
+    report = analyze(f"{base_url}/medium.html", llm_service, analyzer_mode=analyzer_mode, grouper_mode=grouper_mode, details=details)
+
+    assert report is not None
+    assert details["prioritized_suggestions"]
+    assert details["grouped_suggestions"]
+    assert details["executive_summary"]
+    assert all(not result.get("failed") for result in details["analysis_results"].values())
+    if analyzer_mode == "fast" and grouper_mode == "local":
+        assert fake_model.calls == 0
+    else:
+        assert fake_model.calls > 0
+
+def test_unreachable_page_ends_the_run(llm_service, fake_model):
+    assert analyze("http://127.0.0.1:9/unreachable.html", llm_service) is None
+    assert fake_model.calls == 0
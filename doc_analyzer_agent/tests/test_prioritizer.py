@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import re
+import threading
+
+import pytest
+
+from processing.prioritizer import SuggestionPrioritizer
+
+class ScoringLLMService:
+    """Scores every suggestion ID in the prompt, except IDs it is told to drop the first time it sees them."""
+
+    def __init__(self, impacts: dict, drop_once: set = frozenset()):
+        self.impacts = impacts
+        self.drop_once = set(drop_once)
+        self.prompt_ids = []
+        self._lock = threading.Lock()
+
+    def query_llm(self, prompt, stage=None):
+        ids = re.findall(r"- ID: (sugg_\d+),", prompt)
+        with self._lock:
+            self.prompt_ids.append(ids)
+            dropped = self.drop_once & set(ids)
+            self.drop_once -= dropped
+        return {i: {"impact": self.impacts[i], "difficulty": "Low"} for i in ids if i not in dropped}
+
+    async def aquery_llm(self, prompt, stage=None):
+        return self.query_llm(prompt, stage)
+
+def suggestions(count: int) -> list[dict]:
+    return [{"suggestion": f"Suggestion number {i}.", "source": "Readability"} for i in range(count)]
+
+IMPACTS = {f"sugg_{i}": impact for i, impact in enumerate(["Low", "High", "Medium", "High", "Low"])}
+
+def prioritize(service, items, use_async=False, **kwargs):
+    prioritizer = SuggestionPrioritizer(service, **kwargs)
+    return asyncio.run(prioritizer.aprioritize(items)) if use_async else prioritizer.prioritize(items)
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_scores_are_mapped_back_by_id(use_async):
+    prioritized = prioritize(ScoringLLMService(IMPACTS), suggestions(5), use_async)
+    assert [(s["suggestion"], s["impact"]) for s in prioritized] == [
+        ("Suggestion number 1.", "High"),
+        ("Suggestion number 3.", "High"),
+        ("Suggestion number 2.", "Medium"),
+        ("Suggestion number 0.", "Low"),
+        ("Suggestion number 4.", "Low"),
+    ]
+    assert all(s["difficulty"] == "Low" for s in prioritized)
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_long_lists_are_scored_in_chunks(use_async):
+    service = ScoringLLMService(IMPACTS)
+    prioritize(service, suggestions(5), use_async, chunk_size=2)
+    assert sorted(service.prompt_ids) == [["sugg_0", "sugg_1"], ["sugg_2", "sugg_3"], ["sugg_4"]]
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_only_missing_ids_are_retried(use_async):
+    service = ScoringLLMService(IMPACTS, drop_once={"sugg_1", "sugg_4"})
+    prioritized = prioritize(service, suggestions(5), use_async, chunk_size=2)
+    assert sorted(service.prompt_ids[:3]) == [["sugg_0", "sugg_1"], ["sugg_2", "sugg_3"], ["sugg_4"]]
+    # The retry sends only the two unscored suggestions, re-chunked together.
+    assert service.prompt_ids[3:] == [["sugg_1", "sugg_4"]]
+    assert all(s["impact"] != "N/A" for s in prioritized)
+
+def test_suggestions_still_missing_after_the_retries_are_sorted_last():
+    service = ScoringLLMService(IMPACTS, drop_once={"sugg_1"})
+    prioritized = prioritize(service, suggestions(5), max_retries=0)
+    assert len(service.prompt_ids) == 1
+    assert (prioritized[-1]["suggestion"], prioritized[-1]["impact"], prioritized[-1]["difficulty"]) == \
+        ("Suggestion number 1.", "N/A", "N/A")
+
+def test_invalid_levels_count_as_unscored():
+    class InvalidLevels(ScoringLLMService):
+        def query_llm(self, prompt, stage=None):
+            response = super().query_llm(prompt, stage)
+            if len(self.prompt_ids) == 1:
+                response["sugg_0"] = {"impact": "Critical", "difficulty": "Low"}
+                response["sugg_1"]["difficulty"] = "Hard"
+            return response
+
+    service = InvalidLevels(IMPACTS)
+    prioritized = {s["suggestion"]: s for s in prioritize(service, suggestions(2))}
+    assert service.prompt_ids == [["sugg_0", "sugg_1"], ["sugg_0"]]
+    assert prioritized["Suggestion number 0."]["impact"] == "Low"
+    assert (prioritized["Suggestion number 1."]["impact"], prioritized["Suggestion number 1."]["difficulty"]) == ("High", "N/A")
+
+def test_list_response_is_accepted():
+    class ListResponse(ScoringLLMService):
+        def query_llm(self, prompt, stage=None):
+            return [{"id": key, **value} for key, value in super().query_llm(prompt, stage).items()]
+
+    assert prioritize(ListResponse(IMPACTS), suggestions(5)) == prioritize(ScoringLLMService(IMPACTS), suggestions(5))
+
+def test_no_suggestions_skip_the_llm():
+    service = ScoringLLMService(IMPACTS)
+    assert prioritize(service, []) == []
+    assert service.prompt_ids == []
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import config
+from analyzers.readability_metrics import (
+    _count_words_and_syllables, _sentences, compute_corpus_readability_metrics, compute_readability_metrics,
+    format_metrics_for_prompt
+)
+
+def words_and_syllables(sentence: str) -> tuple[int, int]:
+    words, syllables = _count_words_and_syllables(sentence, 1)
+    return int(words[0]), int(syllables[0])
+
+def test_simple_text_scores():
+    metrics = compute_readability_metrics("The cat sat. The dog ran.")
+    assert metrics["sentences"] == 2
+    assert metrics["words"] == 6
+    assert metrics["avg_sentence_length"] == 3.0
+    # 206.835 - 1.015 * 3 - 84.6 * 1 and 0.39 * 3 + 11.8 * 1 - 15.59
+    assert metrics["flesch_reading_ease"] == 119.2
+    assert metrics["flesch_kincaid_grade"] == -2.6
+
+@pytest.mark.parametrize("word, syllables", [
+    ("cat", 1), ("readability", 5), ("make", 1), ("table", 2), ("jumped", 1), ("wanted", 2), ("queue", 1),
+])
+def test_syllables(word, syllables):
+    assert words_and_syllables(word) == (1, syllables)
+
+def test_words_in_any_script():
+    assert words_and_syllables("Don't stop, won’t stop") == (4, 4)
+    assert words_and_syllables("Émile était très ému") == (4, 8)
+    assert words_and_syllables("Straßen") == (1, 2)
+    # Words without a recognized vowel still count one syllable.
+    assert words_and_syllables("Привет мир") == (2, 2)
+    assert words_and_syllables("v2 --- 42 !") == (1, 1)
+
+def test_sentences_break_before_capitals_and_digits_in_any_script():
+    assert _sentences("Il part. Émile reste. 3 fois! e.g. this continues.") == ["Il part.", "Émile reste.", "3 fois! e.g. this continues."]
+
+def test_code_tables_and_headings_are_skipped():
+    markdown = "\n".join([
+        "# Setup guide",
+        "Install the tool.",
+        "```",
+        "pip install tool. Then run it.",
+        "```",
+        "| Field | Description |",
+        "| --- | --- |",
+        "- First item",
+        "- Second [linked](https://example.com) item",
+    ])
+    assert _sentences(markdown) == ["Install the tool.", "First item", "Second linked item"]
+
+def test_passive_voice_and_long_sentences():
+    long_sentence = " ".join(["word"] * (config.READABILITY_LONG_SENTENCE_WORDS + 1)) + "."
+    metrics = compute_readability_metrics(f"The file was deleted. We keep backups. {long_sentence.capitalize()}")
+    assert metrics["passive_voice_ratio"] == round(1 / 3, 3)
+    assert metrics["long_sentences"] == 1
+    assert metrics["max_sentence_length"] == config.READABILITY_LONG_SENTENCE_WORDS + 1
+    assert metrics["median_sentence_length"] == 4
+
+def test_sections_and_corpus_match_single_documents():
+    documents = ["# Intro\n\nShort one. Another short one.\n\n## Details\n\nThis sentence is a bit longer than those.", "", "Only one sentence here."]
+    corpus = compute_corpus_readability_metrics(documents)
+    assert corpus == [compute_readability_metrics(d) for d in documents]
+    assert [s["heading"] for s in corpus[0]["sections"]] == ["Intro", "Details"]
+    assert [s["sentences"] for s in corpus[0]["sections"]] == [2, 1]
+    assert corpus[1] == {"sentences": 0, "words": 0, "sections": []}
+
+def test_prompt_summary():
+    assert format_metrics_for_prompt(compute_readability_metrics("")) == ""
+    summary = format_metrics_for_prompt(compute_readability_metrics("The cat sat. The dog ran."))
+    assert "Sentences: 2, words: 6" in summary
+    assert "Passive-voice sentences: 0%" in summary
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import contextlib
+import io
+
+import pytest
+
+from core import resilience
+from core.llm_service import LLMService
+from core.resilience import CircuitBreaker, RateLimiter, _TokenBucket, backoff_delay, classify_error, retry_after_seconds
+from fake_llm import FakeBackendError, FakeGeminiModel
+
+class Clock:
+    """A stand-in for time.monotonic() that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience.time, "monotonic", clock)
+    return clock
+
+def test_token_bucket_starts_full_and_refills_at_its_rate(clock):
+    bucket = _TokenBucket(per_minute=60)
+    assert bucket.reserve(60, clock.now) == 0.0
+    # Empty: the next token arrives after one second.
+    assert bucket.reserve(1, clock.now) == pytest.approx(1.0)
+    clock.now += 3
+    # Three tokens refilled, one of them already reserved.
+    assert bucket.reserve(2, clock.now) == 0.0
+    assert bucket.reserve(1, clock.now) == pytest.approx(1.0)
+
+def test_token_bucket_caps_reservations_at_its_capacity(clock):
+    bucket = _TokenBucket(per_minute=60)
+    bucket.reserve(60, clock.now)
+    # A reservation larger than the bucket waits for a full bucket, not forever.
+    assert bucket.reserve(600, clock.now) == pytest.approx(60.0)
+
+def test_rate_limiter_waits_for_the_scarcer_bucket(clock):
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=600)
+    assert limiter._reserve(600) == 0.0
+    # One request is left, but the token bucket needs 10 seconds for 100 tokens.
+    assert limiter._reserve(100) == pytest.approx(10.0)
+
+def test_rate_limiter_without_quotas_never_waits(clock):
+    limiter = RateLimiter(requests_per_minute=0, tokens_per_minute=None)
+    assert all(limiter._reserve(10 ** 9) == 0.0 for _ in range(100))
+
+def test_rate_limiter_pauses_and_slows_down_on_rate_limits(clock):
+    limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=None)
+    limiter.on_rate_limited(5)
+    assert limiter.scale == 0.5
+    assert limiter.requests.rate == pytest.approx(0.5)
+    assert limiter._reserve(0) == pytest.approx(5.0)
+    for _ in range(20):
+        limiter.on_success()
+    assert limiter.scale == 1.0
+
+def test_rate_limiter_record_usage_corrects_the_token_bucket(clock):
+    limiter = RateLimiter(requests_per_minute=None, tokens_per_minute=600)
+    limiter._reserve(500)
+    limiter.record_usage(100)
+    # The call used 100 more tokens than estimated, so the bucket is empty.
+    assert limiter._reserve(10) == pytest.approx(1.0)
+
+def test_circuit_breaker_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+def test_circuit_breaker_lets_one_trial_call_through_after_the_pause(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock.now += 29
+    assert not breaker.allow_request()
+    clock.now += 1
+    assert breaker.allow_request()
+    assert breaker.state == "half-open"
+    assert not breaker.allow_request() # Only one trial at a time
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.allow_request()
+
+def test_circuit_breaker_reopens_when_the_trial_call_fails(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+def test_circuit_breaker_released_trial_can_be_made_again(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=30)
+    breaker.record_failure()
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.release_trial()
+    assert breaker.state == "half-open"
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+
+def test_cancelled_trial_call_does_not_leave_the_circuit_stuck():
+    model = FakeGeminiModel(latency=5.0, jitter=0.0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        service = LLMService(cache_mode="bypass", model=model)
+    service.circuit_breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    service.circuit_breaker.record_failure()
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(service.aquery_llm("Trial prompt."), timeout=0.05)
+        assert service.circuit_breaker.state == "half-open"
+        model.latency = 0.0
+        return await service.aquery_llm("Trial prompt.")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert asyncio.run(run()) is not None
+    assert service.circuit_breaker.state == "closed"
+
+def test_circuit_breaker_with_zero_threshold_is_disabled(clock):
+    breaker = CircuitBreaker(failure_threshold=0, reset_seconds=30)
+    for _ in range(10):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+    assert breaker.allow_request()
+
+@pytest.mark.parametrize("error, kind", [
+    (FakeBackendError("quota", 429), resilience.RATE_LIMIT),
+    (Exception("429 Resource exhausted"), resilience.RATE_LIMIT),
+    (FakeBackendError("invalid argument", 400), resilience.PERMANENT),
+    (FakeBackendError("request timeout", 408), resilience.TRANSIENT),
+    (FakeBackendError("unavailable", 503), resilience.TRANSIENT),
+    (TimeoutError("timed out"), resilience.TRANSIENT),
+])
+def test_classify_error(error, kind):
+    assert classify_error(error) == kind
+
+def test_retry_after_is_read_from_the_error_message():
+    assert retry_after_seconds(Exception("Quota exceeded. Please retry in 12.5s.")) == 12.5
+    assert retry_after_seconds(Exception("retry_delay { seconds: 7 }")) == 7.0
+    assert retry_after_seconds(Exception("Internal error")) is None
+
+def test_backoff_delay_is_bounded_and_honors_retry_after():
+    for attempt in range(10):
+        assert 0 <= backoff_delay(attempt, base=2, maximum=60) <= 60
+    assert backoff_delay(0, base=2, maximum=60, retry_after=10) >= 10
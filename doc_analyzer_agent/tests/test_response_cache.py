@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+
+import pytest
+
+from core import response_cache
+from core.llm_service import LLMService
+from core.response_cache import ResponseCache
+from fake_llm import FakeGeminiModel
+
+PROMPT = 'Respond with a JSON object containing "summary".'
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replaces time.time() in the cache module with a settable clock."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(response_cache.time, "time", lambda: now[0])
+    return now
+
+def make_cache(tmp_path, **kwargs) -> ResponseCache:
+    return ResponseCache(str(tmp_path / "cache" / "responses.sqlite3"), **kwargs)
+
+def test_entries_persist_across_instances(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.set("key", '{"a": 1}')
+    cache.close()
+
+    reopened = make_cache(tmp_path)
+    assert reopened.get("key") == '{"a": 1}'
+    assert reopened.get("other") is None
+    assert reopened.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+def test_key_depends_on_model_config_and_prompt():
+    key = ResponseCache.make_key("gemini-2.0-flash", {"temperature": 0}, "prompt")
+    assert key == ResponseCache.make_key("gemini-2.0-flash", {"temperature": 0}, "prompt")
+    assert key != ResponseCache.make_key("gemini-1.5-pro", {"temperature": 0}, "prompt")
+    assert key != ResponseCache.make_key("gemini-2.0-flash", {"temperature": 1}, "prompt")
+    assert key != ResponseCache.make_key("gemini-2.0-flash", {"temperature": 0}, "prompt!")
+
+def test_expired_entries_are_misses_and_removed(tmp_path, clock):
+    cache = make_cache(tmp_path, ttl_seconds=60)
+    cache.set("key", "response")
+    clock[0] += 60
+    assert cache.get("key") == "response"
+    clock[0] += 1
+    assert cache.get("key") is None
+    assert cache.stats()["entries"] == 0
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.set("a", "1")
+    clock[0] += 1
+    cache.set("b", "2")
+    clock[0] += 1
+    cache.get("a") # "b" is now the least recently used
+    clock[0] += 1
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.stats()["entries"] == 2
+
+def service(cache_mode: str, model: FakeGeminiModel) -> LLMService:
+    with contextlib.redirect_stdout(io.StringIO()):
+        return LLMService(cache_mode=cache_mode, model=model)
+
+def query(llm_service: LLMService):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return llm_service.query_llm(PROMPT, stage="summary")
+
+@pytest.mark.parametrize("cache_mode, calls", [("use", 1), ("refresh", 2), ("bypass", 2)])
+def test_llm_service_cache_modes(cache_mode, calls):
+    model = FakeGeminiModel(latency=0.0, jitter=0.0)
+    query(service("use", model))
+    assert model.calls == 1
+    answer = query(service(cache_mode, model))
+    assert answer == {"summary": "The article is generally clear but would benefit from shorter sentences and more examples."}
+    assert model.calls == calls
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+import config
+from analyzers.rule_based import (
+    _RuleBasedAnalyzer, _scan, CompletenessExamplesRules, ReadabilityRules, StructureFlowRules, StyleAdherenceRules,
+    rule_based_analyzers
+)
+
+def suggestions(result: dict) -> str:
+    return "\n".join(s["suggestion"] for s in result["suggestions"])
+
+@pytest.fixture
+def small_thresholds(monkeypatch):
+    """Lowers the length thresholds so that short documents trigger the length rules."""
+    monkeypatch.setattr(config, "READABILITY_LONG_SENTENCE_WORDS", 8)
+    monkeypatch.setattr(config, "FAST_MODE_MAX_PARAGRAPH_WORDS", 20)
+    monkeypatch.setattr(config, "FAST_MODE_MAX_SECTION_WORDS", 30)
+    monkeypatch.setattr(config, "FAST_MODE_MIN_WORDS_FOR_HEADINGS", 10)
+
+LONG_PARAGRAPH = (
+    "Campaigns start sending once they are scheduled. Each recipient receives one message per day. "
+    "Replies go to the inbox of the sender. Bounces are counted in the report of the campaign."
+)
+
+def test_scan_collects_structure():
+    scan = _scan(
+        "# Title\n\nIntro text here.\n\n## Steps\n\n1. Open the app.\n2. Click Save.\n\n- Option\n\n"
+        "```\ncode line\n```\n\n![Shot](a.png) See [docs](b.html).\n"
+    )
+    assert scan.headings == [(1, "Title"), (2, "Steps")]
+    assert scan.ordered_items == ["Open the app.", "Click Save."]
+    assert scan.unordered_items == ["Option"]
+    assert scan.paragraphs == ["Intro text here.", "![Shot](a.png) See [docs](b.html)."]
+    assert (scan.code_blocks, scan.images, scan.links) == (1, 1, 1)
+    assert "code line" not in scan.prose
+
+def test_table_rows_are_not_prose():
+    scan = _scan("Before the table.\n| Plan | Price |\n|---|---|\n| Pro | 10 |\nAfter the table.\n")
+    assert scan.paragraphs == ["Before the table.", "After the table."]
+    assert "Pro" not in scan.prose
+    # Table words still count towards the length of the article and its sections.
+    assert scan.words == 9
+
+def test_rule_based_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        _RuleBasedAnalyzer()
+
+def test_analyzers_return_the_llm_result_keys():
+    keys = {
+        "readability": "persona_pain_points",
+        "structure_flow": "quantified_issues",
+        "completeness_examples": "positive_feedback",
+        "style_adherence": "snippet_specific_feedback",
+    }
+    for name, analyzer in rule_based_analyzers().items():
+        result = analyzer.analyze("")
+        assert {"assessment", "suggestions", "positive_feedback", keys[name]} <= set(result)
+        assert result["suggestions"] == []
+
+def test_suggestions_carry_scores_and_theme():
+    result = StyleAdherenceRules().analyze("Simply click Save!")
+    assert result["suggestions"]
+    for suggestion in result["suggestions"]:
+        assert suggestion["impact"] in {"High", "Medium", "Low"}
+        assert suggestion["difficulty"] in {"High", "Medium", "Low"}
+        assert suggestion["theme"] == "Style"
+
+def test_readability_long_sentence(small_thresholds):
+    result = ReadabilityRules().analyze("Short one. This sentence has quite a lot more than eight words in it.")
+    assert "Split this 12-word sentence" in suggestions(result)
+    assert "Short one" not in suggestions(result)
+
+def test_readability_long_paragraph(small_thresholds):
+    result = ReadabilityRules().analyze(LONG_PARAGRAPH + "\n\nA short paragraph.")
+    assert "Break up the 31-word paragraph starting \"Campaigns start" in suggestions(result)
+    assert "short paragraph" not in suggestions(result)
+
+def test_readability_jargon():
+    result = ReadabilityRules().analyze("Send the payload to the endpoint.")
+    assert "technical terms for non-technical readers: endpoint, payload." in suggestions(result)
+    assert result["persona_pain_points"] == "Unexplained technical terms: endpoint, payload."
+
+def test_readability_jargon_in_code_is_ignored():
+    assert ReadabilityRules().analyze("Run this:\n\n```\ncurl $ENDPOINT --data payload\n```\n")["suggestions"] == []
+
+def test_readability_passive_voice():
+    result = ReadabilityRules().analyze("The report was created by the system. The file was deleted. We send it.")
+    assert "Rewrite passive sentences in the active voice (67% of sentences are passive)" in suggestions(result)
+
+def test_readability_praise_for_short_text():
+    result = ReadabilityRules().analyze("Open the app. Click Save.\n\n- One\n- Two\n")
+    assert result["suggestions"] == []
+    assert "Sentences are short on average." in result["positive_feedback"]
+    assert "Lists break up the text." in result["positive_feedback"]
+
+def test_structure_no_headings(small_thresholds):
+    result = StructureFlowRules().analyze(LONG_PARAGRAPH)
+    assert "Add headings to divide this 31-word article" in suggestions(result)
+    assert "no headings" in result["assessment"]
+
+def test_structure_skipped_heading_level():
+    result = StructureFlowRules().analyze("# Title\n\nIntro.\n\n### Details\n\nText.\n")
+    assert "Heading \"Details\" skips a level after \"Title\"" in suggestions(result)
+    assert result["quantified_issues"] == "1 skipped heading level."
+
+def test_structure_long_section(small_thresholds):
+    result = StructureFlowRules().analyze(f"# Title\n\nIntro.\n\n## Sending\n\n{LONG_PARAGRAPH}\n")
+    assert "The section \"Sending\" is 31 words long" in suggestions(result)
+    assert "\"Title\"" not in suggestions(result)
+
+def test_structure_procedure_as_prose():
+    text = "First open the dashboard, then click Campaigns and select the draft. Finally click Send."
+    assert "as a numbered list of steps" in suggestions(StructureFlowRules().analyze(text))
+    assert "as a numbered list of steps" not in suggestions(StructureFlowRules().analyze(text + "\n\n1. Open it.\n"))
+
+def test_structure_missing_introduction():
+    result = StructureFlowRules().analyze("# Title\n\n## First section\n\nText.\n")
+    assert "Add a short introduction" in suggestions(result)
+    assert "Add a short introduction" not in suggestions(StructureFlowRules().analyze("# Title\n\nIntro.\n\n## First\n\nText.\n"))
+
+def test_structure_clear():
+    result = StructureFlowRules().analyze("# Title\n\nIntro.\n\n## Steps\n\n1. Open the app.\n")
+    assert result["suggestions"] == []
+    assert result["assessment"] == "The structure is clear."
+    assert result["positive_feedback"] == "The article is organized under 2 headings. Procedures use numbered steps."
+
+def test_completeness_code_example():
+    text = "Send a request to the API and read the JSON response."
+    assert "Add a code example" in suggestions(CompletenessExamplesRules().analyze(text))
+    assert "Add a code example" not in suggestions(CompletenessExamplesRules().analyze(text + "\n\n```\ncurl x\n```\n"))
+
+def test_completeness_screenshots():
+    text = "Open Settings, select Team and click Invite."
+    assert "Add screenshots" in suggestions(CompletenessExamplesRules().analyze(text))
+    assert "Add screenshots" not in suggestions(CompletenessExamplesRules().analyze(text + " ![Invite](invite.png)"))
+
+def test_completeness_lists_and_links(small_thresholds):
+    result = CompletenessExamplesRules().analyze(LONG_PARAGRAPH)
+    assert "Use bulleted or numbered lists" in suggestions(result)
+    assert "Link to related articles" in suggestions(result)
+    result = CompletenessExamplesRules().analyze(LONG_PARAGRAPH + "\n\n- See [Reports](reports.html).\n")
+    assert result["suggestions"] == []
+    assert result["positive_feedback"] == "Links to related content."
+
+def test_completeness_placeholders():
+    result = CompletenessExamplesRules().analyze("Pricing: TBD. todo: add the limits.")
+    assert "Replace the placeholder text (TBD, TODO)" in suggestions(result)
+    assert result["assessment"] == "The article is missing supporting material: placeholder text."
+
+def test_style_non_imperative_steps():
+    result = StyleAdherenceRules().analyze("1. You should open the app.\n2. Clicking Save stores it.\n3. Close the app.\n")
+    assert "Start the step \"You should open the app.\"" in suggestions(result)
+    assert "Start the step \"Clicking Save stores it.\"" in suggestions(result)
+    assert "Close the app" not in suggestions(result)
+    assert "2 steps not written as instructions" in result["assessment"]
+
+def test_style_minimizing_words():
+    result = StyleAdherenceRules().analyze("Simply open the app. It is easy, just click Save.")
+    assert "Remove words that assume the task is easy: easy, just, simply." in suggestions(result)
+
+def test_style_wordy_phrases():
+    result = StyleAdherenceRules().analyze("In order to save, click on Save.")
+    assert "Use concise wording: \"in order to\" -> \"to\", \"click on\" -> \"click\"." in suggestions(result)
+    assert "\"in order to\" can be shortened to \"to\"." in result["snippet_specific_feedback"]
+
+def test_style_exclamations():
+    result = StyleAdherenceRules().analyze("Great news! Reports are here!\n\n```\necho 'hi!'\n```\n")
+    assert "Remove exclamation marks (2 found)" in suggestions(result)
+
+def test_style_follows_guidelines():
+    result = StyleAdherenceRules().analyze("1. Open the app.\n2. Click Save.\n")
+    assert result["suggestions"] == []
+    assert result["assessment"] == "The text follows the style guidelines."
+    assert result["positive_feedback"] == "Steps are written as direct instructions. Wording is direct and concise."
+
+def test_aanalyze_matches_analyze():
+    analyzer = StyleAdherenceRules()
+    assert asyncio.run(analyzer.aanalyze("Simply click on Save!")) == analyzer.analyze("Simply click on Save!")
@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+import contextlib
+import io
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from fake_llm import FakeGeminiModel
+from pipeline_benchmark import FIXTURES_DIR
+from server import AnalysisJobQueue, JobHTTPServer, QueueFullError, validate_options
+
+with open(f"{FIXTURES_DIR}/small.html", "r", encoding="utf-8") as f:
+    SMALL_HTML = f.read()
+
+class BlockingModel(FakeGeminiModel):
+    """A FakeGeminiModel whose calls wait until `release` is set."""
+
+    def __init__(self):
+        super().__init__(latency=0.0, jitter=0.0)
+        self.release = threading.Event()
+
+    def generate_content(self, prompt: str, **kwargs):
+        self.release.wait(10)
+        return super().generate_content(prompt, **kwargs)
+
+@contextlib.contextmanager
+def job_queue(**kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        jobs = AnalysisJobQueue(html_cache_mode="bypass", reuse_unchanged=False, **kwargs)
+        try:
+            yield jobs
+        finally:
+            jobs.close()
+
+def wait_for(job, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while job.status in ("queued", "running"):
+        assert time.monotonic() < deadline, f"Job {job.id} is still {job.status}"
+        time.sleep(0.02)
+    return job
+
+def test_submitted_html_is_analyzed(llm_service, fake_model):
+    with job_queue(workers=2, llm_service=llm_service) as jobs:
+        job = wait_for(jobs.submit(html=SMALL_HTML, options={"grouper_mode": "local"}))
+
+    assert job.status == "done", job.error
+    assert job.url.startswith("submitted-html:")
+    assert job.report.startswith("#")
+    assert job.details["prioritized_suggestions"]
+    assert job.html is None
+    assert fake_model.calls > 0
+    assert job.to_dict()["report"] == f"/jobs/{job.id}/report"
+
+def test_url_jobs_share_the_fetcher(site, llm_service):
+    _, base_url = site
+    with job_queue(workers=2, llm_service=llm_service) as jobs:
+        submitted = [jobs.submit(f"{base_url}/{name}.html", options={"analyzer_mode": "fast"}) for name in ("small", "medium")]
+        finished = [wait_for(job) for job in submitted]
+        stats = jobs.stats()
+
+    assert [job.status for job in finished] == ["done", "done"]
+    assert stats["jobs"]["done"] == 2
+
+def test_health_reports_the_llm_usage_of_every_job(llm_service, fake_model):
+    with job_queue(workers=2, llm_service=llm_service) as jobs:
+        for job in [jobs.submit(html=SMALL_HTML, options={"grouper_mode": "local"}) for _ in range(3)]:
+            assert wait_for(job).status == "done", job.error
+        usage = jobs.stats()["llm_usage"]
+
+    assert usage["calls"] == fake_model.calls
+    assert "stages" not in usage
+
+def test_failed_jobs_report_why(llm_service):
+    with job_queue(workers=1, llm_service=llm_service) as jobs:
+        job = wait_for(jobs.submit("http://127.0.0.1:9/unreachable.html", options={"analyzer_mode": "fast"}))
+    assert job.status == "failed"
+    assert job.error
+
+def test_full_queue_rejects_jobs_and_close_fails_the_queued_ones(llm_service):
+    model = BlockingModel()
+    llm_service.model = model
+    with job_queue(workers=1, queue_size=1, llm_service=llm_service) as jobs:
+        running = jobs.submit(html=SMALL_HTML)
+        deadline = time.monotonic() + 10
+        while running.status != "running":
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        queued = jobs.submit(html=SMALL_HTML)
+        with pytest.raises(QueueFullError):
+            jobs.submit(html=SMALL_HTML)
+        threading.Timer(0.2, model.release.set).start()
+
+    assert running.status == "done"
+    assert queued.status == "failed"
+    assert "shut down" in queued.error
+
+def test_oldest_finished_jobs_are_forgotten():
+    with job_queue(workers=1, max_finished_jobs=2, analyzer_mode="fast") as jobs:
+        submitted = [wait_for(jobs.submit(html=SMALL_HTML)) for _ in range(3)]
+        jobs.submit(html=SMALL_HTML)
+        assert jobs.get(submitted[0].id) is None
+        assert jobs.get(submitted[2].id) is submitted[2]
+
+def test_unlabeled_html_is_never_checkpointed():
+    with job_queue(workers=1, analyzer_mode="fast", checkpoint=True) as jobs:
+        job = jobs.submit(html=SMALL_HTML, options={"resume": True})
+        labeled = jobs.submit("docs/small", html=SMALL_HTML)
+        wait_for(job), wait_for(labeled)
+    assert job.options["checkpoint"] is False and job.options["resume"] is False
+    assert labeled.options["checkpoint"] is True
+
+def test_validate_options():
+    assert validate_options({"analyzer_mode": "fast", "rerun_from": "group", "max_chunk_tokens": 0})
+    for options in ({"analyzer_mode": "turbo"}, {"incremental": "yes"}, {"rerun_from": "deploy"},
+                    {"max_chunk_tokens": -1}, {"max_chunk_tokens": True}, {"output_path": "x.md"}, []):
+        with pytest.raises(ValueError):
+            validate_options(options)
+
+def test_http_api(llm_service):
+    with job_queue(workers=1, llm_service=llm_service) as jobs:
+        server = JobHTTPServer(("127.0.0.1", 0), jobs, max_body_bytes=len(SMALL_HTML) + 1000)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        def request(path: str, body: dict | None = None) -> tuple[int, bytes]:
+            data = json.dumps(body).encode("utf-8") if body is not None else None
+            try:
+                with urllib.request.urlopen(urllib.request.Request(base_url + path, data=data)) as response:
+                    return response.status, response.read()
+            except urllib.error.HTTPError as e:
+                return e.code, e.read()
+
+        try:
+            status, body = request("/jobs", {"html": SMALL_HTML, "options": {"grouper_mode": "local"}})
+            assert status == 202
+            job_id = json.loads(body)["id"]
+            wait_for(jobs.get(job_id))
+            status, body = request(f"/jobs/{job_id}")
+            assert status == 200 and json.loads(body)["status"] == "done"
+            status, body = request(f"/jobs/{job_id}/report")
+            assert status == 200 and body.decode("utf-8") == jobs.get(job_id).report
+            status, body = request(f"/jobs/{job_id}/report?format=json")
+            assert status == 200 and json.loads(body)["results"]["prioritized_suggestions"]
+
+            assert request("/jobs", {"options": {}})[0] == 400
+            assert request("/jobs", {"html": SMALL_HTML, "options": {"analyzer_mode": "turbo"}})[0] == 400
+            assert request("/jobs", {"html": SMALL_HTML * 2})[0] == 413
+            assert request("/jobs/unknown")[0] == 404
+            assert request("/health")[0] == 200
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import contextvars
+import json
+import threading
+
+from core.tracing import Tracer, span
+
+def add(tracer: Tracer, name: str, start: float, duration: float, category: str = "stage", **args):
+    """Adds a span with start and duration relative to the tracer's origin."""
+    tracer.add_span(name, category, tracer._origin + start, tracer._origin + start + duration, args)
+
+def test_span_without_an_active_tracer_does_nothing():
+    tracer = Tracer()
+    with span("parse"):
+        pass
+    assert tracer.spans == []
+
+def test_spans_are_recorded_while_active_even_on_errors():
+    tracer = Tracer()
+    with tracer.activate():
+        with span("parse", url="https://example.com"):
+            pass
+        try:
+            with span("analyze:readability", category="analyzer"):
+                raise ValueError("failed")
+        except ValueError:
+            pass
+    with span("after"):
+        pass
+    assert [(s.name, s.category, s.args) for s in tracer.spans] == [
+        ("parse", "stage", {"url": "https://example.com"}),
+        ("analyze:readability", "analyzer", {}),
+    ]
+    assert all(s.start >= 0 and s.duration >= 0 for s in tracer.spans)
+
+def test_threads_and_tasks_get_their_own_tracks():
+    tracer = Tracer()
+    barrier = threading.Barrier(2) # Keeps both threads alive, so they can't share a thread ident
+
+    def work():
+        with span("thread work"):
+            barrier.wait()
+
+    async def task_work():
+        with span("task work"):
+            await asyncio.sleep(0)
+
+    async def tasks():
+        await asyncio.gather(task_work(), task_work())
+
+    with tracer.activate():
+        with span("main"):
+            pass
+        threads = [threading.Thread(target=contextvars.copy_context().run, args=(work,)) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        asyncio.run(tasks())
+    tracks = {s.name: set() for s in tracer.spans}
+    for s in tracer.spans:
+        tracks[s.name].add(s.track)
+    assert len(tracks["main"]) == 1
+    assert len(tracks["thread work"] | tracks["task work"]) == 4
+    assert not tracks["main"] & (tracks["thread work"] | tracks["task work"])
+
+def test_export_chrome_writes_trace_events(tmp_path):
+    tracer = Tracer()
+    add(tracer, "analyze", 0.5, 0.25, url="https://example.com")
+    add(tracer, "fetch", 0.0, 0.125)
+    path = tmp_path / "trace.json"
+    tracer.export_chrome(str(path))
+
+    trace = json.loads(path.read_text(encoding="utf-8"))
+    assert trace["displayTimeUnit"] == "ms"
+    metadata = [e for e in trace["traceEvents"] if e["ph"] == "M"]
+    assert [e["name"] for e in metadata] == ["process_name", "thread_name"]
+    assert metadata[1]["args"]["name"] == threading.current_thread().name
+    spans = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert [(e["name"], e["ts"], e["dur"], e["tid"]) for e in spans] == [
+        ("fetch", 0.0, 125000.0, 1),
+        ("analyze", 500000.0, 250000.0, 1),
+    ]
+    assert spans[1]["args"] == {"url": "https://example.com"}
+
+def test_summary_lists_stages_by_total_time_and_slowest_spans():
+    tracer = Tracer()
+    for i in range(20):
+        add(tracer, "analyze", i, 0.1 if i < 19 else 1.0)
+    add(tracer, "fetch", 0.0, 1.5, url="https://example.com/a")
+    add(tracer, "format", 0.0, 0.01)
+
+    lines = tracer.summary(top_n=2).splitlines()
+    assert lines[0] == "Slowest stages (by total time, top 2):"
+    assert lines[2].split() == ["analyze", "20", "2.900", "0.145", "0.100", "1.000"]
+    assert lines[3].split() == ["fetch", "1", "1.500", "1.500", "1.500", "1.500"]
+    assert lines[4] == "Slowest spans (top 2):"
+    assert lines[5].split() == ["1.500s", "fetch", "(https://example.com/a)"]
+    assert lines[6].split() == ["1.000s", "analyze"]
+    assert len(lines) == 7
+
+def test_summary_reports_documents_in_flight():
+    tracer = Tracer()
+    add(tracer, "document", 0.0, 2.0, category="document")
+    add(tracer, "document", 1.0, 2.0, category="document")
+    assert tracer.summary().splitlines()[-1] == "Documents: 2 in 3.000s wall time, 1.3 in flight on average."
+
+def test_summary_without_spans():
+    assert Tracer().summary() == "No spans recorded."
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import asyncio
+
+import pytest
+
+from processing.triage import SuggestionTriager, UNCATEGORIZED_THEME
+
+class StubLLMService:
+    """Returns a fixed response and records the prompts it receives."""
+
+    def __init__(self, response):
+        self.response = response
+        self.prompts = []
+
+    def query_llm(self, prompt, stage=None):
+        self.prompts.append(prompt)
+        return self.response
+
+    async def aquery_llm(self, prompt, stage=None):
+        return self.query_llm(prompt, stage)
+
+def suggestions() -> list[dict]:
+    return [
+        {"suggestion": "Shorten the intro.", "source": "Readability"},
+        {"suggestion": "Add a code sample.", "source": "Completeness & Examples"},
+        {"suggestion": "Use consistent headings.", "source": "Structure & Flow"},
+        {"suggestion": "Remove exclamation marks.", "source": "Style Adherence"},
+    ]
+
+RESPONSE = {
+    "sugg_0": {"impact": "Medium", "difficulty": "Low", "theme": "Clarity"},
+    "sugg_1": {"impact": "High", "difficulty": "Medium", "theme": " Examples "},
+    "sugg_2": {"impact": "Huge", "difficulty": "Low", "theme": "Clarity"},
+}
+
+def test_prompt_lists_every_suggestion_by_id():
+    service = StubLLMService(RESPONSE)
+    SuggestionTriager(service).triage(suggestions())
+    assert len(service.prompts) == 1
+    for i, s in enumerate(suggestions()):
+        assert f"- ID: sugg_{i}, Suggestion: {s['suggestion']} (Source: {s['source']})" in service.prompts[0]
+
+def test_no_suggestions_skip_the_llm():
+    service = StubLLMService(RESPONSE)
+    assert SuggestionTriager(service).triage([]) == ([], {})
+    assert service.prompts == []
+
+def test_response_is_applied_sorted_and_grouped():
+    prioritized, grouped = SuggestionTriager(StubLLMService(RESPONSE)).triage(suggestions())
+
+    assert [s["suggestion"] for s in prioritized] == [
+        "Add a code sample.", "Shorten the intro.", "Use consistent headings.", "Remove exclamation marks."
+    ]
+    assert [(s["impact"], s["difficulty"], s["theme"]) for s in prioritized] == [
+        ("High", "Medium", "Examples"),
+        ("Medium", "Low", "Clarity"),
+        ("N/A", "Low", "Clarity"),  # "Huge" is not a valid level
+        ("N/A", "N/A", UNCATEGORIZED_THEME),  # sugg_3 is missing from the response
+    ]
+    # Themes follow priority order and the uncategorized suggestions come last.
+    assert list(grouped) == ["Examples", "Clarity", UNCATEGORIZED_THEME]
+    assert [s["suggestion"] for s in grouped["Clarity"]] == ["Shorten the intro.", "Use consistent headings."]
+
+def test_list_response_is_accepted():
+    response = [{"id": key, **value} for key, value in RESPONSE.items()] + ["not an object"]
+    assert SuggestionTriager(StubLLMService(response)).triage(suggestions()) == \
+        SuggestionTriager(StubLLMService(RESPONSE)).triage(suggestions())
+
+@pytest.mark.parametrize("response", [None, {}, "not JSON", []])
+def test_unusable_response_falls_back_to_grouping_by_source(response):
+    prioritized, grouped = SuggestionTriager(StubLLMService(response)).triage(suggestions())
+    assert [s["suggestion"] for s in prioritized] == [s["suggestion"] for s in suggestions()]
+    assert all(s["impact"] == "N/A" and s["difficulty"] == "N/A" for s in prioritized)
+    assert list(grouped) == [s["source"] for s in suggestions()]
+
+def test_atriage_matches_triage():
+    triager = SuggestionTriager(StubLLMService(RESPONSE))
+    assert asyncio.run(triager.atriage(suggestions())) == triager.triage(suggestions())